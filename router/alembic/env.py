@@ -10,7 +10,7 @@ from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from app.config import settings
 from app.db import Base, metadata
-from app.models import slug_map, slug_history  # Import models to register them
+from app.models import slug_map, slug_history, slug_redirect  # Import models to register them
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,73 @@
+"""Create slug_map and slug_history
+
+Revision ID: 000
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+Baseline schema: slug_map and a plain slug_history, as init_db created them
+before history was partitioned. Later revisions build on it, so
+`alembic upgrade head` works on an empty database. Databases that already
+have slug_map, whether from init_db or an earlier deploy, are left as they
+are.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '000'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+RESOURCE_TYPES = ('TENANT', 'LOCATION', 'STYLIST', 'SERVICE')
+SLUG_STATUSES = ('ACTIVE', 'DRAFT', 'DELETED')
+
+
+def upgrade():
+    """Create slug_map, slug_history and their indexes."""
+    if sa.inspect(op.get_bind()).has_table('slug_map'):
+        return
+
+    op.create_table('slug_map',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('host', sa.String(length=255), nullable=False),
+        sa.Column('path', sa.Text(), nullable=False),
+        sa.Column('resource_type', sa.Enum(*RESOURCE_TYPES, name='resourcetype'), nullable=False),
+        sa.Column('resource_id', sa.String(length=100), nullable=False),
+        sa.Column('tenant_id', sa.String(length=50), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum(*SLUG_STATUSES, name='slugstatus'), nullable=False),
+        sa.Column('canonical_url', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.CheckConstraint("path ~ '^/[^\\s]*$'", name=op.f('ck_slug_map_ck_slug_map_path_format')),
+        sa.PrimaryKeyConstraint('id', name=op.f('pk_slug_map')),
+        sa.UniqueConstraint('host', 'path', 'status', name='uq_slug_map_host_path_status', deferrable=True),
+    )
+    op.create_index(op.f('ix_slug_map_host'), 'slug_map', ['host'], unique=False)
+    op.create_index(op.f('ix_slug_map_status'), 'slug_map', ['status'], unique=False)
+    op.create_index(op.f('ix_slug_map_tenant_id'), 'slug_map', ['tenant_id'], unique=False)
+    op.create_index('ix_slug_map_tenant_status', 'slug_map', ['tenant_id', 'status'], unique=False)
+    op.create_index('ix_slug_map_resource', 'slug_map', ['resource_type', 'resource_id'], unique=False)
+
+    op.create_table('slug_history',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('slug_map_id', sa.String(length=50), nullable=False),
+        sa.Column('old_values_json', postgresql.JSONB(), nullable=True),
+        sa.Column('new_values_json', postgresql.JSONB(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('actor', sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(['slug_map_id'], ['slug_map.id'], name='fk_slug_history_slug_map_id_slug_map'),
+        sa.PrimaryKeyConstraint('id', name='pk_slug_history'),
+    )
+    op.create_index('ix_slug_history_slug_map_id', 'slug_history', ['slug_map_id'], unique=False)
+
+
+def downgrade():
+    """Drop slug_history, slug_map and their enum types."""
+    op.drop_table('slug_history')
+    op.drop_table('slug_map')
+    sa.Enum(name='slugstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='resourcetype').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,91 @@
+"""Partition slug_history by month
+
+Revision ID: 001
+Revises: 000
+Create Date: 2026-10-19 00:00:00.000000
+
+Converts the plain slug_history table into a table range-partitioned by
+month on changed_at. It assumes the baseline schema is in place: either
+revision 000 created it, or init_db did. Databases where init_db already
+created the partitioned table are left as they are. Monthly partitions are
+created by the history maintenance job; rows copied here land in the default
+partition and are moved into monthly partitions the next time it runs.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '001'
+down_revision = '000'
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, changed_at, slug_map_id, old_values_json, new_values_json, actor"
+
+
+def _is_partitioned() -> bool:
+    """Check whether slug_history is already partitioned."""
+    return bool(op.get_bind().scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table t "
+        "JOIN pg_class c ON c.oid = t.partrelid WHERE c.relname = 'slug_history')"
+    )))
+
+
+def upgrade():
+    """Rebuild slug_history as a partitioned table."""
+    if _is_partitioned():
+        return
+
+    op.rename_table('slug_history', 'slug_history_legacy')
+    op.execute("ALTER TABLE slug_history_legacy DROP CONSTRAINT IF EXISTS pk_slug_history")
+    op.execute("ALTER TABLE slug_history_legacy DROP CONSTRAINT IF EXISTS fk_slug_history_slug_map_id_slug_map")
+    op.execute("DROP INDEX IF EXISTS ix_slug_history_slug_map_id")
+
+    op.execute("""
+        CREATE TABLE slug_history (
+            id VARCHAR(50) NOT NULL,
+            changed_at TIMESTAMP WITH TIME ZONE DEFAULT now() NOT NULL,
+            slug_map_id VARCHAR(50) NOT NULL,
+            old_values_json JSONB,
+            new_values_json JSONB,
+            actor VARCHAR(100),
+            CONSTRAINT pk_slug_history PRIMARY KEY (id, changed_at),
+            CONSTRAINT fk_slug_history_slug_map_id_slug_map
+                FOREIGN KEY (slug_map_id) REFERENCES slug_map (id)
+        ) PARTITION BY RANGE (changed_at)
+    """)
+    op.execute("CREATE TABLE slug_history_default PARTITION OF slug_history DEFAULT")
+    op.create_index(
+        'ix_slug_history_slug_map_changed',
+        'slug_history',
+        ['slug_map_id', 'changed_at', 'id'],
+        unique=False,
+    )
+
+    op.execute(f"INSERT INTO slug_history ({COLUMNS}) SELECT {COLUMNS} FROM slug_history_legacy")
+    op.drop_table('slug_history_legacy')
+
+
+def downgrade():
+    """Rebuild slug_history as a plain table."""
+    op.rename_table('slug_history', 'slug_history_partitioned')
+    op.execute("ALTER TABLE slug_history_partitioned DROP CONSTRAINT IF EXISTS pk_slug_history")
+    op.execute("ALTER TABLE slug_history_partitioned DROP CONSTRAINT IF EXISTS fk_slug_history_slug_map_id_slug_map")
+    op.execute("DROP INDEX IF EXISTS ix_slug_history_slug_map_changed")
+
+    op.create_table('slug_history',
+        sa.Column('id', sa.String(length=50), nullable=False),
+        sa.Column('slug_map_id', sa.String(length=50), nullable=False),
+        sa.Column('old_values_json', postgresql.JSONB(), nullable=True),
+        sa.Column('new_values_json', postgresql.JSONB(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('actor', sa.String(length=100), nullable=True),
+        sa.ForeignKeyConstraint(['slug_map_id'], ['slug_map.id'], name='fk_slug_history_slug_map_id_slug_map'),
+        sa.PrimaryKeyConstraint('id', name='pk_slug_history'),
+    )
+    op.create_index('ix_slug_history_slug_map_id', 'slug_history', ['slug_map_id'], unique=False)
+
+    op.execute(f"INSERT INTO slug_history ({COLUMNS}) SELECT {COLUMNS} FROM slug_history_partitioned")
+    op.execute("DROP TABLE slug_history_partitioned CASCADE")
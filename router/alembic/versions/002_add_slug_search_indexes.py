@@ -0,0 +1,51 @@
+"""Add slug search indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 01:00:00.000000
+
+Backs the `q` search on GET /admin/slugs: a text_pattern_ops index for path
+prefixes, pg_trgm GIN indexes for path and canonical URL substrings, and a
+(created_at, id) index for keyset pagination. Indexes are built
+concurrently so slug_map stays writable while they build.
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add pg_trgm and the slug search indexes."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_slug_map_path_pattern "
+            "ON slug_map (path text_pattern_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_slug_map_path_trgm "
+            "ON slug_map USING gin (path gin_trgm_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_slug_map_canonical_url_trgm "
+            "ON slug_map USING gin (canonical_url gin_trgm_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_slug_map_created_at_id "
+            "ON slug_map (created_at, id)"
+        )
+
+
+def downgrade():
+    """Drop the slug search indexes."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_slug_map_created_at_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_slug_map_canonical_url_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_slug_map_path_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_slug_map_path_pattern")
@@ -0,0 +1,50 @@
+"""Add slug_redirect
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 02:00:00.000000
+
+Creates the slug_redirect table that maps old host/path keys of renamed
+slugs to their current canonical URL. Databases where init_db already
+created it are left as they are. Redirects for renames made before this
+table existed can be derived from slug_history with
+scripts/backfill_redirects.py.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create slug_redirect and its index."""
+    if sa.inspect(op.get_bind()).has_table('slug_redirect'):
+        return
+
+    op.create_table(
+        'slug_redirect',
+        sa.Column('host', sa.String(length=255), nullable=False),
+        sa.Column('path', sa.Text(), nullable=False),
+        sa.Column('slug_map_id', sa.String(length=50), nullable=False),
+        sa.Column('target_url', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['slug_map_id'], ['slug_map.id'],
+            name='fk_slug_redirect_slug_map_id_slug_map',
+            ondelete='CASCADE',
+        ),
+        sa.PrimaryKeyConstraint('host', 'path', name='pk_slug_redirect'),
+    )
+    op.create_index('ix_slug_redirect_slug_map_id', 'slug_redirect', ['slug_map_id'])
+
+
+def downgrade():
+    """Drop slug_redirect."""
+    op.drop_index('ix_slug_redirect_slug_map_id', table_name='slug_redirect')
+    op.drop_table('slug_redirect')
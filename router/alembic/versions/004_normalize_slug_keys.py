@@ -0,0 +1,111 @@
+"""Normalize stored slug and redirect keys
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 03:00:00.000000
+
+Rewrites slug_map and slug_redirect host/path keys into the canonical form
+that writes and lookups normalize to (app.normalization, with the
+NORMALIZE_* settings the service runs with). Without this, stored keys with
+mixed case or a www. prefix stop resolving once lookups are normalized.
+
+Several stored keys can normalize to the same canonical key:
+
+- slug_map: for each canonical key and status, the row already stored
+  under the canonical key is kept; if there is none, the most recently
+  updated row moves to it. The other rows keep their old keys and are
+  logged. Active ones among them no longer resolve and need to be merged
+  or renamed by hand.
+- slug_redirect: the redirect already stored under the canonical key wins,
+  else the most recently updated one moves to it. The others are dropped;
+  they were redirects for the same lookup key.
+
+The old keys are not recorded, so the downgrade leaves the data as it is.
+
+"""
+import logging
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.normalization import normalize_key
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _winner(rows, canonical):
+    """Pick the row that takes the canonical key: one already there, else the latest update."""
+    for row in rows:
+        if (row.host, row.path) == canonical:
+            return row
+    return max(rows, key=lambda row: row.updated_at)
+
+
+def _normalize_slug_map(bind) -> None:
+    rows = bind.execute(sa.text("SELECT id, host, path, status, updated_at FROM slug_map")).all()
+    groups = defaultdict(list)
+    for row in rows:
+        groups[(normalize_key(row.host, row.path), row.status)].append(row)
+
+    moved = 0
+    for (canonical, status), group in groups.items():
+        winner = _winner(group, canonical)
+        if (winner.host, winner.path) != canonical:
+            bind.execute(
+                sa.text("UPDATE slug_map SET host = :host, path = :path WHERE id = :id"),
+                {"host": canonical[0], "path": canonical[1], "id": winner.id},
+            )
+            moved += 1
+        for row in group:
+            if row is not winner:
+                logger.warning(
+                    "slug_map %s (%s%s) collides with %s on %s%s (%s) and keeps its old key",
+                    row.id, row.host, row.path, winner.id, *canonical, status,
+                )
+    logger.info("Normalized %d of %d slug_map keys", moved, len(rows))
+
+
+def _normalize_slug_redirect(bind) -> None:
+    rows = bind.execute(sa.text("SELECT host, path, updated_at FROM slug_redirect")).all()
+    groups = defaultdict(list)
+    for row in rows:
+        groups[normalize_key(row.host, row.path)].append(row)
+
+    moved = dropped = 0
+    for canonical, group in groups.items():
+        winner = _winner(group, canonical)
+        for row in group:
+            if row is not winner:
+                bind.execute(
+                    sa.text("DELETE FROM slug_redirect WHERE host = :host AND path = :path"),
+                    {"host": row.host, "path": row.path},
+                )
+                dropped += 1
+        if (winner.host, winner.path) != canonical:
+            bind.execute(
+                sa.text(
+                    "UPDATE slug_redirect SET host = :new_host, path = :new_path "
+                    "WHERE host = :host AND path = :path"
+                ),
+                {"new_host": canonical[0], "new_path": canonical[1], "host": winner.host, "path": winner.path},
+            )
+            moved += 1
+    logger.info("Normalized %d and dropped %d of %d slug_redirect keys", moved, dropped, len(rows))
+
+
+def upgrade():
+    """Rewrite stored keys into canonical form."""
+    bind = op.get_bind()
+    _normalize_slug_map(bind)
+    _normalize_slug_redirect(bind)
+
+
+def downgrade():
+    """Leave normalized keys in place; the original spellings are not kept."""
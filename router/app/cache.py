@@ -1,17 +1,126 @@
 """Redis cache configuration and utilities."""
 
+import asyncio
+import contextlib
 import json
+import time
+from collections import OrderedDict
 from typing import Any, Optional
 
 import redis.asyncio as redis
 from app.config import settings
 from app.logging import get_logger
+from app.tracing import span
 
 logger = get_logger(__name__)
 
 # Redis client
 redis_client: Optional[redis.Redis] = None
 
+# Pub/sub channel carrying resolve cache keys to evict from every replica's local cache
+RESOLVE_INVALIDATION_CHANNEL = "router:resolve:invalidate"
+
+
+class LocalCache:
+    """Small in-process LRU cache with per-entry expiry."""
+    
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Set a value, evicting the least recently used entry when full."""
+        if self.max_size <= 0:
+            return
+        
+        self._entries[key] = (time.monotonic() + (ttl or self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def delete(self, key: str) -> None:
+        """Delete a value."""
+        self._entries.pop(key, None)
+    
+    def clear(self) -> None:
+        """Delete all values."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# In-process cache in front of Redis for resolve results
+local_resolve_cache = LocalCache(settings.local_cache_size, settings.local_cache_ttl)
+
+
+class ResolveInvalidationListener:
+    """Evicts resolve results from the local cache when any replica invalidates them.
+
+    Invalidations are published on a Redis channel. While the subscription
+    is down, evictions are missed, so the local cache is cleared on every
+    (re)subscribe; ``local_cache_ttl`` bounds staleness only when Redis
+    itself is unreachable.
+    """
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+        self.received = 0
+
+    def evict(self, data: str) -> None:
+        """Evict the cache keys of one invalidation message."""
+        self.received += 1
+        for key in json.loads(data):
+            local_resolve_cache.delete(key)
+
+    async def _listen(self) -> None:
+        """Subscribe to invalidations, resubscribing after errors."""
+        while redis_client is not None:
+            try:
+                async with redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(RESOLVE_INVALIDATION_CHANNEL)
+                    local_resolve_cache.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.evict(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Resolve invalidation listener error: {e}")
+                await asyncio.sleep(1)
+
+    def start(self) -> None:
+        """Start listening when Redis is configured."""
+        if redis_client is not None and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+# Global resolve invalidation listener
+resolve_invalidations = ResolveInvalidationListener()
+
 
 async def init_cache() -> None:
     """Initialize Redis cache client."""
@@ -44,6 +153,11 @@ async def close_cache() -> None:
         redis_client = None
 
 
+def get_redis_client() -> Optional[redis.Redis]:
+    """Get the shared Redis client, if caching is enabled."""
+    return redis_client
+
+
 def get_cache_key(host: str, path: str) -> str:
     """Generate cache key for resolve operations."""
     return f"router:resolve:{host}|{path}"
@@ -51,14 +165,21 @@ def get_cache_key(host: str, path: str) -> str:
 
 async def get_cached_resolve(host: str, path: str) -> Optional[dict[str, Any]]:
     """Get cached resolve result."""
+    key = get_cache_key(host, path)
+    cached = local_resolve_cache.get(key)
+    if cached is not None:
+        return cached
+    
     if not redis_client:
         return None
     
     try:
-        key = get_cache_key(host, path)
-        data = await redis_client.get(key)
+        with span("cache.get", key=key):
+            data = await redis_client.get(key)
         if data:
-            return json.loads(data)
+            cached = json.loads(data)
+            local_resolve_cache.set(key, cached)
+            return cached
     except Exception as e:
         logger.warning(f"Cache get error: {e}")
     
@@ -71,30 +192,78 @@ async def set_cached_resolve(
     data: dict[str, Any], 
     ttl: Optional[int] = None
 ) -> None:
-    """Set cached resolve result."""
+    """Set cached resolve result; a ``ttl`` also caps the in-process entry."""
+    key = get_cache_key(host, path)
+    local_resolve_cache.set(key, data, min(ttl, settings.local_cache_ttl) if ttl else None)
+    
     if not redis_client:
         return
     
     try:
-        key = get_cache_key(host, path)
         ttl = ttl or settings.cache_ttl
-        await redis_client.setex(key, ttl, json.dumps(data))
+        with span("cache.set", key=key):
+            await redis_client.setex(key, ttl, json.dumps(data))
     except Exception as e:
         logger.warning(f"Cache set error: {e}")
 
 
+async def set_cached_resolves(
+    items: list[tuple[str, str, dict[str, Any]]],
+    ttl: Optional[int] = None
+) -> None:
+    """Set many cached resolve results in one Redis round trip."""
+    for host, path, data in items:
+        local_resolve_cache.set(get_cache_key(host, path), data)
+    
+    if not redis_client or not items:
+        return
+    
+    try:
+        ttl = ttl or settings.cache_ttl
+        pipe = redis_client.pipeline(transaction=False)
+        for host, path, data in items:
+            pipe.setex(get_cache_key(host, path), ttl, json.dumps(data))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache batch set error: {e}")
+
+
 async def invalidate_resolve_cache(host: str, path: str) -> None:
-    """Invalidate cached resolve result."""
+    """Invalidate cached resolve result on every replica."""
+    key = get_cache_key(host, path)
+    local_resolve_cache.delete(key)
+    
     if not redis_client:
         return
     
     try:
-        key = get_cache_key(host, path)
-        await redis_client.delete(key)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.delete(key)
+        pipe.publish(RESOLVE_INVALIDATION_CHANNEL, json.dumps([key]))
+        await pipe.execute()
     except Exception as e:
         logger.warning(f"Cache invalidation error: {e}")
 
 
+async def invalidate_resolve_caches(keys: list[tuple[str, str]]) -> None:
+    """Invalidate many cached resolve results on every replica in one Redis round trip."""
+    cache_keys = [get_cache_key(host, path) for host, path in keys]
+    for key in cache_keys:
+        local_resolve_cache.delete(key)
+
+    if not redis_client or not cache_keys:
+        return
+
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in cache_keys:
+            pipe.delete(key)
+        pipe.publish(RESOLVE_INVALIDATION_CHANNEL, json.dumps(cache_keys))
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Cache batch invalidation error: {e}")
+
+
 async def get_idempotency_key(key: str) -> Optional[str]:
     """Get idempotency key from cache."""
     if not redis_client:
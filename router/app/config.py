@@ -11,6 +11,9 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = Field(..., description="PostgreSQL connection string")
+    database_replica_url: Optional[str] = Field(None, description="Read replica connection string for read-only paths")
+    replica_max_lag_seconds: float = Field(5.0, description="Replica lag above which reads fall back to the primary")
+    replica_check_interval: int = Field(10, description="Seconds between replica lag checks")
     
     # Redis (optional)
     redis_url: Optional[str] = Field(None, description="Redis connection string")
@@ -23,14 +26,84 @@ class Settings(BaseSettings):
     
     # Application
     log_level: str = Field("INFO", description="Logging level")
+    log_async: bool = Field(True, description="Render and write logs on a background thread")
+    log_queue_size: int = Field(10000, description="Log entries buffered for the background writer before dropping")
+    log_sample_rates: dict[str, float] = Field(
+        default_factory=lambda: {"URL resolved": 0.01, "URL redirected": 0.1},
+        description="Fraction of entries kept per log event name, as JSON",
+    )
     debug: bool = Field(False, description="Debug mode")
     
+    # Startup
+    startup_create_schema: bool = Field(True, description="Run create_all and history partition upkeep on startup; disable when Alembic owns the schema")
+    startup_warm_connections: int = Field(5, description="Database and Redis connections opened and warmed on startup (0 disables)")
+    
     # Cache settings
     cache_ttl: int = Field(600, description="Cache TTL in seconds (5-15 minutes)")
-    
+    local_cache_size: int = Field(10000, description="Max entries in the in-process resolve cache (0 disables)")
+    local_cache_ttl: int = Field(30, description="In-process resolve cache TTL in seconds")
+
+    # Host/path normalization
+    normalize_strip_www: bool = Field(True, description="Treat www.example.com as example.com")
+    normalize_fold_path_case: bool = Field(True, description="Match paths case-insensitively by folding case")
+
+    # Slug key filter (Bloom filter fast path for guaranteed misses)
+    slug_filter_enabled: bool = Field(True, description="Answer definite misses from an in-memory Bloom filter")
+    slug_filter_false_positive_rate: float = Field(0.01, description="Target false-positive rate for the slug key filter")
+    slug_filter_capacity: int = Field(1_000_000, description="Number of keys the slug key filter is sized for")
+    slug_filter_refresh_interval: int = Field(300, description="Seconds between full slug key filter rebuilds")
+    slug_filter_redis_shared: bool = Field(True, description="Share the slug key filter across replicas via Redis; negatives are only trusted when shared")
+
+    # Hot key tracking and cache warming
+    hot_keys_enabled: bool = Field(True, description="Sample resolve traffic to find hot keys")
+    hot_keys_sample_rate: float = Field(0.01, description="Fraction of resolve requests counted")
+    hot_keys_top_k: int = Field(100, description="Number of heavy hitters tracked per replica")
+    hot_keys_flush_interval: int = Field(60, description="Seconds between merges of local counts into Redis")
+    hot_keys_redis_size: int = Field(1000, description="Number of hot keys retained in Redis")
+    hot_keys_warm_count: int = Field(500, description="Number of hot keys preloaded by cache warming")
+
+    # Rate limiting (token buckets per calling service and per host)
+    rate_limit_enabled: bool = Field(True, description="Rate limit resolve requests per service and host")
+    rate_limit_redis_shared: bool = Field(False, description="Share rate limit buckets across replicas via Redis")
+    rate_limit_service_rate: float = Field(1000.0, description="Resolves per second allowed per calling service")
+    rate_limit_service_burst: float = Field(2000.0, description="Resolve burst allowed per calling service")
+    rate_limit_host_rate: float = Field(500.0, description="Resolves per second allowed per host")
+    rate_limit_host_burst: float = Field(1000.0, description="Resolve burst allowed per host")
+    rate_limit_miss_service_rate: float = Field(100.0, description="Cache-miss resolves per second allowed per calling service")
+    rate_limit_miss_service_burst: float = Field(200.0, description="Cache-miss resolve burst allowed per calling service")
+    rate_limit_miss_host_rate: float = Field(50.0, description="Cache-miss resolves per second allowed per host")
+    rate_limit_miss_host_burst: float = Field(100.0, description="Cache-miss resolve burst allowed per host")
+    rate_limit_max_buckets: int = Field(100_000, description="Max in-process rate limit buckets kept")
+
+    # Load shedding on connection pool pressure
+    load_shed_enabled: bool = Field(True, description="Reject database-bound resolves while pool waits are high")
+    load_shed_pool_wait_ms: float = Field(100.0, description="Average pool wait above which database-bound work is shed")
+    load_shed_decay_seconds: float = Field(5.0, description="Half-life of the pool wait average without new samples")
+
+    # Statement stats and slow-query log
+    query_stats_enabled: bool = Field(True, description="Aggregate SQL statement timings by fingerprint")
+    query_stats_max_fingerprints: int = Field(2000, description="Distinct statement fingerprints tracked")
+    slow_query_threshold_ms: float = Field(200.0, description="Statements slower than this are logged")
+
+    # Tracing
+    tracing_enabled: bool = Field(True, description="Record request traces in an in-process ring buffer")
+    trace_buffer_size: int = Field(1000, description="Recent traces kept for the admin API")
+    trace_otlp_endpoint: Optional[str] = Field(None, description="OTLP/HTTP JSON traces endpoint, e.g. http://collector:4318/v1/traces")
+    trace_export_interval: float = Field(5.0, description="Seconds between OTLP trace exports")
+    trace_service_name: str = Field("router", description="service.name reported to the OTLP collector")
+
+    # Slug history
+    history_async_writes: bool = Field(False, description="Buffer history rows and write them in background batches")
+    history_flush_interval: float = Field(1.0, description="Seconds between buffered history flushes")
+    history_batch_size: int = Field(500, description="Max history rows written per batch insert")
+    history_buffer_size: int = Field(10000, description="Buffered history rows that force an inline flush")
+    history_partition_months_ahead: int = Field(3, description="Monthly history partitions created ahead of time")
+    history_retention_months: int = Field(24, description="Months of history kept by the maintenance job (0 keeps all)")
+
     # Pagination
     default_page_size: int = Field(20, description="Default page size for pagination")
     max_page_size: int = Field(100, description="Maximum page size for pagination")
+    export_batch_size: int = Field(2000, description="Rows fetched per server-side cursor batch in exports")
     
     class Config:
         env_file = ".env"
@@ -1,12 +1,20 @@
 """Database configuration and session management."""
 
-from typing import AsyncGenerator
+import asyncio
+import contextlib
+import time
+from typing import AsyncContextManager, AsyncGenerator, AsyncIterator, Awaitable, Callable, Optional
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from app.config import settings
+from app.logging import get_logger
+from app.query_stats import query_stats
+from app.tracing import end_span, start_span
+
+logger = get_logger(__name__)
 
 # Database engine
 engine = create_async_engine(
@@ -23,6 +31,71 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Anything that opens a session as an async context manager, like a sessionmaker
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# Optional read replica engine with its own pool
+replica_engine = (
+    create_async_engine(
+        settings.database_replica_url,
+        echo=settings.debug,
+        pool_pre_ping=True,
+        pool_recycle=300,
+    )
+    if settings.database_replica_url
+    else None
+)
+
+# Replica session factory
+AsyncReplicaSessionLocal = (
+    async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
+
+
+def _start_statement_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Open a tracing span for a statement sent to the database."""
+    context._trace_span = start_span(
+        "db.execute", statement=statement[:500], executemany=executemany
+    )
+
+
+def _end_statement_span(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Close a statement's tracing span."""
+    end_span(getattr(context, "_trace_span", None))
+
+
+def _fail_statement_span(exception_context) -> None:
+    """Close a failed statement's tracing span."""
+    context = exception_context.execution_context
+    if context is not None:
+        end_span(
+            getattr(context, "_trace_span", None),
+            error=type(exception_context.original_exception).__name__,
+        )
+
+
+for _engine in (engine, replica_engine):
+    if _engine is not None:
+        event.listen(_engine.sync_engine, "before_cursor_execute", _start_statement_span)
+        event.listen(_engine.sync_engine, "after_cursor_execute", _end_statement_span)
+        event.listen(_engine.sync_engine, "handle_error", _fail_statement_span)
+        query_stats.install(_engine.sync_engine)
+
+# Replication lag in seconds; zero when the replica has replayed everything
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
 # Metadata
 metadata = MetaData(
     naming_convention={
@@ -41,6 +114,154 @@ class Base(DeclarativeBase):
     metadata = metadata
 
 
+class ReplicaMonitor:
+    """Tracks read replica health and lag."""
+
+    def __init__(self) -> None:
+        self.healthy = replica_engine is not None
+        self.lag_seconds: Optional[float] = None
+        self.last_checked: Optional[float] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_unhealthy(self, error: str) -> None:
+        """Route reads to the primary until the next successful check."""
+        if self.healthy:
+            logger.warning("Read replica unavailable, falling back to primary", error=error)
+        self.healthy = False
+        self.error = error
+
+    async def check(self) -> None:
+        """Measure replica lag and update replica health."""
+        if replica_engine is None:
+            return
+
+        self.last_checked = time.time()
+        try:
+            async with replica_engine.connect() as conn:
+                self.lag_seconds = float(await conn.scalar(REPLICA_LAG_QUERY))
+        except Exception as e:
+            self.lag_seconds = None
+            self.mark_unhealthy(str(e))
+            return
+
+        if self.lag_seconds > settings.replica_max_lag_seconds:
+            self.mark_unhealthy(f"replica lag {self.lag_seconds:.1f}s")
+            return
+
+        if not self.healthy:
+            logger.info("Read replica healthy again", lag_seconds=self.lag_seconds)
+        self.healthy = True
+        self.error = None
+
+    async def _check_loop(self) -> None:
+        """Check the replica on a fixed interval."""
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.replica_check_interval)
+
+    def start(self) -> None:
+        """Start the background lag check task."""
+        if replica_engine is not None and self._task is None:
+            self._task = asyncio.create_task(self._check_loop())
+
+    async def stop(self) -> None:
+        """Stop the background lag check task."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def status(self) -> dict:
+        """Get replica status for health reporting."""
+        return {
+            "configured": replica_engine is not None,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "last_checked": self.last_checked,
+            "error": self.error,
+        }
+
+
+# Global replica monitor instance
+replica_monitor = ReplicaMonitor()
+
+
+class LoadShedder:
+    """Rejects new database-bound work while connection pool waits are high.
+
+    Callers time how long checking out a pool connection takes; the waits
+    feed an exponentially weighted average that decays with a half-life of
+    ``load_shed_decay_seconds`` while no samples arrive. While that average is
+    above ``load_shed_pool_wait_ms``, ``should_shed`` tells callers to refuse
+    work that would need a connection. The decay lets traffic back in to take
+    fresh samples once the pool recovers.
+    """
+
+    SMOOTHING = 0.2
+
+    def __init__(self) -> None:
+        self._wait_ms = 0.0
+        self._updated = time.monotonic()
+        self.samples = 0
+        self.shed = 0
+
+    def current_wait_ms(self) -> float:
+        """Get the decayed average pool wait in milliseconds."""
+        elapsed = time.monotonic() - self._updated
+        return self._wait_ms * 0.5 ** (elapsed / settings.load_shed_decay_seconds)
+
+    def record_wait(self, seconds: float) -> None:
+        """Record how long one connection checkout waited."""
+        average = self.current_wait_ms()
+        self._wait_ms = average + self.SMOOTHING * (seconds * 1000 - average)
+        self._updated = time.monotonic()
+        self.samples += 1
+
+    def should_shed(self) -> bool:
+        """Whether new database-bound work should be rejected now."""
+        if not settings.load_shed_enabled:
+            return False
+        if self.current_wait_ms() <= settings.load_shed_pool_wait_ms:
+            return False
+        self.shed += 1
+        return True
+
+    async def checkout(self, session: AsyncSession) -> None:
+        """Check out the session's connection, recording the pool wait."""
+        started = time.perf_counter()
+        await session.connection()
+        self.record_wait(time.perf_counter() - started)
+
+    def stats(self) -> dict:
+        """Get pool wait and shedding statistics."""
+        return {
+            "enabled": settings.load_shed_enabled,
+            "threshold_ms": settings.load_shed_pool_wait_ms,
+            "pool_wait_ms": round(self.current_wait_ms(), 3),
+            "shedding": self.current_wait_ms() > settings.load_shed_pool_wait_ms,
+            "samples": self.samples,
+            "shed": self.shed,
+        }
+
+
+# Global load shedder instance
+load_shedder = LoadShedder()
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """Whether a session reads from the replica, whose rows may lag the primary."""
+    return replica_engine is not None and session.bind is replica_engine
+
+
+def get_read_sessionmaker() -> async_sessionmaker:
+    """Get the session factory for read-only work, preferring a healthy replica."""
+    if AsyncReplicaSessionLocal is not None and replica_monitor.healthy:
+        return AsyncReplicaSessionLocal
+    return AsyncSessionLocal
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
     async with AsyncSessionLocal() as session:
@@ -50,6 +271,82 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def open_read_session() -> AsyncSession:
+    """Open a read-only session with its connection checked out.
+
+    Prefers a healthy replica and records the pool wait. If the replica
+    cannot hand out a connection, it is marked unhealthy and a session
+    from the primary factory is opened instead.
+    """
+    factory = get_read_sessionmaker()
+    session = factory()
+    try:
+        await load_shedder.checkout(session)
+        return session
+    except Exception as e:
+        await session.close()
+        if factory is AsyncSessionLocal:
+            raise
+        replica_monitor.mark_unhealthy(str(e))
+
+    session = AsyncSessionLocal()
+    try:
+        await load_shedder.checkout(session)
+    except Exception:
+        await session.close()
+        raise
+    return session
+
+
+@contextlib.asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """Open a read-only session for the duration of a block, falling back to the primary."""
+    session = await open_read_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+class ReadSession:
+    """A read-only session opened on first use.
+
+    Requests served from cache never wait on a pool: the replica or the
+    primary is only chosen, and a connection checked out, when ``checkout``
+    is first awaited.
+    """
+
+    def __init__(self, open_session: Optional[Callable[[], Awaitable[AsyncSession]]] = None):
+        self._open_session = open_session or open_read_session
+        self._session: Optional[AsyncSession] = None
+
+    async def checkout(self) -> AsyncSession:
+        """Get the session, opening it and checking out its connection on first use."""
+        if self._session is None:
+            self._session = await self._open_session()
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session if it was opened."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+async def get_read_db() -> AsyncGenerator[ReadSession, None]:
+    """Dependency to get a lazily opened read-only session."""
+    reads = ReadSession()
+    try:
+        yield reads
+    finally:
+        await reads.close()
+
+
+def get_read_session_factory() -> SessionFactory:
+    """Dependency to get a factory of read-only sessions that fall back to the primary."""
+    return read_session
+
+
 async def init_db() -> None:
     """Initialize database tables."""
     async with engine.begin() as conn:
@@ -59,3 +356,5 @@ async def init_db() -> None:
 async def close_db() -> None:
     """Close database connections."""
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
@@ -5,7 +5,7 @@ from typing import Optional
 from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_db, get_read_db, get_read_session_factory
 from app.logging import get_logger
 
 logger = get_logger(__name__)
@@ -46,6 +46,8 @@ async def get_idempotency_key(
 
 # Common dependencies
 DatabaseSession = Depends(get_db)
+ReadDatabaseSession = Depends(get_read_db)
+ReadSessionFactory = Depends(get_read_session_factory)
 AdminAuth = Depends(require_admin)
 InternalAuth = Depends(require_internal)
 IdempotencyKey = Depends(get_idempotency_key)
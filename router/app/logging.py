@@ -1,34 +1,117 @@
 """Logging configuration for the Router service."""
 
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
 import sys
 import uuid
-from typing import Any, Dict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
 import structlog
 from fastapi import Request
 from structlog.types import Processor
 
+from app.config import settings
+
 
 def add_request_id(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
     """Add request ID to log entries."""
-    request_id = getattr(structlog.contextvars, "request_id", None)
+    request_id = structlog.contextvars.get_contextvars().get("request_id")
     if request_id:
         event_dict["request_id"] = request_id
     return event_dict
 
 
+class EventSampler:
+    """Keeps a fraction of selected high-volume log events.
+
+    Rates come from ``log_sample_rates``, keyed by event name. Kept events
+    carry ``sample_rate`` so counts can be scaled back up; events without a
+    rate are always kept. Dropping happens before timestamping and
+    rendering, so sampled-out events cost almost nothing.
+    """
+
+    def __init__(self) -> None:
+        self.sampled_out = 0
+
+    def __call__(self, _, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        rate = settings.log_sample_rates.get(event_dict.get("event"))
+        if rate is None or rate >= 1:
+            return event_dict
+        if random.random() >= rate:
+            self.sampled_out += 1
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that never blocks and leaves formatting to the listener.
+
+    The stock handler formats each record before queueing it, which would
+    keep rendering on the caller's thread. Records are queued as they are,
+    and when the bounded queue is full they are dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def capture_exc_info(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Capture the active exception now; it is gone by the time the entry is rendered."""
+    if event_dict.get("exc_info") is True:
+        event_dict["exc_info"] = sys.exc_info()
+    return event_dict
+
+
+def add_record_timestamp(_, __, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Timestamp an entry with when it was logged rather than when it is written."""
+    created = event_dict["_record"].created
+    timestamp = datetime.fromtimestamp(created, tz=timezone.utc).isoformat()
+    event_dict["timestamp"] = timestamp.replace("+00:00", "Z")
+    return event_dict
+
+
+sampler = EventSampler()
+_queue_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
 def setup_logging() -> None:
-    """Configure structured logging."""
+    """Configure structured logging.
+
+    Events are filtered and sampled on the caller's thread. With
+    ``log_async`` enabled, timestamping, JSON rendering and the write to
+    stdout happen on a background thread fed by a bounded queue.
+    """
+    global _queue_handler, _listener
+
+    stop_logging()
+    _queue_handler = None
+
     processors: list[Processor] = [
         structlog.stdlib.filter_by_level,
+        sampler,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
+        capture_exc_info,
         add_request_id,
-        structlog.processors.JSONRenderer(),
+        structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
     ]
 
     structlog.configure(
@@ -39,6 +122,56 @@ def setup_logging() -> None:
         cache_logger_on_first_use=True,
     )
 
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            foreign_pre_chain=[
+                structlog.stdlib.add_logger_name,
+                structlog.stdlib.add_log_level,
+            ],
+            processors=[
+                add_record_timestamp,
+                structlog.processors.format_exc_info,
+                structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+                structlog.processors.JSONRenderer(),
+            ],
+        )
+    )
+
+    handler: logging.Handler = output
+    if settings.log_async:
+        _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+        _listener = logging.handlers.QueueListener(_queue_handler.queue, output)
+        _listener.start()
+        handler = _queue_handler
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.log_level.upper())
+    # httpx logs every request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    """Write out queued log entries and stop the background writer."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, Any]:
+    """Get sampling and queue statistics."""
+    return {
+        "async": _queue_handler is not None,
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "queue_size": settings.log_queue_size,
+        "dropped": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": sampler.sampled_out,
+        "sample_rates": settings.log_sample_rates,
+    }
+
 
 def get_logger(name: str) -> structlog.stdlib.BoundLogger:
     """Get a structured logger instance."""
@@ -53,8 +186,9 @@ def set_request_id(request_id: str) -> None:
 
 def get_request_id() -> str:
     """Get current request ID from context."""
-    return getattr(structlog.contextvars, "request_id", str(uuid.uuid4()))
+    return structlog.contextvars.get_contextvars().get("request_id") or str(uuid.uuid4())
 
 
 # Initialize logging on module import
 setup_logging()
+atexit.register(stop_logging)
@@ -6,10 +6,16 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.cache import close_cache, init_cache
-from app.db import close_db, init_db
+from app.cache import close_cache, init_cache, resolve_invalidations
+from app.config import settings
+from app.db import close_db, init_db, replica_monitor
 from app.logging import get_logger, set_request_id
-from app.routers import admin_slugs, health, publish, resolve
+from app.routers import admin_slugs, admin_stats, health, publish, resolve
+from app.services.history_service import history_writer, maintain_history
+from app.services.hot_keys import hot_keys
+from app.services.slug_filter import slug_filter
+from app.startup import startup_timer, warm_pools
+from app.tracing import tracer
 
 logger = get_logger(__name__)
 
@@ -20,19 +26,61 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Router service")
     
-    # Initialize database
-    await init_db()
-    logger.info("Database initialized")
+    # Create the schema unless Alembic owns it
+    if settings.startup_create_schema:
+        with startup_timer.phase("schema"):
+            await init_db()
+            logger.info("Database initialized")
+            
+            # Make sure upcoming history partitions exist
+            try:
+                await maintain_history(drop_expired=False)
+            except Exception as e:
+                logger.warning(f"History partition upkeep failed: {e}")
+    
+    # Monitor read replica lag
+    replica_monitor.start()
     
     # Initialize cache
-    await init_cache()
-    logger.info("Cache initialized")
+    with startup_timer.phase("cache"):
+        await init_cache()
+        logger.info("Cache initialized")
+    
+    # Open pooled connections and prepare the resolve statements
+    with startup_timer.phase("warm_pools"):
+        await warm_pools()
+    
+    with startup_timer.phase("background_tasks"):
+        # Evict local resolve results invalidated on other replicas
+        resolve_invalidations.start()
+        
+        # Build the slug key filter in the background
+        slug_filter.start()
+        
+        # Track hot keys and warm the resolve cache with them
+        hot_keys.start()
+        
+        # Write history rows in background batches when enabled
+        history_writer.start()
+        
+        # Export traces to the OTLP collector when configured
+        tracer.start()
+    
+    startup_timer.complete()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Router service")
     
+    # Stop background tasks
+    await slug_filter.stop()
+    await hot_keys.stop()
+    await replica_monitor.stop()
+    await history_writer.stop()
+    await tracer.stop()
+    await resolve_invalidations.stop()
+    
     # Close cache
     await close_cache()
     logger.info("Cache closed")
@@ -63,6 +111,21 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """Trace requests, continuing the caller's W3C trace context."""
+    with tracer.trace(
+        f"{request.method} {request.url.path}",
+        request.headers.get("traceparent"),
+    ) as root:
+        response = await call_next(request)
+        if root is not None:
+            root.attributes["http.status_code"] = response.status_code
+            response.headers["X-Trace-ID"] = root.trace.trace_id
+    
+    return response
+
+
 @app.middleware("http")
 async def add_request_id(request: Request, call_next):
     """Add request ID to all requests."""
@@ -91,6 +154,7 @@ async def add_process_time_header(request: Request, call_next):
 # Include routers
 app.include_router(health.router)
 app.include_router(admin_slugs.router)
+app.include_router(admin_stats.router)
 app.include_router(resolve.router)
 app.include_router(publish.router)
 
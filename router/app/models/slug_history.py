@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, String, event, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,28 +11,46 @@ from app.db import Base
 
 
 class SlugHistory(Base):
-    """Model for slug mapping history audit trail."""
-    
+    """Model for slug mapping history audit trail.
+
+    Rows hold field-level diffs and the table is range-partitioned by month on
+    ``changed_at``; see ``app.services.history_service`` for partition upkeep.
+    """
+
     __tablename__ = "slug_history"
-    
-    # Primary key
+
+    # Primary key (includes the partition key)
     id: Mapped[str] = mapped_column(String(50), primary_key=True)
-    
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
+    )
+
     # Foreign key to slug_map
     slug_map_id: Mapped[str] = mapped_column(
-        String(50), ForeignKey("slug_map.id"), nullable=False, index=True
+        String(50), ForeignKey("slug_map.id"), nullable=False
     )
-    
+
     # Audit fields
     old_values_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     new_values_json: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
-    changed_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
-    )
     actor: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
-    
+
     # Relationship
     slug_map = relationship("SlugMap", back_populates="history")
-    
+
+    __table_args__ = (
+        # Keyset pagination per slug, newest first
+        Index("ix_slug_history_slug_map_changed", "slug_map_id", "changed_at", "id"),
+        {"postgresql_partition_by": "RANGE (changed_at)"},
+    )
+
     def __repr__(self) -> str:
         return f"<SlugHistory(id={self.id}, slug_map_id={self.slug_map_id})>"
+
+
+# Catch-all partition so writes never fail before monthly partitions exist
+event.listen(
+    SlugHistory.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS slug_history_default PARTITION OF slug_history DEFAULT"),
+)
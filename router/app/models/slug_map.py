@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
+    DDL,
     CheckConstraint,
     Column,
     DateTime,
@@ -13,6 +14,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    event,
     func,
 )
 from sqlalchemy.dialects.postgresql import JSONB
@@ -94,7 +96,30 @@ class SlugMap(Base):
         # Indexes
         Index("ix_slug_map_tenant_status", "tenant_id", "status"),
         Index("ix_slug_map_resource", "resource_type", "resource_id"),
+        # Admin search: path prefixes, path/canonical URL substrings, keyset order
+        Index("ix_slug_map_path_pattern", "path", postgresql_ops={"path": "text_pattern_ops"}),
+        Index(
+            "ix_slug_map_path_trgm",
+            "path",
+            postgresql_using="gin",
+            postgresql_ops={"path": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_slug_map_canonical_url_trgm",
+            "canonical_url",
+            postgresql_using="gin",
+            postgresql_ops={"canonical_url": "gin_trgm_ops"},
+        ),
+        Index("ix_slug_map_created_at_id", "created_at", "id"),
     )
     
     def __repr__(self) -> str:
         return f"<SlugMap(id={self.id}, host={self.host}, path={self.path})>"
+
+
+# Trigram operator classes used by the search indexes
+event.listen(
+    SlugMap.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
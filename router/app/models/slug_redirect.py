@@ -0,0 +1,45 @@
+"""SQLAlchemy model for redirects from renamed slugs."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+
+class SlugRedirect(Base):
+    """Model for old host/path keys that redirect to a slug's canonical URL.
+
+    Every old key of a slug points straight at its current canonical URL, so
+    a lookup is always a single hop.
+    """
+
+    __tablename__ = "slug_redirect"
+
+    # Old key
+    host: Mapped[str] = mapped_column(String(255), primary_key=True)
+    path: Mapped[str] = mapped_column(Text, primary_key=True)
+
+    # Slug the old key was renamed from
+    slug_map_id: Mapped[str] = mapped_column(
+        String(50),
+        ForeignKey("slug_map.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    target_url: Mapped[str] = mapped_column(Text, nullable=False)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<SlugRedirect(host={self.host}, path={self.path}, target_url={self.target_url})>"
@@ -0,0 +1,129 @@
+"""Canonical host/path normalization shared by writes and lookups."""
+
+import re
+from typing import Any
+
+from app.config import settings
+
+# Escapes that must stay encoded: decoding them would change the path's
+# structure or produce characters slug paths cannot hold.
+_KEEP_ENCODED = frozenset(b"/?#%")
+_ESCAPE_RE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def _percent_decode(path: str) -> str:
+    """Decode percent-escapes, keeping delimiters, '%' and whitespace encoded."""
+    if "%" not in path:
+        return path
+
+    raw = path.encode("utf-8")
+    out = bytearray()
+    i = 0
+    while i < len(raw):
+        if raw[i] == 0x25 and _ESCAPE_RE.fullmatch(raw[i:i + 3].decode("ascii", "replace")):
+            byte = int(raw[i + 1:i + 3], 16)
+            if byte in _KEEP_ENCODED or byte <= 0x20 or byte == 0x7F:
+                out += b"%%%02X" % byte
+            else:
+                out.append(byte)
+            i += 3
+        else:
+            out.append(raw[i])
+            i += 1
+
+    try:
+        return out.decode("utf-8")
+    except UnicodeDecodeError:
+        # Escapes of invalid UTF-8 are left as they were
+        return path
+
+
+def normalize_host(host: str) -> str:
+    """Normalize a host: case, trailing dot, port, ``www.`` and IDNA."""
+    host = host.strip().lower()
+
+    # Strip the port, including from bracketed IPv6 literals
+    if host.startswith("["):
+        host = host[1:host.find("]")] if "]" in host else host[1:]
+    elif host.count(":") == 1:
+        host = host.split(":", 1)[0]
+
+    host = host.rstrip(".")
+    if settings.normalize_strip_www and host.startswith("www."):
+        host = host[4:]
+
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass
+    return host
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a path: percent-decoding, case and trailing slash."""
+    path = _percent_decode(path.strip())
+    if settings.normalize_fold_path_case:
+        path = path.casefold()
+        # Hex digits of escapes that stayed encoded are upper case
+        path = _ESCAPE_RE.sub(lambda m: m.group(0).upper(), path)
+
+    if not path.startswith("/"):
+        path = "/" + path
+    return path.rstrip("/") or "/"
+
+
+def normalize_key(host: str, path: str) -> tuple[str, str]:
+    """Normalize a host/path pair to the form slugs are stored in."""
+    return normalize_host(host), normalize_path(path)
+
+
+class KeyCollapseTracker:
+    """Counts distinct raw keys that normalize to each canonical key.
+
+    Memory is bounded: at most ``max_keys`` canonical keys are tracked, each
+    with up to ``max_variants`` raw spellings.
+    """
+
+    def __init__(self, max_keys: int = 10000, max_variants: int = 20):
+        self.max_keys = max_keys
+        self.max_variants = max_variants
+        self._variants: dict[str, set[str]] = {}
+        self.lookups = 0
+        self.normalized = 0
+
+    def record(self, raw: tuple[str, str], canonical: tuple[str, str]) -> None:
+        """Record one lookup of a raw key and its canonical form."""
+        self.lookups += 1
+        if raw == canonical:
+            return
+
+        self.normalized += 1
+        canonical_key = f"{canonical[0]}|{canonical[1]}"
+        raw_key = f"{raw[0]}|{raw[1]}"
+        variants = self._variants.get(canonical_key)
+        if variants is None:
+            if len(self._variants) >= self.max_keys:
+                return
+            variants = self._variants[canonical_key] = set()
+        if len(variants) < self.max_variants:
+            variants.add(raw_key)
+
+    def stats(self, limit: int = 20) -> dict[str, Any]:
+        """Get collapse statistics with the most collapsed canonical keys."""
+        top = sorted(self._variants.items(), key=lambda item: len(item[1]), reverse=True)[:limit]
+
+        return {
+            "lookups": self.lookups,
+            "normalized": self.normalized,
+            "normalized_ratio": self.normalized / self.lookups if self.lookups else 0.0,
+            "canonical_keys_tracked": len(self._variants),
+            "top_collapsed": [
+                {"key": key, "raw_variants": len(variants), "examples": sorted(variants)[:5]}
+                for key, variants in top
+            ],
+        }
+
+
+# Global collapse tracker for resolve lookups
+key_collapse = KeyCollapseTracker()
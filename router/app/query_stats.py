@@ -0,0 +1,157 @@
+"""Per-statement timing stats and slow-query logging for the database engines."""
+
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Fingerprint bucket for statements seen after the table is full
+OTHER_FINGERPRINT = "<other>"
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b")
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_VALUES_RE = re.compile(r"VALUES\s*\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Reduce a statement to its shape: literals and bind params become ``?``.
+
+    Lists of values collapse to ``(...)``, so ``IN`` lists and multi-row
+    ``VALUES`` of any length share one fingerprint.
+    """
+    shape = _STRING_RE.sub("?", statement)
+    shape = _PARAM_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    shape = _LIST_RE.sub("(...)", shape)
+    shape = _VALUES_RE.sub("VALUES (...)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+def _row_count(cursor: Any) -> Optional[int]:
+    """Get the rows a statement returned or affected, or None when the driver does not say.
+
+    DML always reports ``rowcount``; drivers may report -1 for SELECTs, as
+    the asyncpg adapter does.
+    """
+    rowcount = getattr(cursor, "rowcount", -1)
+    return rowcount if rowcount >= 0 else None
+
+
+class QueryStats:
+    """Aggregates statement timings by fingerprint and logs slow statements.
+
+    Hooks into ``before/after_cursor_execute``, so every statement is timed
+    at the driver, including ones issued by the ORM. Memory is bounded:
+    after ``query_stats_max_fingerprints`` distinct shapes, new ones are
+    counted under a single ``<other>`` entry. Rows per call are averaged
+    over the calls whose driver reported a row count.
+    """
+
+    def __init__(self) -> None:
+        self._stats: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.slow = 0
+
+    def install(self, engine: Engine) -> None:
+        """Register the execute hooks on a (sync) engine."""
+        event.listen(engine, "before_cursor_execute", self._before_execute)
+        event.listen(engine, "after_cursor_execute", self._after_execute)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        context._query_started = time.perf_counter()
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        self.record(statement, (time.perf_counter() - started) * 1000, _row_count(cursor))
+
+    def record(self, statement: str, duration_ms: float, rows: Optional[int]) -> None:
+        """Record one executed statement; ``rows`` is None when its row count is unknown."""
+        if not settings.query_stats_enabled:
+            return
+
+        key = fingerprint(statement)
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= settings.query_stats_max_fingerprints:
+                    key = OTHER_FINGERPRINT
+                    entry = self._stats.get(key)
+                if entry is None:
+                    entry = self._stats[key] = {
+                        "count": 0,
+                        "total_ms": 0.0,
+                        "max_ms": 0.0,
+                        "rows": 0,
+                        "counted": 0,
+                    }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            if rows is not None:
+                entry["rows"] += rows
+                entry["counted"] += 1
+
+        if duration_ms >= settings.slow_query_threshold_ms:
+            self.slow += 1
+            logger.warning(
+                "Slow query",
+                duration_ms=round(duration_ms, 3),
+                rows=rows,
+                fingerprint=key,
+            )
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> list[dict[str, Any]]:
+        """Get the top fingerprints by total time, max time, count or rows."""
+        with self._lock:
+            items = [(key, dict(entry)) for key, entry in self._stats.items()]
+
+        items.sort(key=lambda item: item[1][order_by], reverse=True)
+        return [
+            {
+                "fingerprint": key,
+                "count": entry["count"],
+                "total_ms": round(entry["total_ms"], 3),
+                "mean_ms": round(entry["total_ms"] / entry["count"], 3),
+                "max_ms": round(entry["max_ms"], 3),
+                "rows": entry["rows"],
+                "rows_per_call": (
+                    round(entry["rows"] / entry["counted"], 2) if entry["counted"] else None
+                ),
+            }
+            for key, entry in items[:limit]
+        ]
+
+    def reset(self) -> None:
+        """Forget all recorded statements."""
+        with self._lock:
+            self._stats.clear()
+        self.slow = 0
+
+    def stats(self, limit: int = 20, order_by: str = "total_ms") -> dict[str, Any]:
+        """Get counters and the top fingerprints."""
+        return {
+            "enabled": settings.query_stats_enabled,
+            "slow_query_threshold_ms": settings.slow_query_threshold_ms,
+            "fingerprints": len(self._stats),
+            "slow": self.slow,
+            "top": self.top(limit, order_by),
+        }
+
+
+# Global statement stats instance
+query_stats = QueryStats()
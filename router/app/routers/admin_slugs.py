@@ -1,21 +1,37 @@
 """Admin router for slug mapping operations."""
 
-from typing import Optional
+from typing import Literal, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.deps import AdminAuth, DatabaseSession, IdempotencyKey
+from app.db import ReadSession, SessionFactory, get_db
+from app.deps import (
+    AdminAuth,
+    DatabaseSession,
+    IdempotencyKey,
+    ReadDatabaseSession,
+    ReadSessionFactory,
+)
 from app.logging import get_logger
 from app.models.slug_map import SlugStatus
+from app.normalization import normalize_host, normalize_key, normalize_path
 from app.schemas.slug import (
     SlugAvailabilityResponse,
+    SlugHistoryListResponse,
+    SlugHistoryResponse,
     SlugMapCreate,
     SlugMapListResponse,
     SlugMapResponse,
     SlugMapUpdate,
+    TenantSlugBulkResponse,
+    TenantSlugBulkUpdate,
 )
+from app.services.export_service import stream_slug_export
+from app.services.history_service import HistoryService
 from app.services.idempotency import IdempotencyService
+from app.services.slug_filter import slug_filter
 from app.services.slug_service import SlugService
 from app.services.tenant_client import get_tenant_client
 
@@ -27,7 +43,7 @@ router = APIRouter(prefix="/admin/slugs", tags=["admin"])
 @router.post("", response_model=SlugMapResponse, status_code=status.HTTP_201_CREATED)
 async def create_slug(
     slug_data: SlugMapCreate,
-    db: DatabaseSession,
+    db: AsyncSession = DatabaseSession,
     admin_role: str = AdminAuth,
     idempotency_key: Optional[str] = IdempotencyKey,
 ) -> SlugMapResponse:
@@ -78,7 +94,7 @@ async def create_slug(
 async def update_slug(
     slug_id: str,
     update_data: SlugMapUpdate,
-    db: DatabaseSession,
+    db: AsyncSession = DatabaseSession,
     admin_role: str = AdminAuth,
 ) -> SlugMapResponse:
     """Update an existing slug mapping."""
@@ -100,7 +116,7 @@ async def update_slug(
 async def delete_slug(
     slug_id: str,
     soft: bool = Query(True, description="Whether to soft delete"),
-    db: DatabaseSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin_role: str = AdminAuth,
 ) -> SlugMapResponse:
     """Delete a slug mapping."""
@@ -118,29 +134,100 @@ async def delete_slug(
     return SlugMapResponse.model_validate(slug_map)
 
 
+async def _bulk_update_tenant(
+    slug_service: SlugService,
+    tenant_id: str,
+    update_data: TenantSlugBulkUpdate,
+    admin_role: str,
+) -> TenantSlugBulkResponse:
+    """Run a tenant-wide bulk update and map conflicts to 409."""
+    try:
+        rows = await slug_service.bulk_update_tenant(
+            tenant_id,
+            host=update_data.host,
+            status=update_data.status,
+            actor=admin_role,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
+    
+    return TenantSlugBulkResponse(
+        tenant_id=tenant_id,
+        affected=len(rows),
+        slug_ids=[row.id for row in rows],
+    )
+
+
+@router.put("/tenants/{tenant_id}", response_model=TenantSlugBulkResponse)
+async def bulk_update_tenant_slugs(
+    tenant_id: str,
+    update_data: TenantSlugBulkUpdate,
+    db: AsyncSession = DatabaseSession,
+    admin_role: str = AdminAuth,
+) -> TenantSlugBulkResponse:
+    """Change host and/or status of all slug mappings of a tenant."""
+    slug_service = SlugService(db, get_tenant_client())
+    return await _bulk_update_tenant(slug_service, tenant_id, update_data, admin_role)
+
+
+@router.delete("/tenants/{tenant_id}", response_model=TenantSlugBulkResponse)
+async def bulk_delete_tenant_slugs(
+    tenant_id: str,
+    db: AsyncSession = DatabaseSession,
+    admin_role: str = AdminAuth,
+) -> TenantSlugBulkResponse:
+    """Soft delete all slug mappings of a tenant."""
+    slug_service = SlugService(db, get_tenant_client())
+    update_data = TenantSlugBulkUpdate(status=SlugStatus.DELETED)
+    return await _bulk_update_tenant(slug_service, tenant_id, update_data, admin_role)
+
+
 @router.get("", response_model=SlugMapListResponse)
 async def list_slugs(
     host: Optional[str] = Query(None, description="Filter by host"),
     tenant_id: Optional[str] = Query(None, description="Filter by tenant ID"),
     status: Optional[SlugStatus] = Query(None, description="Filter by status"),
+    q: Optional[str] = Query(
+        None,
+        min_length=3,
+        max_length=200,
+        description="Path prefix (when starting with /) or path/canonical URL substring; at least 3 characters",
+    ),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
-    db: DatabaseSession = Depends(get_db),
+    reads: ReadSession = ReadDatabaseSession,
     admin_role: str = AdminAuth,
 ) -> SlugMapListResponse:
-    """List slug mappings with pagination."""
+    """List slug mappings with pagination and optional search."""
     tenant_client = get_tenant_client()
-    slug_service = SlugService(db, tenant_client)
+    slug_service = SlugService(await reads.checkout(), tenant_client)
     
-    items, total = await slug_service.list_slugs(
-        host=host,
-        tenant_id=tenant_id,
-        status=status,
-        page=page,
-        page_size=page_size,
-    )
+    if host:
+        host = normalize_host(host)
+    if q and q.startswith("/"):
+        q = normalize_path(q)
+    
+    try:
+        items, total, next_cursor = await slug_service.list_slugs(
+            host=host,
+            tenant_id=tenant_id,
+            status=status,
+            page=page,
+            page_size=page_size,
+            q=q,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e),
+        )
     
-    pages = (total + page_size - 1) // page_size
+    pages = (total + page_size - 1) // page_size if total is not None else None
     
     return SlugMapListResponse(
         items=[SlugMapResponse.model_validate(item) for item in items],
@@ -148,16 +235,75 @@ async def list_slugs(
         page=page,
         page_size=page_size,
         pages=pages,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/export")
+async def export_slugs(
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+    host: Optional[str] = Query(None, description="Filter by host"),
+    tenant_id: Optional[str] = Query(None, description="Filter by tenant ID"),
+    status: Optional[SlugStatus] = Query(None, description="Filter by status"),
+    after: Optional[str] = Query(None, description="Resume after this slug ID"),
+    gzip: bool = Query(False, description="Gzip-compress the response"),
+    session_factory: SessionFactory = ReadSessionFactory,
+    admin_role: str = AdminAuth,
+) -> StreamingResponse:
+    """Stream all matching slug mappings ordered by ID."""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    headers = {"Content-Disposition": f'attachment; filename="slugs.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    
+    return StreamingResponse(
+        stream_slug_export(
+            session_factory,
+            fmt=format,
+            host=normalize_host(host) if host else None,
+            tenant_id=tenant_id,
+            status=status,
+            after=after,
+            compress=gzip,
+        ),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+@router.get("/check-availability", response_model=SlugAvailabilityResponse)
+async def check_availability(
+    host: str = Query(..., description="Host to check"),
+    path: str = Query(..., description="Path to check"),
+    reads: ReadSession = ReadDatabaseSession,
+    admin_role: str = AdminAuth,
+) -> SlugAvailabilityResponse:
+    """Check if a slug is available."""
+    host, path = normalize_key(host, path)
+    
+    # Keys the filter has never seen cannot conflict
+    if not await slug_filter.might_contain(host, path):
+        return SlugAvailabilityResponse(available=True)
+    
+    tenant_client = get_tenant_client()
+    slug_service = SlugService(await reads.checkout(), tenant_client)
+    
+    conflict = await slug_service._check_conflict(host, path, SlugStatus.ACTIVE)
+    
+    return SlugAvailabilityResponse(
+        available=conflict is None,
+        conflicting_id=conflict.id if conflict else None,
     )
 
 
 @router.get("/{slug_id}", response_model=SlugMapResponse)
 async def get_slug(
     slug_id: str,
-    db: DatabaseSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     admin_role: str = AdminAuth,
 ) -> SlugMapResponse:
     """Get a slug mapping by ID."""
+    # Stays on the primary so admins read their own writes
     tenant_client = get_tenant_client()
     slug_service = SlugService(db, tenant_client)
     
@@ -172,20 +318,35 @@ async def get_slug(
     return SlugMapResponse.model_validate(slug_map)
 
 
-@router.get("/check-availability", response_model=SlugAvailabilityResponse)
-async def check_availability(
-    host: str = Query(..., description="Host to check"),
-    path: str = Query(..., description="Path to check"),
-    db: DatabaseSession = Depends(get_db),
+@router.get("/{slug_id}/history", response_model=SlugHistoryListResponse)
+async def get_slug_history(
+    slug_id: str,
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
+    reads: ReadSession = ReadDatabaseSession,
     admin_role: str = AdminAuth,
-) -> SlugAvailabilityResponse:
-    """Check if a slug is available."""
-    tenant_client = get_tenant_client()
-    slug_service = SlugService(db, tenant_client)
+) -> SlugHistoryListResponse:
+    """Get a slug mapping's change history, newest first."""
+    db = await reads.checkout()
+    history_service = HistoryService(db)
     
-    conflict = await slug_service._check_conflict(host, path, SlugStatus.ACTIVE)
+    try:
+        items, next_cursor = await history_service.list_history(slug_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
     
-    return SlugAvailabilityResponse(
-        available=conflict is None,
-        conflicting_id=conflict.id if conflict else None,
+    if not items and not cursor:
+        slug_map = await SlugService(db).get_slug(slug_id)
+        if not slug_map:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Slug mapping not found",
+            )
+    
+    return SlugHistoryListResponse(
+        items=[SlugHistoryResponse.model_validate(item) for item in items],
+        next_cursor=next_cursor,
     )
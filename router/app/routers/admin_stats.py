@@ -0,0 +1,116 @@
+"""Admin router for runtime statistics."""
+
+from typing import Any, Literal
+
+from fastapi import APIRouter, Query
+
+from app.db import load_shedder
+from app.deps import AdminAuth
+from app.logging import get_logger, logging_stats
+from app.normalization import key_collapse
+from app.query_stats import query_stats
+from app.services.history_service import history_writer
+from app.services.hot_keys import hot_keys
+from app.services.rate_limiter import rate_limiter
+from app.services.slug_filter import slug_filter
+from app.startup import startup_timer
+from app.tracing import tracer
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/admin/stats", tags=["admin"])
+
+
+@router.get("/slug-filter")
+async def get_slug_filter_stats(
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get slug key filter size and false-positive statistics."""
+    return slug_filter.stats()
+
+
+@router.get("/hot-keys")
+async def get_hot_keys(
+    limit: int = Query(20, ge=1, le=1000, description="Number of hot keys to return"),
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get the hottest resolve keys, hosts and paths."""
+    return await hot_keys.report(limit)
+
+
+@router.get("/history")
+async def get_history_writer_stats(
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get buffered history writer statistics."""
+    return history_writer.stats()
+
+
+@router.get("/normalization")
+async def get_normalization_stats(
+    limit: int = Query(20, ge=1, le=1000, description="Number of canonical keys to return"),
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get how many raw resolve keys collapse into each canonical key."""
+    return key_collapse.stats(limit)
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats(
+    limit: int = Query(20, ge=1, le=1000, description="Number of limited services to return"),
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get rate limiting and load shedding statistics."""
+    return {
+        "rate_limits": rate_limiter.stats(limit),
+        "load_shedding": load_shedder.stats(),
+    }
+
+
+@router.get("/traces")
+async def get_slowest_traces(
+    limit: int = Query(20, ge=1, le=1000, description="Number of traces to return"),
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get the slowest recent request traces with their spans."""
+    return {
+        "tracer": tracer.stats(),
+        "traces": tracer.slowest(limit),
+    }
+
+
+@router.get("/queries")
+async def get_query_stats(
+    limit: int = Query(20, ge=1, le=1000, description="Number of fingerprints to return"),
+    order_by: Literal["total_ms", "max_ms", "count", "rows"] = Query(
+        "total_ms", description="Sort key for the top fingerprints"
+    ),
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get the top SQL statement fingerprints by time, calls or rows."""
+    return query_stats.stats(limit, order_by)
+
+
+@router.delete("/queries")
+async def reset_query_stats(
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Reset SQL statement statistics."""
+    query_stats.reset()
+    return {"reset": True}
+
+
+@router.get("/startup")
+async def get_startup_stats(
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get the startup phase breakdown of this process."""
+    return startup_timer.report()
+
+
+@router.get("/logging")
+async def get_logging_stats(
+    admin_role: str = AdminAuth,
+) -> dict[str, Any]:
+    """Get log sampling and background writer statistics."""
+    return logging_stats()
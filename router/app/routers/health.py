@@ -1,9 +1,12 @@
 """Health check router."""
 
+from typing import Any
+
 from fastapi import APIRouter, Depends
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_db, replica_monitor
 from app.logging import get_logger
 
 logger = get_logger(__name__)
@@ -12,13 +15,13 @@ router = APIRouter(prefix="/health", tags=["health"])
 
 
 @router.get("")
-async def health_check(db: AsyncSession = Depends(get_db)) -> dict[str, str]:
+async def health_check(db: AsyncSession = Depends(get_db)) -> dict[str, Any]:
     """Health check endpoint."""
     try:
         # Test database connection
-        await db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         logger.debug("Health check passed")
-        return {"status": "ok"}
+        return {"status": "ok", "replica": replica_monitor.status()}
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return {"status": "error"}
+        return {"status": "error", "replica": replica_monitor.status()}
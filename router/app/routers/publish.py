@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends
 from app.deps import AdminAuth, InternalAuth
 from app.logging import get_logger
 from app.schemas.publish import ManifestResponse
+from app.services.hot_keys import hot_keys
 from app.services.manifest_service import ManifestService
 
 logger = get_logger(__name__)
@@ -20,6 +21,7 @@ async def publish_manifest(
     manifest_service = ManifestService()
     
     manifest = await manifest_service.publish_manifest()
+    hot_keys.schedule_warm()
     
     logger.info(
         "Manifest published",
@@ -38,6 +40,7 @@ async def publish_manifest_internal(
     manifest_service = ManifestService()
     
     manifest = await manifest_service.publish_manifest()
+    hot_keys.schedule_warm()
     
     logger.info(
         "Manifest published (internal)",
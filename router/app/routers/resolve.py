@@ -1,34 +1,91 @@
 """Resolve router for URL resolution operations."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import math
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.cache import get_cached_resolve, set_cached_resolve
-from app.deps import DatabaseSession, InternalAuth
-from app.db import get_db
+from app.config import settings
+from app.db import ReadSession, is_replica_session, load_shedder
+from app.deps import InternalAuth, ReadDatabaseSession
 from app.models.slug_map import SlugStatus
 from app.logging import get_logger
-from app.schemas.resolve import CacheInfo, ResourceInfo, ResolveResponse
+from app.normalization import key_collapse, normalize_key
+from app.schemas.resolve import ResolveResponse
+from app.services.hot_keys import hot_keys
+from app.services.rate_limiter import rate_limiter
+from app.services.redirect_service import RedirectService
+from app.services.slug_filter import slug_filter
 from app.services.slug_service import SlugService
 from app.services.tenant_client import get_tenant_client
+from app.tracing import span
 
 logger = get_logger(__name__)
 
 router = APIRouter(prefix="/resolve", tags=["resolve"])
 
 
+def _cache_ttl(db: AsyncSession) -> Optional[int]:
+    """Get the TTL for caching a result read with this session.
+
+    Replica rows can be up to ``replica_max_lag_seconds`` behind a write
+    whose invalidation already ran, so they are only cached that long.
+    """
+    if is_replica_session(db):
+        return max(1, math.ceil(settings.replica_max_lag_seconds))
+    return None
+
+
+def _reject(status_code: int, detail: str, retry_after: float) -> HTTPException:
+    """Build a rejection telling the caller when to retry."""
+    return HTTPException(
+        status_code=status_code,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
 @router.get("", response_model=ResolveResponse)
 async def resolve_url(
     host: str = Query(..., description="Host to resolve"),
     path: str = Query(..., description="Path to resolve"),
-    db: DatabaseSession = Depends(get_db),
+    reads: ReadSession = ReadDatabaseSession,
     service_name: str = InternalAuth,
 ) -> ResolveResponse:
     """Resolve a URL to its corresponding resource."""
+    raw_key = (host, path)
+    host, path = normalize_key(host, path)
+    key_collapse.record(raw_key, (host, path))
+    hot_keys.record(host, path)
+    
+    retry_after = await rate_limiter.acquire(service_name, host)
+    if retry_after:
+        raise _reject(status.HTTP_429_TOO_MANY_REQUESTS, "Rate limit exceeded", retry_after)
+    
     # Check cache first
     cached_result = await get_cached_resolve(host, path)
     if cached_result:
         logger.debug("Cache hit for resolve", host=host, path=path)
-        return ResolveResponse(**cached_result)
+        with span("resolve.serialize"):
+            return ResolveResponse(**cached_result)
+    
+    # Keys the filter has never seen cannot match or be deleted
+    if not await slug_filter.might_contain(host, path):
+        return ResolveResponse(match=False)
+    
+    # Database-bound work has its own, smaller budget and is shed under pool pressure
+    retry_after = await rate_limiter.acquire(service_name, host, miss=True)
+    if retry_after:
+        raise _reject(status.HTTP_429_TOO_MANY_REQUESTS, "Cache miss rate limit exceeded", retry_after)
+    if load_shedder.should_shed():
+        raise _reject(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "Service overloaded",
+            settings.load_shed_decay_seconds,
+        )
+    db = await reads.checkout()
     
     # Initialize services
     tenant_client = get_tenant_client()
@@ -37,40 +94,40 @@ async def resolve_url(
     # Resolve from database
     slug_map = await slug_service.resolve_slug(host, path)
     
-    if not slug_map:
-        # Check if there's a deleted mapping
-        deleted_mapping = await slug_service._check_conflict(host, path, SlugStatus.DELETED)
-        if deleted_mapping:
-            raise HTTPException(
-                status_code=status.HTTP_410_GONE,
-                detail="Slug mapping has been deleted",
+    if not slug_map or slug_map.status == SlugStatus.DELETED:
+        # Renamed keys redirect to the slug's current canonical URL
+        redirect = await RedirectService(db).lookup(host, path)
+        if redirect:
+            with span("resolve.serialize"):
+                response = ResolveResponse.from_redirect(redirect)
+                data = response.model_dump()
+            await set_cached_resolve(host, path, data, _cache_ttl(db))
+            logger.info(
+                "URL redirected",
+                host=host,
+                path=path,
+                redirect=redirect.target_url,
             )
-        
+            return response
+    
+    if not slug_map:
         # No mapping found
+        slug_filter.record_passthrough_miss()
         return ResolveResponse(match=False)
     
-    # Build response
-    resource = ResourceInfo(
-        type=slug_map.resource_type,
-        id=slug_map.resource_id,
-    )
-    
-    cache_info = CacheInfo(
-        max_age=600,  # 10 minutes
-        etag=f'W/"{slug_map.resource_id}-v{slug_map.version}"',
-    )
+    if slug_map.status == SlugStatus.DELETED:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Slug mapping has been deleted",
+        )
     
-    response = ResolveResponse(
-        match=True,
-        resource=resource,
-        tenant_id=slug_map.tenant_id,
-        version=slug_map.version,
-        canonical_url=slug_map.canonical_url,
-        cache=cache_info,
-    )
+    # Build response
+    with span("resolve.serialize"):
+        response = ResolveResponse.from_slug_map(slug_map)
+        data = response.model_dump()
     
     # Cache the result
-    await set_cached_resolve(host, path, response.model_dump())
+    await set_cached_resolve(host, path, data, _cache_ttl(db))
     
     logger.info(
         "URL resolved",
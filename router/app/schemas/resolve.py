@@ -1,10 +1,12 @@
 """Pydantic schemas for resolve operations."""
 
-from typing import Optional
+import zlib
+from typing import Optional, Union
 
 from pydantic import BaseModel, Field, ConfigDict
+from sqlalchemy import Row
 
-from app.models.slug_map import ResourceType
+from app.models.slug_map import ResourceType, SlugMap
 
 
 class ResourceInfo(BaseModel):
@@ -40,8 +42,41 @@ class ResolveResponse(BaseModel):
     tenant_id: Optional[str] = Field(None, description="Tenant ID if available")
     version: Optional[int] = Field(None, description="Version number for cache invalidation")
     canonical_url: Optional[str] = Field(None, description="Canonical URL if available")
+    redirect: Optional[str] = Field(None, description="Current canonical URL if the path was renamed")
     cache: Optional[CacheInfo] = Field(None, description="Cache information")
     
+    @classmethod
+    def from_slug_map(cls, slug_map: Union[SlugMap, Row]) -> "ResolveResponse":
+        """Build a matching resolve response for a slug mapping or resolve row."""
+        return cls(
+            match=True,
+            resource=ResourceInfo(
+                type=slug_map.resource_type,
+                id=slug_map.resource_id,
+            ),
+            tenant_id=slug_map.tenant_id,
+            version=slug_map.version,
+            canonical_url=slug_map.canonical_url,
+            cache=CacheInfo(
+                max_age=600,  # 10 minutes
+                etag=f'W/"{slug_map.resource_id}-v{slug_map.version}"',
+            ),
+        )
+    
+    @classmethod
+    def from_redirect(cls, redirect: Row) -> "ResolveResponse":
+        """Build a redirecting resolve response for a renamed key."""
+        checksum = zlib.crc32(redirect.target_url.encode())
+        return cls(
+            match=True,
+            canonical_url=redirect.target_url,
+            redirect=redirect.target_url,
+            cache=CacheInfo(
+                max_age=600,  # 10 minutes
+                etag=f'W/"{redirect.slug_map_id}-r{checksum:08x}"',
+            ),
+        )
+    
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
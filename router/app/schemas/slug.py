@@ -1,12 +1,13 @@
 """Pydantic schemas for slug mapping operations."""
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic import ConfigDict
 
 from app.models.slug_map import ResourceType, SlugStatus
+from app.normalization import normalize_host, normalize_path
 
 
 class SlugMapBase(BaseModel):
@@ -28,16 +29,16 @@ class SlugMapBase(BaseModel):
             raise ValueError("Path must start with /")
         if " " in v:
             raise ValueError("Path cannot contain spaces")
-        # Normalize trailing slash
-        return v.rstrip("/") if v != "/" else v
+        return normalize_path(v)
     
     @field_validator("host")
     @classmethod
     def validate_host(cls, v: str) -> str:
         """Validate host format."""
+        v = normalize_host(v)
         if not v or "." not in v:
             raise ValueError("Host must be a valid domain name")
-        return v.lower()
+        return v
 
 
 class SlugMapCreate(SlugMapBase):
@@ -79,7 +80,7 @@ class SlugMapUpdate(BaseModel):
             raise ValueError("Path must start with /")
         if " " in v:
             raise ValueError("Path cannot contain spaces")
-        return v.rstrip("/") if v != "/" else v
+        return normalize_path(v)
     
     @field_validator("host")
     @classmethod
@@ -87,9 +88,10 @@ class SlugMapUpdate(BaseModel):
         """Validate host format."""
         if v is None:
             return v
+        v = normalize_host(v)
         if not v or "." not in v:
             raise ValueError("Host must be a valid domain name")
-        return v.lower()
+        return v
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -115,10 +117,11 @@ class SlugMapListResponse(BaseModel):
     """Schema for paginated slug mapping list response."""
     
     items: list[SlugMapResponse] = Field(..., description="List of slug mappings")
-    total: int = Field(..., description="Total number of items")
+    total: Optional[int] = Field(None, description="Total number of items (not counted for searches and cursor pages)")
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Page size")
-    pages: int = Field(..., description="Total number of pages")
+    pages: Optional[int] = Field(None, description="Total number of pages (not counted for searches and cursor pages)")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
 
 
 class SlugAvailabilityResponse(BaseModel):
@@ -135,3 +138,78 @@ class SlugAvailabilityResponse(BaseModel):
             }
         }
     )
+
+
+class TenantSlugBulkUpdate(BaseModel):
+    """Schema for changing all slug mappings of a tenant at once."""
+    
+    host: Optional[str] = Field(None, description="New domain name for every mapping")
+    status: Optional[SlugStatus] = Field(None, description="New status for every mapping")
+    
+    @field_validator("host")
+    @classmethod
+    def validate_host(cls, v: Optional[str]) -> Optional[str]:
+        """Validate host format."""
+        if v is None:
+            return v
+        v = normalize_host(v)
+        if not v or "." not in v:
+            raise ValueError("Host must be a valid domain name")
+        return v
+    
+    @model_validator(mode="after")
+    def validate_change(self) -> "TenantSlugBulkUpdate":
+        """Require at least one field to change."""
+        if self.host is None and self.status is None:
+            raise ValueError("Either host or status must be provided")
+        return self
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "host": "barbershop-a.com"
+            }
+        }
+    )
+
+
+class TenantSlugBulkResponse(BaseModel):
+    """Schema for tenant-wide bulk operation response."""
+    
+    tenant_id: str = Field(..., description="Tenant ID")
+    affected: int = Field(..., description="Number of slug mappings changed")
+    slug_ids: list[str] = Field(..., description="IDs of the changed slug mappings")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "tenant_id": "ten_123",
+                "affected": 2,
+                "slug_ids": ["slug_123", "slug_456"]
+            }
+        }
+    )
+
+
+class SlugHistoryResponse(BaseModel):
+    """Schema for a slug history entry."""
+    
+    id: str = Field(..., description="Unique identifier")
+    slug_map_id: str = Field(..., description="Slug mapping ID")
+    old_values: Optional[dict[str, Any]] = Field(
+        None, validation_alias="old_values_json", description="Previous values of changed fields"
+    )
+    new_values: Optional[dict[str, Any]] = Field(
+        None, validation_alias="new_values_json", description="New values of changed fields"
+    )
+    changed_at: datetime = Field(..., description="When the change occurred")
+    actor: Optional[str] = Field(None, description="Who made the change")
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SlugHistoryListResponse(BaseModel):
+    """Schema for keyset-paginated slug history response."""
+    
+    items: list[SlugHistoryResponse] = Field(..., description="History entries, newest first")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if any")
@@ -0,0 +1,117 @@
+"""Streaming export of slug mappings."""
+
+import csv
+import enum
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.db import SessionFactory
+from app.logging import get_logger
+from app.models.slug_map import SlugMap, SlugStatus
+
+logger = get_logger(__name__)
+
+# Exported columns, in output order
+EXPORT_COLUMNS = (
+    SlugMap.id,
+    SlugMap.host,
+    SlugMap.path,
+    SlugMap.resource_type,
+    SlugMap.resource_id,
+    SlugMap.tenant_id,
+    SlugMap.status,
+    SlugMap.version,
+    SlugMap.canonical_url,
+    SlugMap.created_at,
+    SlugMap.updated_at,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def _export_value(value: Any) -> Any:
+    """Convert a column value for NDJSON/CSV output."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _format_ndjson(rows: list) -> str:
+    """Format rows as newline-delimited JSON."""
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+
+def _format_csv(rows: list) -> str:
+    """Format rows as CSV lines."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_export_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_slug_export(
+    session_factory: SessionFactory,
+    fmt: str = "ndjson",
+    host: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+    status: Optional[SlugStatus] = None,
+    after: Optional[str] = None,
+    compress: bool = False
+) -> AsyncIterator[bytes]:
+    """Stream slug mappings ordered by ID from a server-side cursor.
+
+    Memory stays constant: rows are fetched ``export_batch_size`` at a time and
+    each batch is encoded (and gzip-compressed) before the next is fetched.
+    ``after`` resumes an interrupted export after the last ID received.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    formatter = _format_csv if fmt == "csv" else _format_ndjson
+
+    def encode(text: str) -> bytes:
+        data = text.encode()
+        return compressor.compress(data) if compressor else data
+
+    query = select(*EXPORT_COLUMNS)
+    if host:
+        query = query.where(SlugMap.host == host)
+    if tenant_id:
+        query = query.where(SlugMap.tenant_id == tenant_id)
+    if status:
+        query = query.where(SlugMap.status == status)
+    if after:
+        query = query.where(SlugMap.id > after)
+    query = query.order_by(SlugMap.id).execution_options(yield_per=settings.export_batch_size)
+
+    if fmt == "csv":
+        yield encode(",".join(EXPORT_FIELDS) + "\r\n")
+
+    count = 0
+    async with session_factory() as db:
+        result = await db.stream(query)
+        async for rows in result.partitions():
+            count += len(rows)
+            data = encode(formatter(rows))
+            if data:
+                yield data
+
+    if compressor:
+        yield compressor.flush()
+
+    logger.info(
+        "Slug export completed",
+        format=fmt,
+        rows=count,
+        host=host,
+        tenant_id=tenant_id,
+        after=after,
+    )
@@ -0,0 +1,309 @@
+"""Slug history diffs, buffered writes, partition upkeep and pagination."""
+
+import asyncio
+import contextlib
+import enum
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import insert, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.config import settings
+from app.db import AsyncSessionLocal, engine
+from app.logging import get_logger
+from app.models.slug_history import SlugHistory
+from app.pagination import decode_cursor, encode_cursor
+
+logger = get_logger(__name__)
+
+PARTITION_PREFIX = "slug_history_"
+DEFAULT_PARTITION = "slug_history_default"
+
+# Existing partitions of slug_history
+PARTITIONS_QUERY = text(
+    "SELECT c.relname FROM pg_inherits i "
+    "JOIN pg_class c ON c.oid = i.inhrelid "
+    "JOIN pg_class p ON p.oid = i.inhparent "
+    "WHERE p.relname = 'slug_history'"
+)
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert a column value to something JSONB can store."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def diff_values(
+    old_values: dict[str, Any],
+    new_values: dict[str, Any]
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Get the fields that changed, as (old, new) dicts of JSON values."""
+    old_diff = {}
+    new_diff = {}
+    for field, new in new_values.items():
+        old = to_json_value(old_values.get(field))
+        new = to_json_value(new)
+        if old != new:
+            old_diff[field] = old
+            new_diff[field] = new
+    return old_diff, new_diff
+
+
+class HistoryWriter:
+    """Buffers history rows and writes them in batch inserts off the request path.
+
+    Rows are handed over only after the slug change has committed. A failed
+    batch is retried row by row so one bad row (for example, a slug that was
+    hard deleted in the meantime) does not lose the rest.
+    """
+
+    def __init__(self) -> None:
+        self._buffer: list[dict[str, Any]] = []
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.last_flush_seconds: Optional[float] = None
+
+    async def enqueue(self, records: list[dict[str, Any]]) -> None:
+        """Buffer history rows; flushes inline when no writer task runs or the buffer is full."""
+        self._buffer.extend(records)
+        if self._task is None or len(self._buffer) >= settings.history_buffer_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all buffered rows."""
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            started = time.perf_counter()
+            while self._buffer:
+                batch = self._buffer[:settings.history_batch_size]
+                del self._buffer[:len(batch)]
+                await self._write(batch)
+
+            self.flushes += 1
+            self.last_flush_seconds = time.perf_counter() - started
+
+    async def _write(self, batch: list[dict[str, Any]]) -> None:
+        """Write one batch, falling back to single rows on failure."""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(insert(SlugHistory), batch)
+                await db.commit()
+            self.written += len(batch)
+            return
+        except Exception as e:
+            logger.warning(f"History batch write failed, retrying rows individually: {e}")
+
+        for record in batch:
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(insert(SlugHistory), [record])
+                    await db.commit()
+                self.written += 1
+            except Exception as e:
+                self.dropped += 1
+                logger.warning(
+                    "History row dropped",
+                    slug_map_id=record.get("slug_map_id"),
+                    error=str(e),
+                )
+
+    async def _flush_loop(self) -> None:
+        """Flush buffered rows on a fixed interval."""
+        while True:
+            await asyncio.sleep(settings.history_flush_interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"History flush failed: {e}")
+
+    def start(self) -> None:
+        """Start the background flush task."""
+        if settings.history_async_writes and self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the background flush task and write what is left."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        """Get buffered writer statistics."""
+        return {
+            "async_writes": settings.history_async_writes,
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "last_flush_seconds": self.last_flush_seconds,
+        }
+
+
+# Global history writer instance
+history_writer = HistoryWriter()
+
+
+def add_months(month: date, months: int) -> date:
+    """Get the first day of the month ``months`` after ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def to_utc_datetime(day: date) -> datetime:
+    """Get UTC midnight of a day, used for partition bounds."""
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+
+
+def get_partition_name(month: date) -> str:
+    """Get the partition table name for a month."""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+async def ensure_history_partitions(
+    conn: AsyncConnection,
+    months_ahead: Optional[int] = None
+) -> list[str]:
+    """Create monthly partitions from the current month onward.
+
+    Rows that landed in the default partition for a month are moved into its
+    new partition, so this is safe to run at any time. Returns the names of
+    the partitions created.
+    """
+    months_ahead = settings.history_partition_months_ahead if months_ahead is None else months_ahead
+    existing = set((await conn.execute(PARTITIONS_QUERY)).scalars())
+    current = datetime.now(timezone.utc).date().replace(day=1)
+
+    created = []
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        name = get_partition_name(start)
+        if name in existing:
+            continue
+
+        end = add_months(start, 1)
+        bounds = {"start": to_utc_datetime(start), "end": to_utc_datetime(end)}
+        await conn.execute(text(
+            f"CREATE TABLE {name} (LIKE slug_history INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        if DEFAULT_PARTITION in existing:
+            await conn.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    "WHERE changed_at >= :start AND changed_at < :end RETURNING *) "
+                    f"INSERT INTO {name} SELECT * FROM moved"
+                ),
+                bounds,
+            )
+        await conn.execute(text(
+            f"ALTER TABLE slug_history ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+        ))
+        created.append(name)
+
+    if created:
+        logger.info("History partitions created", partitions=created)
+    return created
+
+
+async def drop_expired_history_partitions(
+    conn: AsyncConnection,
+    retention_months: Optional[int] = None
+) -> list[str]:
+    """Drop monthly partitions older than the retention window.
+
+    Dropping whole partitions frees space at once, without the row deletes
+    and vacuum work a plain DELETE would need. Returns the names dropped.
+    """
+    retention_months = settings.history_retention_months if retention_months is None else retention_months
+    if retention_months <= 0:
+        return []
+
+    cutoff = add_months(datetime.now(timezone.utc).date().replace(day=1), -retention_months)
+    existing = (await conn.execute(PARTITIONS_QUERY)).scalars().all()
+
+    dropped = []
+    for name in sorted(existing):
+        suffix = name[len(PARTITION_PREFIX):]
+        if not (name.startswith(PARTITION_PREFIX) and suffix.isdigit()):
+            continue
+        month = date(int(suffix[:4]), int(suffix[4:]), 1)
+        if add_months(month, 1) <= cutoff:
+            await conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+
+    if DEFAULT_PARTITION in existing:
+        await conn.execute(
+            text(f"DELETE FROM {DEFAULT_PARTITION} WHERE changed_at < :cutoff"),
+            {"cutoff": to_utc_datetime(cutoff)},
+        )
+
+    if dropped:
+        logger.info("Expired history partitions dropped", partitions=dropped)
+    return dropped
+
+
+async def maintain_history(drop_expired: bool = True) -> dict[str, list[str]]:
+    """Run partition upkeep: create upcoming partitions, drop expired ones."""
+    async with engine.begin() as conn:
+        created = await ensure_history_partitions(conn)
+        dropped = await drop_expired_history_partitions(conn) if drop_expired else []
+    return {"created": created, "dropped": dropped}
+
+
+class HistoryService:
+    """Service for reading slug history."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_history(
+        self,
+        slug_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> tuple[list[SlugHistory], Optional[str]]:
+        """List a slug's history newest first using keyset pagination.
+
+        Returns the page and the cursor for the next one, if any. Raises
+        ValueError for a malformed cursor.
+        """
+        query = select(SlugHistory).where(SlugHistory.slug_map_id == slug_id)
+
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2:
+                raise ValueError("Invalid cursor")
+            changed_at = datetime.fromisoformat(values[0])
+            if changed_at.tzinfo is None:
+                changed_at = changed_at.replace(tzinfo=timezone.utc)
+            query = query.where(
+                tuple_(SlugHistory.changed_at, SlugHistory.id) < tuple_(changed_at, values[1])
+            )
+
+        query = query.order_by(SlugHistory.changed_at.desc(), SlugHistory.id.desc()).limit(limit + 1)
+        result = await self.db.execute(query)
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(last.changed_at, last.id)
+
+        return items, next_cursor
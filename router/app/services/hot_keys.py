@@ -0,0 +1,234 @@
+"""Sampled access counting and hot-key cache warming for resolve traffic."""
+
+import asyncio
+import contextlib
+import hashlib
+import random
+from collections import Counter
+from typing import Any, Optional
+
+from sqlalchemy import select, tuple_
+
+from app.cache import get_redis_client, set_cached_resolves
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.logging import get_logger
+from app.models.slug_map import SlugMap, SlugStatus
+from app.schemas.resolve import ResolveResponse
+
+logger = get_logger(__name__)
+
+# Redis sorted set of host|path keys scored by sampled access count
+HOT_KEYS_KEY = "router:hot_keys"
+HOT_KEYS_TTL = 86400
+
+WARM_BATCH_SIZE = 500
+
+
+def get_hot_key(host: str, path: str) -> str:
+    """Generate hot key for a host/path pair."""
+    return f"{host}|{path}"
+
+
+def split_hot_key(key: str) -> tuple[str, str]:
+    """Split a hot key back into host and path."""
+    host, _, path = key.partition("|")
+    return host, path
+
+
+class CountMinSketch:
+    """Count-min sketch for approximate per-key counts in fixed memory."""
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def _indexes(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add to a key's count and return its new estimate."""
+        estimate = None
+        for row, index in zip(self.rows, self._indexes(key)):
+            row[index] += count
+            if estimate is None or row[index] < estimate:
+                estimate = row[index]
+        return estimate or 0
+
+    def estimate(self, key: str) -> int:
+        """Estimate a key's count; never an underestimate."""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def clear(self) -> None:
+        """Reset all counts."""
+        for row in self.rows:
+            row[:] = [0] * self.width
+
+
+class HotKeyTracker:
+    """Tracks heavy-hitter resolve keys and warms caches from them.
+
+    A sample of resolve requests is counted in a count-min sketch; the top-K
+    keys by estimated count are kept as candidates. Candidates are merged
+    into a Redis sorted set on an interval so every replica sees the same
+    global ranking, which cache warming reads on startup and after publish.
+    """
+
+    def __init__(self) -> None:
+        self.sketch = CountMinSketch()
+        self.candidates: dict[str, int] = {}
+        self.sampled = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._warm_task: Optional[asyncio.Task] = None
+        self.last_warmed = 0
+
+    def record(self, host: str, path: str) -> None:
+        """Record a resolve request, subject to sampling."""
+        if not settings.hot_keys_enabled:
+            return
+        if random.random() >= settings.hot_keys_sample_rate:
+            return
+
+        self.sampled += 1
+        key = get_hot_key(host, path)
+        weight = max(1, round(1 / settings.hot_keys_sample_rate))
+        estimate = self.sketch.add(key, weight)
+
+        if key in self.candidates or len(self.candidates) < settings.hot_keys_top_k:
+            self.candidates[key] = estimate
+            return
+
+        coldest = min(self.candidates, key=self.candidates.__getitem__)
+        if estimate > self.candidates[coldest]:
+            del self.candidates[coldest]
+            self.candidates[key] = estimate
+
+    async def flush(self) -> None:
+        """Merge local candidate counts into Redis and reset local state."""
+        client = get_redis_client()
+        if not client or not self.candidates:
+            return
+
+        candidates = self.candidates
+        self.candidates = {}
+        self.sketch.clear()
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, count in candidates.items():
+                pipe.zincrby(HOT_KEYS_KEY, count, key)
+            pipe.zremrangebyrank(HOT_KEYS_KEY, 0, -settings.hot_keys_redis_size - 1)
+            pipe.expire(HOT_KEYS_KEY, HOT_KEYS_TTL)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Hot key flush error: {e}")
+
+    async def top_keys(self, limit: int) -> list[tuple[str, int]]:
+        """Get the hottest keys with their counts, globally when Redis is available."""
+        client = get_redis_client()
+        if client:
+            try:
+                entries = await client.zrevrange(HOT_KEYS_KEY, 0, limit - 1, withscores=True)
+                if entries:
+                    return [(key, int(score)) for key, score in entries]
+            except Exception as e:
+                logger.warning(f"Hot key read error: {e}")
+
+        return Counter(self.candidates).most_common(limit)
+
+    async def report(self, limit: int) -> dict[str, Any]:
+        """Get hot keys plus their counts aggregated by host and by path."""
+        keys = await self.top_keys(limit)
+        entries = []
+        hosts: Counter[str] = Counter()
+        paths: Counter[str] = Counter()
+        for key, count in keys:
+            host, path = split_hot_key(key)
+            entries.append({"host": host, "path": path, "count": count})
+            hosts[host] += count
+            paths[path] += count
+
+        return {
+            "keys": entries,
+            "hosts": [{"host": host, "count": count} for host, count in hosts.most_common()],
+            "paths": [{"path": path, "count": count} for path, count in paths.most_common()],
+            "sampled": self.sampled,
+            "sample_rate": settings.hot_keys_sample_rate,
+            "last_warmed": self.last_warmed,
+        }
+
+    async def warm(self, limit: Optional[int] = None) -> int:
+        """Preload the hottest keys into the resolve caches."""
+        keys = await self.top_keys(limit or settings.hot_keys_warm_count)
+        pairs = [split_hot_key(key) for key, _ in keys]
+        warmed = 0
+
+        # Read from the primary: replica rows may predate a recent write's invalidation
+        async with AsyncSessionLocal() as db:
+            for start in range(0, len(pairs), WARM_BATCH_SIZE):
+                batch = pairs[start:start + WARM_BATCH_SIZE]
+                query = select(SlugMap).where(
+                    tuple_(SlugMap.host, SlugMap.path).in_(batch),
+                    SlugMap.status == SlugStatus.ACTIVE,
+                )
+                result = await db.execute(query)
+                items = [
+                    (
+                        slug_map.host,
+                        slug_map.path,
+                        ResolveResponse.from_slug_map(slug_map).model_dump(),
+                    )
+                    for slug_map in result.scalars()
+                ]
+                await set_cached_resolves(items)
+                warmed += len(items)
+
+        self.last_warmed = warmed
+        logger.info("Resolve cache warmed", requested=len(pairs), warmed=warmed)
+        return warmed
+
+    async def _safe_warm(self) -> None:
+        try:
+            await self.warm()
+        except Exception as e:
+            logger.warning(f"Resolve cache warming failed: {e}")
+
+    def schedule_warm(self) -> None:
+        """Start a background warming run unless one is already in progress."""
+        if not settings.hot_keys_enabled:
+            return
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.create_task(self._safe_warm())
+
+    async def _flush_loop(self) -> None:
+        """Flush local counts into Redis on a fixed interval."""
+        while True:
+            await asyncio.sleep(settings.hot_keys_flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background flush task and an initial warming run."""
+        if not settings.hot_keys_enabled:
+            return
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+        self.schedule_warm()
+
+    async def stop(self) -> None:
+        """Stop background tasks and flush remaining counts."""
+        for task in (self._flush_task, self._warm_task):
+            if task and not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._flush_task = None
+        self._warm_task = None
+        await self.flush()
+
+
+# Global hot key tracker instance
+hot_keys = HotKeyTracker()
@@ -4,18 +4,35 @@ import json
 from datetime import datetime
 from typing import Optional
 
-import boto3
-from botocore.exceptions import ClientError
 from sqlalchemy import select
 
 from app.config import settings
-from app.db import AsyncSessionLocal
+from app.db import read_session
 from app.logging import get_logger
 from app.models.slug_map import SlugMap, SlugStatus
 from app.schemas.publish import ManifestItem, ManifestResponse
+from app.tracing import span
 
 logger = get_logger(__name__)
 
+# S3 client, created on first publish
+_s3_client = None
+
+
+def get_s3_client():
+    """Get the S3 client, importing boto3 on first use.
+
+    boto3 takes a large share of the service's import time and is only
+    needed to publish, so it is kept off the startup path.
+    """
+    global _s3_client
+    
+    if _s3_client is None:
+        import boto3
+        
+        _s3_client = boto3.client("s3")
+    return _s3_client
+
 
 class ManifestService:
     """Service for manifest generation and publishing."""
@@ -23,36 +40,38 @@ class ManifestService:
     def __init__(self):
         self.s3_client = None
         if settings.publish_s3_bucket:
-            self.s3_client = boto3.client("s3")
+            self.s3_client = get_s3_client()
     
     async def build_manifest(self) -> ManifestResponse:
         """Build a compact manifest of all active slug mappings."""
-        async with AsyncSessionLocal() as db:
+        async with read_session() as db:
             # Query all active slugs
             query = select(SlugMap).where(SlugMap.status == SlugStatus.ACTIVE)
-            result = await db.execute(query)
-            slug_maps = result.scalars().all()
+            with span("manifest.query"):
+                result = await db.execute(query)
+                slug_maps = result.scalars().all()
             
-            # Convert to compact format
-            items = []
-            for slug_map in slug_maps:
-                manifest_item = ManifestItem(
-                    host=slug_map.host,
-                    path=slug_map.path,
-                    resource_type=slug_map.resource_type.value,
-                    resource_id=slug_map.resource_id,
-                    version=slug_map.version
+            with span("manifest.build", count=len(slug_maps)):
+                # Convert to compact format
+                items = []
+                for slug_map in slug_maps:
+                    manifest_item = ManifestItem(
+                        host=slug_map.host,
+                        path=slug_map.path,
+                        resource_type=slug_map.resource_type.value,
+                        resource_id=slug_map.resource_id,
+                        version=slug_map.version
+                    )
+                    items.append(manifest_item.to_compact_format())
+                
+                # Sort for consistent output
+                items.sort(key=lambda x: (x[0], x[1]))
+                
+                manifest = ManifestResponse(
+                    generated_at=datetime.utcnow(),
+                    count=len(items),
+                    items=items
                 )
-                items.append(manifest_item.to_compact_format())
-            
-            # Sort for consistent output
-            items.sort(key=lambda x: (x[0], x[1]))
-            
-            manifest = ManifestResponse(
-                generated_at=datetime.utcnow(),
-                count=len(items),
-                items=items
-            )
             
             logger.info(
                 "Manifest built",
@@ -67,22 +86,26 @@ class ManifestService:
         if not self.s3_client or not settings.publish_s3_bucket:
             return None, None
         
+        from botocore.exceptions import ClientError
+        
         try:
             # Convert to JSON
-            manifest_json = manifest.model_dump_json()
+            with span("manifest.serialize"):
+                manifest_json = manifest.model_dump_json()
             
             # Upload to S3
-            response = self.s3_client.put_object(
-                Bucket=settings.publish_s3_bucket,
-                Key="router/manifest.json",
-                Body=manifest_json,
-                ContentType="application/json",
-                CacheControl="max-age=600",  # 10 minutes
-                Metadata={
-                    "generated_at": manifest.generated_at.isoformat(),
-                    "count": str(manifest.count)
-                }
-            )
+            with span("manifest.upload", bucket=settings.publish_s3_bucket):
+                response = self.s3_client.put_object(
+                    Bucket=settings.publish_s3_bucket,
+                    Key="router/manifest.json",
+                    Body=manifest_json,
+                    ContentType="application/json",
+                    CacheControl="max-age=600",  # 10 minutes
+                    Metadata={
+                        "generated_at": manifest.generated_at.isoformat(),
+                        "count": str(manifest.count)
+                    }
+                )
             
             s3_url = f"https://{settings.publish_s3_bucket}.s3.amazonaws.com/router/manifest.json"
             etag = response.get("ETag", "").strip('"')
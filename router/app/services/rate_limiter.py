@@ -0,0 +1,192 @@
+"""Per-caller token-bucket rate limiting for resolve traffic."""
+
+import time
+from collections import Counter, OrderedDict
+from typing import Any
+
+from app.cache import get_redis_client
+from app.config import settings
+from app.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Redis hashes holding shared bucket state, one per bucket key
+BUCKET_KEY_PREFIX = "router:ratelimit:"
+
+# Refills every bucket in KEYS, then takes one token from each only if all of
+# them have one. ARGV is now followed by a rate/burst pair per key. Returns
+# the seconds until the call would be allowed, as a string so fractions
+# survive the reply conversion.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+  local rate = tonumber(ARGV[i * 2])
+  local burst = tonumber(ARGV[i * 2 + 1])
+  local saved = redis.call('HMGET', key, 'tokens', 'updated')
+  local available = tonumber(saved[1]) or burst
+  local updated = tonumber(saved[2]) or now
+  available = math.min(burst, available + math.max(0, now - updated) * rate)
+  tokens[i] = available
+  if available < 1 then
+    wait = math.max(wait, (1 - available) / rate)
+  end
+end
+for i, key in ipairs(KEYS) do
+  local rate = tonumber(ARGV[i * 2])
+  local burst = tonumber(ARGV[i * 2 + 1])
+  local available = tokens[i]
+  if wait == 0 then
+    available = available - 1
+  end
+  redis.call('HSET', key, 'tokens', available, 'updated', now)
+  redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second."""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill."""
+        self.tokens = min(self.burst, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Get the seconds until one token is available; zero if one is."""
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token-bucket limits per calling service and per host.
+
+    Every resolve takes a token from its caller's service and host buckets;
+    requests that would hit the database also take one from the smaller
+    cache-miss buckets, so a caller flooding uncacheable keys is stopped long
+    before its cached traffic is. A request is allowed only if all of its
+    buckets have a token.
+
+    Buckets live in process memory, bounded to ``rate_limit_max_buckets``
+    least recently used keys. With ``rate_limit_redis_shared`` enabled they
+    live in Redis instead so the budgets hold across replicas; if Redis is
+    unreachable the local buckets are used.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self.allowed = 0
+        self.limited: Counter[str] = Counter()
+        self.limited_services: Counter[str] = Counter()
+
+    def _limits(self, service: str, host: str, miss: bool) -> list[tuple[str, float, float]]:
+        """Get the (bucket key, rate, burst) triples a request draws from."""
+        if miss:
+            return [
+                (f"miss:service:{service}", settings.rate_limit_miss_service_rate,
+                 settings.rate_limit_miss_service_burst),
+                (f"miss:host:{host}", settings.rate_limit_miss_host_rate,
+                 settings.rate_limit_miss_host_burst),
+            ]
+        return [
+            (f"service:{service}", settings.rate_limit_service_rate,
+             settings.rate_limit_service_burst),
+            (f"host:{host}", settings.rate_limit_host_rate, settings.rate_limit_host_burst),
+        ]
+
+    def _take_local(self, limits: list[tuple[str, float, float]], now: float) -> float:
+        """Take a token from each local bucket if all have one."""
+        buckets = []
+        for key, rate, burst in limits:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, burst, now)
+            else:
+                bucket.rate, bucket.burst = rate, burst
+                self._buckets.move_to_end(key)
+            bucket.refill(now)
+            buckets.append(bucket)
+
+        while len(self._buckets) > settings.rate_limit_max_buckets:
+            self._buckets.popitem(last=False)
+
+        wait = max(bucket.wait_time() for bucket in buckets)
+        if wait == 0:
+            for bucket in buckets:
+                bucket.tokens -= 1
+        return wait
+
+    async def _take_shared(self, limits: list[tuple[str, float, float]]) -> float:
+        """Take a token from each Redis bucket if all have one."""
+        client = get_redis_client()
+        if not client:
+            return self._take_local(limits, time.monotonic())
+
+        args: list[Any] = [time.time()]
+        for _, rate, burst in limits:
+            args.extend([rate, burst])
+        try:
+            wait = await client.eval(
+                TOKEN_BUCKET_SCRIPT,
+                len(limits),
+                *[f"{BUCKET_KEY_PREFIX}{key}" for key, _, _ in limits],
+                *args,
+            )
+            return float(wait)
+        except Exception as e:
+            logger.warning(f"Shared rate limit error, using local buckets: {e}")
+            return self._take_local(limits, time.monotonic())
+
+    async def acquire(self, service: str, host: str, miss: bool = False) -> float:
+        """Take one request from a caller's budgets.
+
+        Returns zero when the request is allowed, otherwise the seconds until
+        it would be. ``miss`` selects the cache-miss budgets.
+        """
+        if not settings.rate_limit_enabled:
+            return 0.0
+
+        limits = self._limits(service, host, miss)
+        if settings.rate_limit_redis_shared:
+            wait = await self._take_shared(limits)
+        else:
+            wait = self._take_local(limits, time.monotonic())
+
+        if wait == 0:
+            self.allowed += 1
+            return 0.0
+
+        self.limited["miss" if miss else "request"] += 1
+        if service in self.limited_services or len(self.limited_services) < 1000:
+            self.limited_services[service] += 1
+        logger.debug("Resolve rate limited", service=service, host=host, miss=miss)
+        return wait
+
+    def stats(self, limit: int = 20) -> dict[str, Any]:
+        """Get rate limiting counters and the most limited callers."""
+        return {
+            "enabled": settings.rate_limit_enabled,
+            "shared": settings.rate_limit_redis_shared,
+            "allowed": self.allowed,
+            "limited": self.limited["request"],
+            "limited_misses": self.limited["miss"],
+            "local_buckets": len(self._buckets),
+            "top_limited_services": [
+                {"service": service, "count": count}
+                for service, count in self.limited_services.most_common(limit)
+            ],
+        }
+
+
+# Global rate limiter instance
+rate_limiter = RateLimiter()
@@ -0,0 +1,228 @@
+"""Redirect index for renamed slug mappings."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Row, delete, func, lambda_stmt, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging import get_logger
+from app.models.slug_history import SlugHistory
+from app.models.slug_map import SlugMap, SlugStatus
+from app.models.slug_redirect import SlugRedirect
+
+logger = get_logger(__name__)
+
+# Columns needed to answer /resolve for a renamed key
+REDIRECT_QUERY = select(SlugRedirect.slug_map_id, SlugRedirect.target_url)
+
+
+class RedirectService:
+    """Service for the old host/path to canonical URL redirect index.
+
+    Writes run inside the caller's transaction and return the keys whose
+    cached resolve results must be invalidated after commit.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def lookup(self, host: str, path: str) -> Optional[Row]:
+        """Get the redirect row for an old host/path, if any."""
+        stmt = lambda_stmt(lambda: REDIRECT_QUERY)
+        stmt += lambda s: s.where(SlugRedirect.host == host, SlugRedirect.path == path)
+        result = await self.db.execute(stmt)
+        return result.first()
+
+    async def record_rename(
+        self,
+        slug_map: SlugMap,
+        old_host: str,
+        old_path: str
+    ) -> list[tuple[str, str]]:
+        """Redirect a slug's previous key to its current canonical URL.
+
+        Earlier keys of the same slug are repointed in the same statement
+        batch, so chains collapse on write and every lookup is one hop.
+        """
+        stmt = insert(SlugRedirect).values(
+            host=old_host,
+            path=old_path,
+            slug_map_id=slug_map.id,
+            target_url=slug_map.canonical_url,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SlugRedirect.host, SlugRedirect.path],
+            set_={
+                "slug_map_id": stmt.excluded.slug_map_id,
+                "target_url": stmt.excluded.target_url,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+
+        return await self.retarget(slug_map)
+
+    async def retarget(self, slug_map: SlugMap) -> list[tuple[str, str]]:
+        """Point all of a slug's redirects at its current canonical URL."""
+        result = await self.db.execute(
+            update(SlugRedirect)
+            .where(SlugRedirect.slug_map_id == slug_map.id)
+            .values(target_url=slug_map.canonical_url, updated_at=func.now())
+            .returning(SlugRedirect.host, SlugRedirect.path)
+        )
+        return [(host, path) for host, path in result]
+
+    async def claim(self, host: str, path: str) -> bool:
+        """Drop the redirect on a key that now has an active mapping."""
+        result = await self.db.execute(
+            delete(SlugRedirect)
+            .where(SlugRedirect.host == host, SlugRedirect.path == path)
+            .returning(SlugRedirect.slug_map_id)
+        )
+        return result.first() is not None
+
+    async def remove_for_slug(self, slug_id: str) -> list[tuple[str, str]]:
+        """Drop all redirects of a slug."""
+        result = await self.db.execute(
+            delete(SlugRedirect)
+            .where(SlugRedirect.slug_map_id == slug_id)
+            .returning(SlugRedirect.host, SlugRedirect.path)
+        )
+        return [(host, path) for host, path in result]
+
+    async def record_renames(self, renames: list[dict]) -> None:
+        """Upsert many redirects in one batch.
+
+        Each item has ``host``, ``path``, ``slug_map_id`` and ``target_url``.
+        Call ``retarget_tenant`` afterwards to collapse older keys.
+        """
+        if not renames:
+            return
+
+        stmt = insert(SlugRedirect)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SlugRedirect.host, SlugRedirect.path],
+            set_={
+                "slug_map_id": stmt.excluded.slug_map_id,
+                "target_url": stmt.excluded.target_url,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt, renames)
+
+    async def retarget_tenant(self, tenant_id: str) -> list[tuple[str, str]]:
+        """Point every redirect of a tenant's slugs at their canonical URLs."""
+        result = await self.db.execute(
+            update(SlugRedirect)
+            .where(
+                SlugRedirect.slug_map_id == SlugMap.id,
+                SlugMap.tenant_id == tenant_id,
+                SlugRedirect.target_url != SlugMap.canonical_url,
+            )
+            .values(target_url=SlugMap.canonical_url, updated_at=func.now())
+            .returning(SlugRedirect.host, SlugRedirect.path)
+            .execution_options(synchronize_session=False)
+        )
+        return [(host, path) for host, path in result]
+
+    async def claim_tenant_keys(self, tenant_id: str) -> list[tuple[str, str]]:
+        """Drop redirects on keys now held by a tenant's active mappings."""
+        result = await self.db.execute(
+            delete(SlugRedirect)
+            .where(
+                SlugRedirect.host == SlugMap.host,
+                SlugRedirect.path == SlugMap.path,
+                SlugMap.tenant_id == tenant_id,
+                SlugMap.status == SlugStatus.ACTIVE,
+            )
+            .returning(SlugRedirect.host, SlugRedirect.path)
+            .execution_options(synchronize_session=False)
+        )
+        return [(host, path) for host, path in result]
+
+    async def remove_for_tenant(self, tenant_id: str) -> list[tuple[str, str]]:
+        """Drop all redirects of a tenant's slugs."""
+        tenant_slugs = select(SlugMap.id).where(SlugMap.tenant_id == tenant_id)
+        result = await self.db.execute(
+            delete(SlugRedirect)
+            .where(SlugRedirect.slug_map_id.in_(tenant_slugs))
+            .returning(SlugRedirect.host, SlugRedirect.path)
+            .execution_options(synchronize_session=False)
+        )
+        return [(host, path) for host, path in result]
+
+    async def backfill_from_history(self) -> int:
+        """Derive redirects for active slugs from their history.
+
+        Every key a slug held while active that differs from its current key
+        becomes a redirect, unless an active mapping owns that key now.
+        Existing redirects are kept. Returns the number of redirects added.
+        """
+        result = await self.db.execute(
+            select(
+                SlugMap.id,
+                SlugMap.host,
+                SlugMap.path,
+                SlugMap.canonical_url,
+                SlugHistory.old_values_json,
+                SlugHistory.changed_at,
+            )
+            .join(SlugHistory, SlugHistory.slug_map_id == SlugMap.id)
+            .where(SlugMap.status == SlugStatus.ACTIVE)
+            .order_by(SlugMap.id, SlugHistory.changed_at.desc())
+        )
+
+        # Walk each slug's history newest first, undoing one change at a time.
+        # Works for full snapshots and for field-level diffs alike.
+        candidates: dict[tuple[str, str], dict] = {}
+        changed: dict[tuple[str, str], datetime] = {}
+        state: dict = {}
+        current_id = None
+        for slug_id, host, path, canonical_url, old_values, changed_at in result:
+            if slug_id != current_id:
+                current_id = slug_id
+                state = {"host": host, "path": path, "status": SlugStatus.ACTIVE.value}
+            state.update(old_values or {})
+
+            key = (state["host"], state["path"])
+            if state["status"] != SlugStatus.ACTIVE.value or key == (host, path):
+                continue
+            # The latest rename wins when a key was held by several slugs
+            if key in changed and changed[key] >= changed_at:
+                continue
+            changed[key] = changed_at
+            candidates[key] = {
+                "host": key[0],
+                "path": key[1],
+                "slug_map_id": slug_id,
+                "target_url": canonical_url,
+            }
+
+        if not candidates:
+            return 0
+
+        owned = await self.db.execute(
+            select(SlugMap.host, SlugMap.path).where(
+                SlugMap.status == SlugStatus.ACTIVE,
+                tuple_(SlugMap.host, SlugMap.path).in_(list(candidates)),
+            )
+        )
+        for key in owned:
+            candidates.pop(tuple(key), None)
+
+        if not candidates:
+            return 0
+
+        stmt = (
+            insert(SlugRedirect)
+            .values(list(candidates.values()))
+            .on_conflict_do_nothing(index_elements=[SlugRedirect.host, SlugRedirect.path])
+            .returning(SlugRedirect.host)
+        )
+        added = len((await self.db.execute(stmt)).all())
+        await self.db.commit()
+
+        logger.info("Redirects backfilled from history", added=added)
+        return added
@@ -0,0 +1,344 @@
+"""Bloom filter over known slug keys for answering guaranteed misses."""
+
+import asyncio
+import contextlib
+import hashlib
+import math
+import time
+from typing import Any, Optional
+
+from sqlalchemy import func, select
+
+from app.cache import get_redis_client
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.logging import get_logger
+from app.models.slug_map import SlugMap, SlugStatus
+from app.models.slug_redirect import SlugRedirect
+
+logger = get_logger(__name__)
+
+# Redis keys for the shared filter
+FILTER_BITS_KEY = "router:slug_filter:bits"
+FILTER_PENDING_KEY = "router:slug_filter:pending"
+FILTER_LOCK_KEY = "router:slug_filter:lock"
+
+# Active keys resolve, deleted keys answer 410 Gone; drafts never match.
+# Renamed keys are tracked too because they redirect.
+TRACKED_STATUSES = (SlugStatus.ACTIVE, SlugStatus.DELETED)
+
+
+def get_filter_key(host: str, path: str) -> str:
+    """Generate filter key for a host/path pair."""
+    return f"{host}|{path}"
+
+
+def get_bit_positions(key: str, num_bits: int, num_hashes: int) -> list[int]:
+    """Get bit positions for a key using double hashing over one digest."""
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter.
+
+    Bits are stored most-significant-first within each byte, the same layout
+    Redis uses for SETBIT/GETBIT, so the raw bytes can be shared as a bitmap.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray((num_bits + 7) // 8)
+        self.count = 0
+
+    @classmethod
+    def for_capacity(cls, capacity: int, false_positive_rate: float) -> "BloomFilter":
+        """Create a filter sized for a key count and target false-positive rate."""
+        capacity = max(1, capacity)
+        num_bits = max(
+            8, math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        )
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def positions(self, key: str) -> list[int]:
+        """Get bit positions for a key."""
+        return get_bit_positions(key, self.num_bits, self.num_hashes)
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter."""
+        for pos in self.positions(key):
+            self.bits[pos >> 3] |= 0x80 >> (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[pos >> 3] & (0x80 >> (pos & 7)) for pos in self.positions(key)
+        )
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return len(self.bits)
+
+    def fill_ratio(self) -> float:
+        """Fraction of bits set."""
+        return int.from_bytes(self.bits, "big").bit_count() / self.num_bits
+
+    def estimated_false_positive_rate(self) -> float:
+        """Estimate the current false-positive rate from the fill ratio."""
+        return self.fill_ratio() ** self.num_hashes
+
+
+class SlugKeyFilter:
+    """Process-wide filter of known ``host|path`` keys.
+
+    The filter is rebuilt from Postgres periodically and updated incrementally
+    on writes. A negative answer means the key is neither active nor deleted,
+    so callers can skip the database entirely. Until the first rebuild
+    completes every key is reported as possibly present.
+
+    The local filter only sees this replica's writes and its last rebuild, so
+    a local negative is only trusted once the shared Redis bitmap, which every
+    replica writes to, confirms it. With ``slug_filter_redis_shared`` disabled
+    or Redis unavailable, negatives fall through to the database.
+    """
+
+    def __init__(self) -> None:
+        self._filter: Optional[BloomFilter] = None
+        self._pending: Optional[set[str]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_rebuild_at: Optional[float] = None
+        self.last_rebuild_seconds: Optional[float] = None
+        self.checks = 0
+        self.definite_misses = 0
+        self.passthrough_misses = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the filter has been built and can answer negatives."""
+        return self._filter is not None
+
+    def _new_filter(self, count: int) -> BloomFilter:
+        """Create an empty filter sized for the current key count."""
+        capacity = settings.slug_filter_capacity
+        if not settings.slug_filter_redis_shared:
+            # Local-only filters can grow; shared ones must keep the same shape
+            # on every replica.
+            capacity = max(capacity, count * 2)
+        elif count > capacity:
+            logger.warning(
+                "Slug filter capacity exceeded",
+                count=count,
+                capacity=capacity,
+            )
+        return BloomFilter.for_capacity(capacity, settings.slug_filter_false_positive_rate)
+
+    async def might_contain(self, host: str, path: str) -> bool:
+        """Check whether a key may exist; False means it definitely does not."""
+        if not settings.slug_filter_enabled or self._filter is None:
+            return True
+
+        self.checks += 1
+        key = get_filter_key(host, path)
+        if key in self._filter:
+            return True
+
+        # Keys created on another replica are only in the shared bitmap
+        if not settings.slug_filter_redis_shared or await self._shared_contains(key):
+            return True
+
+        self.definite_misses += 1
+        return False
+
+    def record_passthrough_miss(self) -> None:
+        """Record a key the filter let through that turned out not to exist."""
+        self.passthrough_misses += 1
+
+    async def add(self, host: str, path: str, status: Optional[SlugStatus] = None) -> None:
+        """Track a key after a write; untracked statuses are ignored.
+
+        Keys without a status, such as redirects, are always tracked.
+        """
+        if not settings.slug_filter_enabled:
+            return
+        if status is not None and status not in TRACKED_STATUSES:
+            return
+
+        await self.add_many([(host, path)])
+
+    async def add_many(self, keys: list[tuple[str, str]]) -> None:
+        """Track many keys after a bulk write, in one Redis round trip."""
+        if not settings.slug_filter_enabled or not keys:
+            return
+
+        filter_keys = [get_filter_key(host, path) for host, path in keys]
+        for key in filter_keys:
+            if self._filter is not None:
+                self._filter.add(key)
+            if self._pending is not None:
+                self._pending.add(key)
+        if settings.slug_filter_redis_shared:
+            await self._shared_add(filter_keys)
+
+    async def rebuild(self) -> None:
+        """Rebuild the filter from all tracked keys in the database."""
+        started = time.perf_counter()
+        self._pending = set()
+        try:
+            conditions = SlugMap.status.in_(TRACKED_STATUSES)
+            async with AsyncSessionLocal() as db:
+                count = await db.scalar(
+                    select(func.count()).select_from(SlugMap).where(conditions)
+                )
+                count += await db.scalar(select(func.count()).select_from(SlugRedirect))
+                bloom = self._new_filter(count or 0)
+
+                result = await db.stream(
+                    select(SlugMap.host, SlugMap.path)
+                    .where(conditions)
+                    .union_all(select(SlugRedirect.host, SlugRedirect.path))
+                    .execution_options(yield_per=5000)
+                )
+                async for host, path in result:
+                    bloom.add(get_filter_key(host, path))
+
+            # Keys written while the scan was running
+            for key in self._pending:
+                bloom.add(key)
+            self._filter = bloom
+        finally:
+            self._pending = None
+
+        if settings.slug_filter_redis_shared:
+            await self._publish_shared(bloom)
+
+        self.last_rebuild_at = time.time()
+        self.last_rebuild_seconds = time.perf_counter() - started
+        logger.info(
+            "Slug filter rebuilt",
+            count=bloom.count,
+            memory_bytes=bloom.memory_bytes,
+            duration_seconds=round(self.last_rebuild_seconds, 3),
+        )
+
+    async def _shared_contains(self, key: str) -> bool:
+        """Check a key against the shared Redis bitmap."""
+        client = get_redis_client()
+        if not client or self._filter is None:
+            # Without the shared bitmap a local negative cannot be confirmed
+            return True
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for pos in self._filter.positions(key):
+                pipe.getbit(FILTER_BITS_KEY, pos)
+            return all(await pipe.execute())
+        except Exception as e:
+            # Fail open so the caller falls through to the database
+            logger.warning(f"Slug filter shared lookup error: {e}")
+            return True
+
+    async def _shared_add(self, keys: list[str]) -> None:
+        """Add keys to the shared Redis bitmap."""
+        client = get_redis_client()
+        if not client or self._filter is None:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key in keys:
+                for pos in self._filter.positions(key):
+                    pipe.setbit(FILTER_BITS_KEY, pos, 1)
+            # Remembered so a concurrent rebuild on another replica keeps them
+            pipe.sadd(FILTER_PENDING_KEY, *keys)
+            pipe.expire(FILTER_PENDING_KEY, settings.slug_filter_refresh_interval * 2)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Slug filter shared add error: {e}")
+
+    async def _publish_shared(self, bloom: BloomFilter) -> None:
+        """Replace the shared Redis bitmap; only one replica per interval does this."""
+        client = get_redis_client()
+        if not client:
+            return
+
+        try:
+            acquired = await client.set(
+                FILTER_LOCK_KEY,
+                "1",
+                nx=True,
+                ex=settings.slug_filter_refresh_interval,
+            )
+            if not acquired:
+                return
+
+            for key in await client.smembers(FILTER_PENDING_KEY):
+                bloom.add(key)
+            await client.set(FILTER_BITS_KEY, bytes(bloom.bits))
+
+            # Re-apply keys written by other replicas during the upload
+            pipe = client.pipeline(transaction=False)
+            for key in await client.smembers(FILTER_PENDING_KEY):
+                for pos in bloom.positions(key):
+                    pipe.setbit(FILTER_BITS_KEY, pos, 1)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Slug filter shared publish error: {e}")
+
+    async def _refresh_loop(self) -> None:
+        """Rebuild the filter on a fixed interval."""
+        while True:
+            try:
+                await self.rebuild()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Slug filter rebuild failed: {e}")
+            await asyncio.sleep(settings.slug_filter_refresh_interval)
+
+    def start(self) -> None:
+        """Start the background refresh task."""
+        if settings.slug_filter_enabled and self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresh task."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        """Get filter size and accuracy statistics."""
+        bloom = self._filter
+        observed_total = self.definite_misses + self.passthrough_misses
+        return {
+            "enabled": settings.slug_filter_enabled,
+            "ready": self.ready,
+            "shared": settings.slug_filter_redis_shared,
+            "keys": bloom.count if bloom else 0,
+            "num_bits": bloom.num_bits if bloom else 0,
+            "num_hashes": bloom.num_hashes if bloom else 0,
+            "memory_bytes": bloom.memory_bytes if bloom else 0,
+            "fill_ratio": bloom.fill_ratio() if bloom else 0.0,
+            "estimated_false_positive_rate": (
+                bloom.estimated_false_positive_rate() if bloom else 0.0
+            ),
+            "observed_false_positive_rate": (
+                self.passthrough_misses / observed_total if observed_total else 0.0
+            ),
+            "checks": self.checks,
+            "definite_misses": self.definite_misses,
+            "passthrough_misses": self.passthrough_misses,
+            "last_rebuild_at": self.last_rebuild_at,
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+        }
+
+
+# Global slug key filter instance
+slug_filter = SlugKeyFilter()
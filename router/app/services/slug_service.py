@@ -1,22 +1,52 @@
 """Slug service with business logic for slug mapping operations."""
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import and_, select
+from sqlalchemy import Row, and_, func, insert, lambda_stmt, or_, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.cache import invalidate_resolve_cache
+from app.cache import invalidate_resolve_cache, invalidate_resolve_caches
+from app.config import settings
 from app.logging import get_logger
 from app.models.slug_map import SlugMap, SlugStatus
 from app.models.slug_history import SlugHistory
+from app.pagination import decode_cursor, encode_cursor
 from app.schemas.slug import SlugMapCreate, SlugMapUpdate
+from app.services.history_service import diff_values, history_writer, to_json_value
+from app.services.redirect_service import RedirectService
+from app.services.slug_filter import slug_filter
 from app.services.tenant_client import TenantClient
 
 logger = get_logger(__name__)
 
+# Fields recorded in history diffs
+HISTORY_FIELDS = (
+    "host",
+    "path",
+    "resource_type",
+    "resource_id",
+    "tenant_id",
+    "canonical_url",
+    "status",
+    "version",
+)
+
+# Columns needed to answer /resolve, selected as plain rows. Deleted mappings
+# are included so a 410 needs no second query.
+RESOLVE_QUERY = select(
+    SlugMap.id,
+    SlugMap.resource_type,
+    SlugMap.resource_id,
+    SlugMap.tenant_id,
+    SlugMap.version,
+    SlugMap.canonical_url,
+    SlugMap.status,
+).where(or_(SlugMap.status == SlugStatus.ACTIVE, SlugMap.status == SlugStatus.DELETED))
+
 
 class SlugService:
     """Service for slug mapping operations."""
@@ -24,6 +54,7 @@ class SlugService:
     def __init__(self, db: AsyncSession, tenant_client: Optional[TenantClient] = None):
         self.db = db
         self.tenant_client = tenant_client
+        self._pending_history: list[dict] = []
     
     def _generate_id(self) -> str:
         """Generate a unique slug ID."""
@@ -77,6 +108,36 @@ class SlugService:
         except Exception as e:
             logger.warning(f"Tenant validation failed: {e}")
     
+    def _snapshot(self, slug_map: SlugMap) -> dict:
+        """Get the tracked fields of a slug mapping."""
+        return {field: getattr(slug_map, field) for field in HISTORY_FIELDS}
+    
+    def _history_record(
+        self,
+        slug_map_id: str,
+        old_values: Optional[dict] = None,
+        new_values: Optional[dict] = None,
+        actor: Optional[str] = None
+    ) -> dict:
+        """Build a history row holding only the fields that changed."""
+        if old_values is not None and new_values is not None:
+            old_values, new_values = diff_values(old_values, new_values)
+        elif new_values is not None:
+            new_values = {
+                field: to_json_value(value)
+                for field, value in new_values.items()
+                if value is not None
+            }
+        
+        return {
+            "id": self._generate_history_id(),
+            "slug_map_id": slug_map_id,
+            "old_values_json": old_values,
+            "new_values_json": new_values,
+            "actor": actor,
+            "changed_at": datetime.now(timezone.utc),
+        }
+    
     async def _write_history(
         self, 
         slug_map: SlugMap, 
@@ -85,15 +146,57 @@ class SlugService:
         actor: Optional[str] = None
     ) -> None:
         """Write history record for slug mapping changes."""
-        history = SlugHistory(
-            id=self._generate_history_id(),
-            slug_map_id=slug_map.id,
-            old_values_json=old_values,
-            new_values_json=new_values,
-            actor=actor
+        await self._write_history_batch(
+            [self._history_record(slug_map.id, old_values, new_values, actor)]
         )
-        self.db.add(history)
-        await self.db.flush()
+    
+    async def _write_history_batch(self, records: list[dict]) -> None:
+        """Write history rows in the current transaction, or stage them for the buffered writer."""
+        if settings.history_async_writes:
+            # Handed to the writer after commit, so rolled back changes leave no history
+            self._pending_history.extend(records)
+        elif len(records) == 1:
+            self.db.add(SlugHistory(**records[0]))
+        else:
+            await self.db.execute(insert(SlugHistory), records)
+    
+    async def _commit(self) -> None:
+        """Commit and pass staged history rows to the buffered writer."""
+        await self.db.commit()
+        if self._pending_history:
+            records, self._pending_history = self._pending_history, []
+            await history_writer.enqueue(records)
+    
+    async def _update_redirects(
+        self,
+        slug_map: SlugMap,
+        old_values: dict,
+        update_dict: dict
+    ) -> list[tuple[str, str]]:
+        """Keep the redirect index in step with an update.
+        
+        Returns the redirect keys whose cached resolve results are stale.
+        """
+        redirects = RedirectService(self.db)
+        
+        if slug_map.status == SlugStatus.DELETED:
+            return await redirects.remove_for_slug(slug_map.id)
+        if slug_map.status != SlugStatus.ACTIVE:
+            return []
+        
+        old_key = (old_values["host"], old_values["path"])
+        new_key = (slug_map.host, slug_map.path)
+        
+        keys = []
+        if old_key != new_key and old_values["status"] == SlugStatus.ACTIVE:
+            keys = await redirects.record_rename(slug_map, *old_key)
+        elif "canonical_url" in update_dict:
+            keys = await redirects.retarget(slug_map)
+        
+        if await redirects.claim(*new_key):
+            keys.append(new_key)
+        
+        return keys
     
     async def create_slug(
         self, 
@@ -140,6 +243,11 @@ class SlugService:
         self.db.add(slug_map)
         await self.db.flush()
         
+        # A new active mapping takes over any redirect on its key
+        claimed = False
+        if slug_map.status == SlugStatus.ACTIVE:
+            claimed = await RedirectService(self.db).claim(slug_map.host, slug_map.path)
+        
         # Write history
         await self._write_history(
             slug_map,
@@ -147,7 +255,10 @@ class SlugService:
             actor=actor
         )
         
-        await self.db.commit()
+        await self._commit()
+        if claimed:
+            await invalidate_resolve_cache(slug_map.host, slug_map.path)
+        await slug_filter.add(slug_map.host, slug_map.path, slug_map.status)
         
         logger.info(
             "Slug mapping created",
@@ -174,16 +285,7 @@ class SlugService:
             return None
         
         # Store old values for history
-        old_values = {
-            "host": slug_map.host,
-            "path": slug_map.path,
-            "resource_type": slug_map.resource_type,
-            "resource_id": slug_map.resource_id,
-            "tenant_id": slug_map.tenant_id,
-            "canonical_url": slug_map.canonical_url,
-            "status": slug_map.status,
-            "version": slug_map.version
-        }
+        old_values = self._snapshot(slug_map)
         
         # Check for conflicts if host/path is being changed
         if (update_data.host and update_data.host != slug_map.host) or \
@@ -235,15 +337,21 @@ class SlugService:
                 slug_map.tenant_id
             )
         
+        redirect_keys = await self._update_redirects(slug_map, old_values, update_dict)
+        
         # Write history
         await self._write_history(
             slug_map,
             old_values=old_values,
-            new_values=slug_map.__dict__,
+            new_values=self._snapshot(slug_map),
             actor=actor
         )
         
-        await self.db.commit()
+        await self._commit()
+        await invalidate_resolve_caches(redirect_keys)
+        await slug_filter.add(slug_map.host, slug_map.path, slug_map.status)
+        for host, path in redirect_keys:
+            await slug_filter.add(host, path)
         
         logger.info(
             "Slug mapping updated",
@@ -269,16 +377,7 @@ class SlugService:
         
         if soft:
             # Soft delete
-            old_values = {
-                "host": slug_map.host,
-                "path": slug_map.path,
-                "resource_type": slug_map.resource_type,
-                "resource_id": slug_map.resource_id,
-                "tenant_id": slug_map.tenant_id,
-                "canonical_url": slug_map.canonical_url,
-                "status": slug_map.status,
-                "version": slug_map.version
-            }
+            old_values = self._snapshot(slug_map)
             
             slug_map.status = SlugStatus.DELETED
             slug_map.version += 1
@@ -288,14 +387,19 @@ class SlugService:
             await self._write_history(
                 slug_map,
                 old_values=old_values,
-                new_values=slug_map.__dict__,
+                new_values=self._snapshot(slug_map),
                 actor=actor
             )
             
+            # Old keys stop redirecting once the slug is gone
+            redirect_keys = await RedirectService(self.db).remove_for_slug(slug_map.id)
+            
             # Invalidate cache
             await invalidate_resolve_cache(slug_map.host, slug_map.path)
             
-            await self.db.commit()
+            await self._commit()
+            await invalidate_resolve_caches(redirect_keys)
+            await slug_filter.add(slug_map.host, slug_map.path, slug_map.status)
             
             logger.info(
                 "Slug mapping soft deleted",
@@ -305,9 +409,11 @@ class SlugService:
             return slug_map
         else:
             # Hard delete
+            redirect_keys = await RedirectService(self.db).remove_for_slug(slug_map.id)
             await invalidate_resolve_cache(slug_map.host, slug_map.path)
             await self.db.delete(slug_map)
             await self.db.commit()
+            await invalidate_resolve_caches(redirect_keys)
             
             logger.info(
                 "Slug mapping hard deleted",
@@ -316,23 +422,170 @@ class SlugService:
             
             return None
     
+    async def bulk_update_tenant(
+        self,
+        tenant_id: str,
+        host: Optional[str] = None,
+        status: Optional[SlugStatus] = None,
+        actor: Optional[str] = None
+    ) -> list[Row]:
+        """Move all of a tenant's slug mappings to a new host and/or status.
+        
+        Runs as one set-based UPDATE ... RETURNING with the previous values
+        joined in, writes history in one batch insert, and invalidates every
+        affected resolve key in one Redis pipeline. Deleted mappings are left
+        alone. Returns one row per changed mapping.
+        """
+        changes = []
+        values = {"version": SlugMap.version + 1, "updated_at": func.now()}
+        if host:
+            changes.append(SlugMap.host != host)
+            values["host"] = host
+            # SET expressions see the old row, so the old host is replaced
+            values["canonical_url"] = func.replace(
+                SlugMap.canonical_url,
+                func.concat("://", SlugMap.host),
+                f"://{host}",
+            )
+        if status:
+            changes.append(SlugMap.status != status)
+            values["status"] = status
+        if not changes:
+            return []
+        
+        old = (
+            select(
+                SlugMap.id,
+                SlugMap.host,
+                SlugMap.path,
+                SlugMap.status,
+                SlugMap.version,
+                SlugMap.canonical_url,
+            )
+            .where(
+                SlugMap.tenant_id == tenant_id,
+                SlugMap.status != SlugStatus.DELETED,
+                or_(*changes),
+            )
+            .with_for_update()
+            .subquery()
+        )
+        stmt = (
+            update(SlugMap)
+            .where(SlugMap.id == old.c.id)
+            .values(**values)
+            .returning(
+                SlugMap.id,
+                old.c.host.label("old_host"),
+                old.c.path.label("old_path"),
+                old.c.status.label("old_status"),
+                old.c.version.label("old_version"),
+                old.c.canonical_url.label("old_canonical_url"),
+                SlugMap.host,
+                SlugMap.path,
+                SlugMap.status,
+                SlugMap.version,
+                SlugMap.canonical_url,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        
+        try:
+            rows = (await self.db.execute(stmt)).all()
+        except IntegrityError as e:
+            await self.db.rollback()
+            logger.warning("Slug conflict detected during bulk update", tenant_id=tenant_id)
+            raise ValueError(f"SLUG_CONFLICT: {e.orig}")
+        
+        if not rows:
+            return []
+        
+        # Write history in one batch
+        await self._write_history_batch([
+            self._history_record(
+                row.id,
+                old_values={
+                    "host": row.old_host,
+                    "canonical_url": row.old_canonical_url,
+                    "status": row.old_status,
+                    "version": row.old_version,
+                },
+                new_values={
+                    "host": row.host,
+                    "canonical_url": row.canonical_url,
+                    "status": row.status,
+                    "version": row.version,
+                },
+                actor=actor,
+            )
+            for row in rows
+        ])
+        
+        # Keep the redirect index in step
+        redirects = RedirectService(self.db)
+        if status == SlugStatus.DELETED:
+            redirect_keys = await redirects.remove_for_tenant(tenant_id)
+        else:
+            redirect_keys = []
+            if host:
+                await redirects.record_renames([
+                    {
+                        "host": row.old_host,
+                        "path": row.old_path,
+                        "slug_map_id": row.id,
+                        "target_url": row.canonical_url,
+                    }
+                    for row in rows
+                    if row.old_status == SlugStatus.ACTIVE
+                    and row.status == SlugStatus.ACTIVE
+                    and row.old_host != row.host
+                ])
+                redirect_keys = await redirects.retarget_tenant(tenant_id)
+            redirect_keys += await redirects.claim_tenant_keys(tenant_id)
+        
+        await self._commit()
+        
+        new_keys = [(row.host, row.path) for row in rows]
+        await invalidate_resolve_caches(
+            list({*((row.old_host, row.old_path) for row in rows), *new_keys, *redirect_keys})
+        )
+        # Old keys were tracked before, so only new keys need adding
+        await slug_filter.add_many(
+            [(row.host, row.path) for row in rows if row.status != SlugStatus.DRAFT]
+        )
+        
+        logger.info(
+            "Tenant slug mappings bulk updated",
+            tenant_id=tenant_id,
+            host=host,
+            status=status.value if status else None,
+            affected=len(rows),
+        )
+        
+        return rows
+    
     async def get_slug(self, slug_id: str) -> Optional[SlugMap]:
         """Get a slug mapping by ID."""
         query = select(SlugMap).where(SlugMap.id == slug_id)
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
-    async def resolve_slug(self, host: str, path: str) -> Optional[SlugMap]:
-        """Resolve a slug mapping by host and path."""
-        query = select(SlugMap).where(
-            and_(
-                SlugMap.host == host,
-                SlugMap.path == path,
-                SlugMap.status == SlugStatus.ACTIVE
-            )
-        )
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
+    async def resolve_slug(self, host: str, path: str) -> Optional[Row]:
+        """Resolve a slug mapping by host and path.
+        
+        Returns a plain row for the active mapping, or for the deleted mapping
+        when no active one exists. The lambda statement is compiled once and
+        reused from SQLAlchemy's cache, and no ORM instances are built.
+        """
+        stmt = lambda_stmt(lambda: RESOLVE_QUERY)
+        stmt += lambda s: s.where(SlugMap.host == host, SlugMap.path == path)
+        result = await self.db.execute(stmt)
+        rows = result.all()
+        
+        for row in rows:
+            if row.status == SlugStatus.ACTIVE:
+                return row
+        return rows[0] if rows else None
     
     async def list_slugs(
         self,
@@ -340,12 +593,22 @@ class SlugService:
         tenant_id: Optional[str] = None,
         status: Optional[SlugStatus] = None,
         page: int = 1,
-        page_size: int = 20
-    ) -> tuple[list[SlugMap], int]:
-        """List slug mappings with pagination."""
+        page_size: int = 20,
+        q: Optional[str] = None,
+        cursor: Optional[str] = None
+    ) -> tuple[list[SlugMap], Optional[int], Optional[str]]:
+        """List slug mappings, newest first.
+        
+        ``q`` starting with ``/`` matches path prefixes (served by the
+        text_pattern_ops index); any other ``q`` matches substrings of path or
+        canonical URL (served by the pg_trgm indexes). With a ``cursor`` or
+        ``q`` the list is keyset-paginated and no total is counted; otherwise
+        ``page`` is honoured and the total is returned. Returns the items,
+        the total (or None) and the cursor for the next page, if any. Raises
+        ValueError for a malformed cursor.
+        """
         # Build query
         query = select(SlugMap)
-        count_query = select(SlugMap.id)
         
         conditions = []
         if host:
@@ -354,22 +617,58 @@ class SlugService:
             conditions.append(SlugMap.tenant_id == tenant_id)
         if status:
             conditions.append(SlugMap.status == status)
+        if q:
+            if q.startswith("/"):
+                # The range keeps the text_pattern_ops index usable when the
+                # statement is prepared with q as a parameter.
+                upper = q[:-1] + chr(ord(q[-1]) + 1)
+                conditions.append(
+                    and_(
+                        SlugMap.path.op("~>=~")(q),
+                        SlugMap.path.op("~<~")(upper),
+                        SlugMap.path.startswith(q, autoescape=True),
+                    )
+                )
+            else:
+                conditions.append(
+                    or_(
+                        SlugMap.path.icontains(q, autoescape=True),
+                        SlugMap.canonical_url.icontains(q, autoescape=True),
+                    )
+                )
         
         if conditions:
             query = query.where(and_(*conditions))
-            count_query = count_query.where(and_(*conditions))
         
-        # Get total count
-        count_result = await self.db.execute(count_query)
-        total = len(count_result.scalars().all())
-        
-        # Apply pagination
-        offset = (page - 1) * page_size
-        query = query.offset(offset).limit(page_size)
-        query = query.order_by(SlugMap.created_at.desc())
+        total = None
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != 2:
+                raise ValueError("Invalid cursor")
+            created_at = datetime.fromisoformat(values[0])
+            query = query.where(
+                tuple_(SlugMap.created_at, SlugMap.id) < tuple_(created_at, values[1])
+            )
+        else:
+            if not q:
+                # Get total count
+                count_query = select(func.count()).select_from(SlugMap)
+                if conditions:
+                    count_query = count_query.where(and_(*conditions))
+                total = await self.db.scalar(count_query)
+                
+                # Apply pagination
+                query = query.offset((page - 1) * page_size)
+        
+        query = query.order_by(SlugMap.created_at.desc(), SlugMap.id.desc()).limit(page_size + 1)
         
         # Execute query
         result = await self.db.execute(query)
-        items = result.scalars().all()
+        items = list(result.scalars().all())
+        
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
         
-        return list(items), total
+        return items, total, next_cursor
@@ -5,6 +5,7 @@ from typing import Optional
 
 from app.config import settings
 from app.logging import get_logger
+from app.tracing import inject_traceparent, span
 
 logger = get_logger(__name__)
 
@@ -19,9 +20,13 @@ class TenantClient:
     async def tenant_exists(self, tenant_id: str) -> bool:
         """Check if a tenant exists."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/tenants/{tenant_id}")
-                return response.status_code == 200
+            with span("tenant.tenant_exists", tenant_id=tenant_id):
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.get(
+                        f"{self.base_url}/tenants/{tenant_id}",
+                        headers=inject_traceparent(),
+                    )
+                    return response.status_code == 200
         except Exception as e:
             logger.warning(f"Tenant existence check failed for {tenant_id}: {e}")
             return False
@@ -29,9 +34,13 @@ class TenantClient:
     async def location_exists(self, location_id: str) -> bool:
         """Check if a location exists."""
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/locations/{location_id}")
-                return response.status_code == 200
+            with span("tenant.location_exists", location_id=location_id):
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.get(
+                        f"{self.base_url}/locations/{location_id}",
+                        headers=inject_traceparent(),
+                    )
+                    return response.status_code == 200
         except Exception as e:
             logger.warning(f"Location existence check failed for {location_id}: {e}")
             return False
@@ -0,0 +1,110 @@
+"""Startup phase timing and connection pool pre-warming."""
+
+import asyncio
+import contextlib
+import os
+import time
+from typing import Any, Iterator, Optional
+
+from app.cache import get_redis_client
+from app.config import settings
+from app.db import AsyncSessionLocal, get_read_sessionmaker
+from app.logging import get_logger
+from app.services.redirect_service import RedirectService
+from app.services.slug_service import SlugService
+
+logger = get_logger(__name__)
+
+# Key that never matches; used to prepare the resolve statements
+WARM_HOST = "warmup.invalid"
+WARM_PATH = "/"
+
+
+def process_uptime() -> Optional[float]:
+    """Get the seconds since this process started, from /proc (Linux only)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Fields after the parenthesised command name; starttime is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupTimer:
+    """Records how long each startup phase takes.
+
+    ``boot`` is the time from process start to the first phase: interpreter
+    start-up, the server and all module imports. It is only known on Linux.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.boot_seconds: Optional[float] = None
+        self.completed_at: Optional[float] = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time one startup phase."""
+        if self.boot_seconds is None and not self.phases:
+            self.boot_seconds = process_uptime()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def complete(self) -> None:
+        """Mark startup finished and log the breakdown."""
+        self.completed_at = time.time()
+        logger.info("Startup complete", **self.report())
+
+    def report(self) -> dict[str, Any]:
+        """Get the startup phase breakdown in seconds."""
+        return {
+            "boot_seconds": round(self.boot_seconds, 3) if self.boot_seconds is not None else None,
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "startup_seconds": round(sum(self.phases.values()), 4),
+            "completed_at": self.completed_at,
+        }
+
+
+# Global startup timer instance
+startup_timer = StartupTimer()
+
+
+async def _warm_session(session_factory) -> None:
+    """Open one pooled connection and prepare the resolve statements on it."""
+    async with session_factory() as db:
+        await SlugService(db).resolve_slug(WARM_HOST, WARM_PATH)
+        await RedirectService(db).lookup(WARM_HOST, WARM_PATH)
+
+
+async def warm_pools(connections: Optional[int] = None) -> None:
+    """Fill the database and Redis pools before traffic arrives.
+
+    Each database connection runs the resolve and redirect lookups once,
+    which compiles the cached statements and has asyncpg prepare them on
+    that connection, so the first real cache miss pays neither cost.
+    """
+    connections = settings.startup_warm_connections if connections is None else connections
+    if connections <= 0:
+        return
+
+    factories = {AsyncSessionLocal, get_read_sessionmaker()}
+    results = await asyncio.gather(
+        *[_warm_session(factory) for factory in factories for _ in range(connections)],
+        return_exceptions=True,
+    )
+    errors = [r for r in results if isinstance(r, Exception)]
+    if errors:
+        logger.warning(f"Database pool warm-up failed: {errors[0]}")
+
+    client = get_redis_client()
+    if client:
+        try:
+            await asyncio.gather(*[client.ping() for _ in range(connections)])
+        except Exception as e:
+            logger.warning(f"Redis pool warm-up failed: {e}")
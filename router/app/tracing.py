@@ -0,0 +1,318 @@
+"""Lightweight request tracing with W3C trace context propagation."""
+
+import asyncio
+import contextlib
+import os
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+import httpx
+
+from app.config import settings
+from app.logging import get_logger
+
+logger = get_logger(__name__)
+
+# version-traceid-parentid-flags, see https://www.w3.org/TR/trace-context/
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+OTLP_SCOPE = "app.tracing"
+
+
+class Trace:
+    """Spans recorded for one request."""
+
+    __slots__ = ("trace_id", "parent_id", "sampled", "spans")
+
+    def __init__(self, trace_id: str, parent_id: Optional[str], sampled: bool):
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.spans: list[Span] = []
+
+    @property
+    def root(self) -> "Span":
+        return self.spans[0]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the trace with its spans in start order."""
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "duration_ms": self.root.duration_ms,
+            "spans": [span.to_dict() for span in sorted(self.spans, key=lambda s: s.start)],
+        }
+
+
+class Span:
+    """One timed operation within a trace."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start", "end", "error")
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: dict[str, Any]):
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        trace.spans.append(self)
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return round((self.end - self.start) * 1000, 3)
+
+    @property
+    def traceparent(self) -> str:
+        """Get the W3C traceparent header naming this span as the parent."""
+        flags = "01" if self.trace.sampled else "00"
+        return f"00-{self.trace.trace_id}-{self.span_id}-{flags}"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple[str, str, bool]]:
+    """Parse a traceparent header into (trace ID, parent span ID, sampled)."""
+    if not header:
+        return None
+    match = TRACEPARENT_RE.match(header.strip().lower())
+    if not match:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def current_span() -> Optional[Span]:
+    """Get the span active in this context, if any."""
+    return _current_span.get()
+
+
+def inject_traceparent(headers: Optional[dict[str, str]] = None) -> dict[str, str]:
+    """Add the current span's traceparent to outbound request headers."""
+    headers = dict(headers or {})
+    active = _current_span.get()
+    if active is not None:
+        headers["traceparent"] = active.traceparent
+    return headers
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span.
+
+    Outside a traced request this does nothing and yields None.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = type(e).__name__
+        raise
+    finally:
+        child.end = time.time()
+        _current_span.reset(token)
+
+
+def start_span(name: str, **attributes: Any) -> Optional[Span]:
+    """Start a child of the current span without making it current.
+
+    For code that cannot wrap the operation in a block, such as SQLAlchemy
+    event hooks. The caller must pass the span to ``end_span``.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def end_span(child: Optional[Span], error: Optional[str] = None) -> None:
+    """Finish a span started with ``start_span``."""
+    if child is not None:
+        child.end = time.time()
+        child.error = error
+
+
+class Tracer:
+    """Records finished traces in a ring buffer and exports them over OTLP.
+
+    Every traced request is kept in a fixed-size buffer of recent traces,
+    which the admin API reads. With ``trace_otlp_endpoint`` set, sampled
+    traces are also queued and posted as OTLP/HTTP JSON to a collector on an
+    interval; the export queue is bounded and drops traces when full rather
+    than holding up requests.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self.recent: deque[Trace] = deque(maxlen=settings.trace_buffer_size)
+        self._pending: deque[Trace] = deque(maxlen=settings.trace_buffer_size)
+        self._transport = transport
+        self._task: Optional[asyncio.Task] = None
+        self.traces = 0
+        self.exported = 0
+        self.export_dropped = 0
+        self.export_errors = 0
+
+    @contextlib.contextmanager
+    def trace(self, name: str, traceparent: Optional[str] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Trace a request, continuing the caller's trace when given one."""
+        if not settings.tracing_enabled:
+            yield None
+            return
+
+        parent = parse_traceparent(traceparent)
+        if parent:
+            trace = Trace(parent[0], parent[1], parent[2])
+        else:
+            trace = Trace(os.urandom(16).hex(), None, True)
+
+        root = Span(trace, name, trace.parent_id, attributes)
+        token = _current_span.set(root)
+        try:
+            yield root
+        except BaseException as e:
+            root.error = type(e).__name__
+            raise
+        finally:
+            root.end = time.time()
+            _current_span.reset(token)
+            self.record(trace)
+
+    def record(self, trace: Trace) -> None:
+        """Keep a finished trace and queue it for export."""
+        self.traces += 1
+        self.recent.append(trace)
+        if settings.trace_otlp_endpoint and trace.sampled:
+            if len(self._pending) == self._pending.maxlen:
+                self.export_dropped += 1
+            self._pending.append(trace)
+
+    def slowest(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Get the slowest recent traces, slowest first."""
+        traces = sorted(self.recent, key=lambda t: t.root.end - t.root.start, reverse=True)
+        return [trace.to_dict() for trace in traces[:limit]]
+
+    async def export(self) -> None:
+        """Post queued traces to the OTLP collector."""
+        if not settings.trace_otlp_endpoint or not self._pending:
+            return
+
+        traces = list(self._pending)
+        self._pending.clear()
+        try:
+            async with httpx.AsyncClient(transport=self._transport, timeout=5.0) as client:
+                response = await client.post(settings.trace_otlp_endpoint, json=to_otlp(traces))
+                response.raise_for_status()
+            self.exported += len(traces)
+        except Exception as e:
+            self.export_errors += 1
+            logger.warning(f"Trace export failed: {e}")
+
+    async def _export_loop(self) -> None:
+        """Export queued traces on a fixed interval."""
+        while True:
+            await asyncio.sleep(settings.trace_export_interval)
+            await self.export()
+
+    def start(self) -> None:
+        """Start the background export task."""
+        if settings.tracing_enabled and settings.trace_otlp_endpoint and self._task is None:
+            self._task = asyncio.create_task(self._export_loop())
+
+    async def stop(self) -> None:
+        """Stop the background export task and export what is left."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.export()
+
+    def stats(self) -> dict[str, Any]:
+        """Get tracer counters."""
+        return {
+            "enabled": settings.tracing_enabled,
+            "traces": self.traces,
+            "buffered": len(self.recent),
+            "otlp_endpoint": settings.trace_otlp_endpoint,
+            "export_pending": len(self._pending),
+            "exported": self.exported,
+            "export_dropped": self.export_dropped,
+            "export_errors": self.export_errors,
+        }
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(traces: list[Trace]) -> dict[str, Any]:
+    """Encode traces as an OTLP/HTTP JSON ExportTraceServiceRequest."""
+    spans = []
+    for trace in traces:
+        for item in trace.spans:
+            end = item.end if item.end is not None else item.start
+            encoded = {
+                "traceId": trace.trace_id,
+                "spanId": item.span_id,
+                "name": item.name,
+                # SERVER for the request span, INTERNAL for its children
+                "kind": 2 if item is trace.root else 1,
+                "startTimeUnixNano": str(int(item.start * 1e9)),
+                "endTimeUnixNano": str(int(end * 1e9)),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in item.attributes.items()
+                ],
+                # STATUS_CODE_ERROR or STATUS_CODE_UNSET
+                "status": {"code": 2, "message": item.error} if item.error else {"code": 0},
+            }
+            if item.parent_id:
+                encoded["parentSpanId"] = item.parent_id
+            spans.append(encoded)
+
+    return {
+        "resourceSpans": [{
+            "resource": {
+                "attributes": [{"key": "service.name", "value": {"stringValue": settings.trace_service_name}}],
+            },
+            "scopeSpans": [{"scope": {"name": OTLP_SCOPE}, "spans": spans}],
+        }],
+    }
+
+
+# Global tracer instance
+tracer = Tracer()
@@ -0,0 +1,12 @@
+"""Embeddable slug resolver for services that consume the Router manifest."""
+
+from .normalization import normalize_key
+from .resolver import Resolution, RouterResolver, RouterUnavailableError, parse_manifest
+
+__all__ = [
+    "Resolution",
+    "RouterResolver",
+    "RouterUnavailableError",
+    "normalize_key",
+    "parse_manifest",
+]
@@ -0,0 +1,70 @@
+"""Host/path normalization matching the Router's defaults.
+
+Mirrors ``app/normalization.py`` in the Router with ``www.`` stripping and
+path case folding enabled, so lookups hit the keys the Router stores.
+"""
+
+import re
+
+_KEEP_ENCODED = frozenset(b"/?#%")
+_ESCAPE_RE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def _percent_decode(path: str) -> str:
+    """Decode percent-escapes, keeping delimiters, '%' and whitespace encoded."""
+    if "%" not in path:
+        return path
+
+    raw = path.encode("utf-8")
+    out = bytearray()
+    i = 0
+    while i < len(raw):
+        if raw[i] == 0x25 and _ESCAPE_RE.fullmatch(raw[i:i + 3].decode("ascii", "replace")):
+            byte = int(raw[i + 1:i + 3], 16)
+            if byte in _KEEP_ENCODED or byte <= 0x20 or byte == 0x7F:
+                out += b"%%%02X" % byte
+            else:
+                out.append(byte)
+            i += 3
+        else:
+            out.append(raw[i])
+            i += 1
+
+    try:
+        return out.decode("utf-8")
+    except UnicodeDecodeError:
+        return path
+
+
+def normalize_host(host: str) -> str:
+    """Normalize a host: case, trailing dot, port, ``www.`` and IDNA."""
+    host = host.strip().lower()
+    if host.startswith("["):
+        host = host[1:host.find("]")] if "]" in host else host[1:]
+    elif host.count(":") == 1:
+        host = host.split(":", 1)[0]
+
+    host = host.rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+
+    if not host.isascii():
+        try:
+            host = host.encode("idna").decode("ascii")
+        except UnicodeError:
+            pass
+    return host
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a path: percent-decoding, case and trailing slash."""
+    path = _percent_decode(path.strip()).casefold()
+    path = _ESCAPE_RE.sub(lambda m: m.group(0).upper(), path)
+    if not path.startswith("/"):
+        path = "/" + path
+    return path.rstrip("/") or "/"
+
+
+def normalize_key(host: str, path: str) -> tuple[str, str]:
+    """Normalize a host/path pair the way the Router stores slugs."""
+    return normalize_host(host), normalize_path(path)
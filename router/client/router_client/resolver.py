@@ -0,0 +1,309 @@
+"""In-process slug resolver backed by the published Router manifest."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import httpx
+
+from .normalization import normalize_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Resolution:
+    """Result of resolving a host/path pair."""
+
+    match: bool
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
+    version: Optional[int] = None
+    tenant_id: Optional[str] = None
+    canonical_url: Optional[str] = None
+    redirect: Optional[str] = None
+    gone: bool = False
+    source: str = "manifest"
+
+
+NO_MATCH = Resolution(match=False, source="router")
+GONE = Resolution(match=False, gone=True, source="router")
+
+
+class RouterUnavailableError(Exception):
+    """The Router could not answer a fallback lookup.
+
+    Raised for transport errors, throttling (429), server errors and
+    unreadable responses, so callers can tell "unknown right now" apart
+    from a key that does not exist. ``retry_after`` carries the Router's
+    ``Retry-After`` hint in seconds when it sent one.
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Read a numeric ``Retry-After`` header, if present."""
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+def parse_manifest(payload: Any) -> dict[tuple[str, str], Resolution]:
+    """Build a lookup index from a manifest payload.
+
+    Accepts the full manifest document (``{"items": [...], ...}``) or the
+    bare compact item list ``[[host, path, resource_type, resource_id,
+    version], ...]``.
+    """
+    items = payload["items"] if isinstance(payload, dict) else payload
+    index = {}
+    for host, path, resource_type, resource_id, version in items:
+        index[normalize_key(host, path)] = Resolution(
+            match=True,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            version=version,
+        )
+    return index
+
+
+class RouterResolver:
+    """Resolves slugs in-process from the Router manifest.
+
+    The manifest is downloaded once and re-polled with ``If-None-Match`` so
+    unchanged manifests cost a 304. Keys missing from the manifest fall back
+    to ``GET /resolve`` on the Router over a pooled HTTP client, and those
+    answers are cached for their advertised ``max_age``.
+
+    Manifest items carry no tenant ID or canonical URL; fetch those through
+    the fallback path when needed.
+    """
+
+    def __init__(
+        self,
+        manifest_url: str,
+        router_base_url: Optional[str] = None,
+        service_name: str = "router-client",
+        refresh_interval: float = 60.0,
+        timeout: float = 2.0,
+        fallback_cache_size: int = 10000,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.manifest_url = manifest_url
+        self.router_base_url = router_base_url.rstrip("/") if router_base_url else None
+        self.service_name = service_name
+        self.refresh_interval = refresh_interval
+        self.fallback_cache_size = fallback_cache_size
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            transport=transport,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+
+        self._index: dict[tuple[str, str], Resolution] = {}
+        self._fallback: OrderedDict[tuple[str, str], tuple[float, Resolution]] = OrderedDict()
+        self._etag: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.manifest_hits = 0
+        self.fallback_cache_hits = 0
+        self.fallback_requests = 0
+        self.fallback_errors = 0
+        self.refreshes = 0
+        self.refresh_not_modified = 0
+        self.refresh_errors = 0
+        self.manifest_generated_at: Optional[str] = None
+        self.last_refresh_at: Optional[float] = None
+        self.last_change_at: Optional[float] = None
+
+    async def __aenter__(self) -> "RouterResolver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Load the manifest and start background refreshes."""
+        await self.refresh()
+        if self._task is None and self.refresh_interval > 0:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        """Stop refreshing and close the HTTP client."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.client.aclose()
+
+    async def refresh(self) -> bool:
+        """Poll the manifest; return True when a new version was loaded."""
+        headers = {"If-None-Match": self._etag} if self._etag else {}
+        try:
+            response = await self.client.get(self.manifest_url, headers=headers)
+            self.last_refresh_at = time.time()
+            if response.status_code == 304:
+                self.refresh_not_modified += 1
+                return False
+            response.raise_for_status()
+
+            payload = response.json()
+            self._index = parse_manifest(payload)
+            self._etag = response.headers.get("ETag")
+            if isinstance(payload, dict):
+                self.manifest_generated_at = payload.get("generated_at")
+            self.last_change_at = self.last_refresh_at
+            self.refreshes += 1
+            return True
+        except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+            self.refresh_errors += 1
+            logger.warning("Router manifest refresh failed: %s", e)
+            return False
+
+    async def _refresh_loop(self) -> None:
+        """Refresh the manifest on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def lookup(self, host: str, path: str) -> Optional[Resolution]:
+        """Look a key up in the manifest only; None when it is not listed."""
+        resolution = self._index.get(normalize_key(host, path))
+        if resolution is not None:
+            self.manifest_hits += 1
+        return resolution
+
+    async def resolve(self, host: str, path: str) -> Resolution:
+        """Resolve a key from the manifest, falling back to the Router.
+
+        Raises RouterUnavailableError when the key is not in the manifest
+        and the Router cannot answer; only a 404 or a ``match: false``
+        answer is reported as no match.
+        """
+        key = normalize_key(host, path)
+        resolution = self._index.get(key)
+        if resolution is not None:
+            self.manifest_hits += 1
+            return resolution
+
+        cached = self._fallback.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.fallback_cache_hits += 1
+            self._fallback.move_to_end(key)
+            return cached[1]
+
+        return await self._resolve_remote(key)
+
+    async def _resolve_remote(self, key: tuple[str, str]) -> Resolution:
+        """Resolve a key through ``GET /resolve`` on the Router."""
+        if not self.router_base_url:
+            return NO_MATCH
+
+        self.fallback_requests += 1
+        host, path = key
+        try:
+            response = await self.client.get(
+                f"{self.router_base_url}/resolve",
+                params={"host": host, "path": path},
+                headers={"X-Internal-Service": self.service_name},
+            )
+        except httpx.HTTPError as e:
+            raise self._unavailable(host, path, str(e)) from e
+
+        if response.status_code == 404:
+            resolution = NO_MATCH
+            max_age = self.refresh_interval
+        elif response.status_code == 410:
+            resolution = GONE
+            max_age = self.refresh_interval
+        elif response.status_code != 200:
+            raise self._unavailable(
+                host, path, f"HTTP {response.status_code}",
+                status_code=response.status_code,
+                retry_after=_retry_after(response),
+            )
+        else:
+            try:
+                data = response.json()
+                resolution = self._from_response(data)
+                max_age = (data.get("cache") or {}).get("max_age", self.refresh_interval)
+            except (ValueError, AttributeError) as e:
+                raise self._unavailable(host, path, f"invalid response: {e}", status_code=200) from e
+
+        self._fallback[key] = (time.monotonic() + max_age, resolution)
+        self._fallback.move_to_end(key)
+        while len(self._fallback) > self.fallback_cache_size:
+            self._fallback.popitem(last=False)
+        return resolution
+
+    def _unavailable(
+        self,
+        host: str,
+        path: str,
+        reason: str,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> RouterUnavailableError:
+        """Count and log a failed fallback lookup and build the error to raise."""
+        self.fallback_errors += 1
+        logger.warning("Router resolve failed for %s%s: %s", host, path, reason)
+        return RouterUnavailableError(
+            f"Router resolve failed for {host}{path}: {reason}",
+            status_code=status_code,
+            retry_after=retry_after,
+        )
+
+    @staticmethod
+    def _from_response(data: dict[str, Any]) -> Resolution:
+        """Build a resolution from a ``/resolve`` response body."""
+        if not data.get("match"):
+            return NO_MATCH
+        resource = data.get("resource") or {}
+        return Resolution(
+            match=True,
+            resource_type=resource.get("type"),
+            resource_id=resource.get("id"),
+            version=data.get("version"),
+            tenant_id=data.get("tenant_id"),
+            canonical_url=data.get("canonical_url"),
+            redirect=data.get("redirect"),
+            source="router",
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit ratio and staleness metrics."""
+        lookups = self.manifest_hits + self.fallback_cache_hits + self.fallback_requests
+        now = time.time()
+        return {
+            "manifest_items": len(self._index),
+            "manifest_etag": self._etag,
+            "manifest_generated_at": self.manifest_generated_at,
+            "manifest_hits": self.manifest_hits,
+            "fallback_cache_hits": self.fallback_cache_hits,
+            "fallback_requests": self.fallback_requests,
+            "fallback_errors": self.fallback_errors,
+            "hit_ratio": (
+                (self.manifest_hits + self.fallback_cache_hits) / lookups if lookups else 0.0
+            ),
+            "refreshes": self.refreshes,
+            "refresh_not_modified": self.refresh_not_modified,
+            "refresh_errors": self.refresh_errors,
+            "seconds_since_refresh": (
+                now - self.last_refresh_at if self.last_refresh_at else None
+            ),
+            "seconds_since_change": (
+                now - self.last_change_at if self.last_change_at else None
+            ),
+        }
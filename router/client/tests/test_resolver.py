@@ -0,0 +1,186 @@
+"""Tests for the in-process Router resolver."""
+
+import httpx
+import pytest
+
+from router_client import RouterResolver, RouterUnavailableError, parse_manifest
+
+MANIFEST_URL = "https://manifests.test/router/manifest.json"
+ROUTER_URL = "http://router.test"
+
+MANIFEST = {
+    "generated_at": "2025-08-22T10:05:00Z",
+    "count": 2,
+    "items": [
+        ["slotifyme.com", "/barbershop-a", "tenant", "ten_123", 5],
+        ["slotifyme.com", "/barbershop-a/downtown", "location", "loc_456", 3],
+    ],
+}
+
+
+class FakeServer:
+    """Serves the manifest with ETags and answers /resolve."""
+
+    def __init__(self):
+        self.manifest_requests = 0
+        self.resolve_requests = 0
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/router/manifest.json":
+            self.manifest_requests += 1
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, json=MANIFEST, headers={"ETag": '"v1"'})
+
+        self.resolve_requests += 1
+        assert request.headers["X-Internal-Service"] == "test"
+        if request.url.params["path"] == "/missing":
+            return httpx.Response(404, json={"detail": "Slug not found"})
+        if request.url.params["path"] == "/throttled":
+            return httpx.Response(429, json={"detail": "Too many requests"}, headers={"Retry-After": "2"})
+        if request.url.params["path"] == "/broken":
+            return httpx.Response(503, json={"detail": "Service unavailable"})
+        if request.url.params["path"] == "/gone":
+            return httpx.Response(410, json={"detail": "Slug mapping has been deleted"})
+        if request.url.params["path"] == "/new":
+            return httpx.Response(200, json={
+                "match": True,
+                "resource": {"type": "stylist", "id": "sty_1"},
+                "tenant_id": "ten_123",
+                "version": 1,
+                "canonical_url": "https://slotifyme.com/new",
+                "cache": {"max_age": 600, "etag": 'W/"sty_1-v1"'},
+            })
+        if request.url.params["path"] == "/old":
+            return httpx.Response(200, json={
+                "match": True,
+                "canonical_url": "https://slotifyme.com/new",
+                "redirect": "https://slotifyme.com/new",
+                "cache": {"max_age": 600, "etag": 'W/"slug_1-r0"'},
+            })
+        return httpx.Response(200, json={"match": False})
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+@pytest.fixture
+def resolver(server):
+    return RouterResolver(
+        MANIFEST_URL,
+        router_base_url=ROUTER_URL,
+        service_name="test",
+        refresh_interval=0,
+        transport=httpx.MockTransport(server.handler),
+    )
+
+
+def test_parse_manifest_accepts_compact_list():
+    """Test that a bare compact item list is accepted."""
+    index = parse_manifest(MANIFEST["items"])
+
+    assert index[("slotifyme.com", "/barbershop-a")].resource_id == "ten_123"
+
+
+async def test_resolve_from_manifest(resolver, server):
+    """Test that manifest keys resolve without calling the Router."""
+    async with resolver:
+        resolution = await resolver.resolve("www.Slotifyme.com:443", "/Barbershop-a/%64owntown/")
+
+    assert resolution.match is True
+    assert resolution.resource_type == "location"
+    assert resolution.resource_id == "loc_456"
+    assert resolution.version == 3
+    assert server.resolve_requests == 0
+
+
+async def test_refresh_uses_etag(resolver, server):
+    """Test that an unchanged manifest is revalidated with a 304."""
+    async with resolver:
+        assert await resolver.refresh() is False
+        stats = resolver.stats()
+
+    assert server.manifest_requests == 2
+    assert stats["refreshes"] == 1
+    assert stats["refresh_not_modified"] == 1
+    assert stats["manifest_etag"] == '"v1"'
+
+
+async def test_unknown_key_falls_back_and_is_cached(resolver, server):
+    """Test that unknown keys go to /resolve once and are then cached."""
+    async with resolver:
+        first = await resolver.resolve("slotifyme.com", "/new")
+        second = await resolver.resolve("slotifyme.com", "/new")
+        stats = resolver.stats()
+
+    assert first == second
+    assert first.source == "router"
+    assert first.tenant_id == "ten_123"
+    assert server.resolve_requests == 1
+    assert stats["fallback_cache_hits"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+async def test_deleted_key_is_gone(resolver):
+    """Test that a 410 from the Router is reported as gone."""
+    async with resolver:
+        resolution = await resolver.resolve("slotifyme.com", "/gone")
+
+    assert resolution.match is False
+    assert resolution.gone is True
+
+
+async def test_renamed_key_redirects(resolver):
+    """Test that a redirect answer from the Router is surfaced."""
+    async with resolver:
+        resolution = await resolver.resolve("slotifyme.com", "/old")
+
+    assert resolution.match is True
+    assert resolution.redirect == "https://slotifyme.com/new"
+    assert resolution.resource_id is None
+
+
+async def test_missing_key_is_no_match(resolver):
+    """Test that a 404 from the Router is reported as no match."""
+    async with resolver:
+        resolution = await resolver.resolve("slotifyme.com", "/missing")
+
+    assert resolution.match is False
+    assert resolution.gone is False
+
+
+@pytest.mark.parametrize("path,status_code,retry_after", [("/throttled", 429, 2.0), ("/broken", 503, None)])
+async def test_router_errors_raise_and_are_not_cached(resolver, server, path, status_code, retry_after):
+    """Test that throttling and server errors raise instead of reporting no match."""
+    async with resolver:
+        for _ in range(2):
+            with pytest.raises(RouterUnavailableError) as excinfo:
+                await resolver.resolve("slotifyme.com", path)
+        stats = resolver.stats()
+
+    assert excinfo.value.status_code == status_code
+    assert excinfo.value.retry_after == retry_after
+    assert server.resolve_requests == 2
+    assert stats["fallback_errors"] == 2
+
+
+async def test_transport_errors_raise():
+    """Test that an unreachable Router raises instead of reporting no match."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/router/manifest.json":
+            return httpx.Response(200, json=MANIFEST)
+        raise httpx.ConnectError("connection refused", request=request)
+
+    resolver = RouterResolver(
+        MANIFEST_URL,
+        router_base_url=ROUTER_URL,
+        refresh_interval=0,
+        transport=httpx.MockTransport(handler),
+    )
+    async with resolver:
+        with pytest.raises(RouterUnavailableError) as excinfo:
+            await resolver.resolve("slotifyme.com", "/new")
+
+    assert excinfo.value.status_code is None
@@ -0,0 +1,29 @@
+"""Backfill the redirect index from slug history.
+
+Renames made before the redirect index existed are only recorded in
+slug_history. This derives redirects for them; existing redirects are kept.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python scripts/backfill_redirects.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db import AsyncSessionLocal, close_db  # noqa: E402
+from app.services.redirect_service import RedirectService  # noqa: E402
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as db:
+        added = await RedirectService(db).backfill_from_history()
+    print(f"Redirects added: {added}")
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
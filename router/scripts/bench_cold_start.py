@@ -0,0 +1,106 @@
+"""Benchmark for router cold start: time to the first successful /resolve.
+
+Starts the service under uvicorn in a fresh process, polls /resolve until it
+returns 200 and reports that time along with the service's own startup phase
+breakdown (/admin/stats/startup). Runs once with the schema created on
+startup and once with STARTUP_CREATE_SCHEMA=false, then prints the modules
+that dominate import time (python -X importtime).
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python scripts/bench_cold_start.py [runs]
+
+The database must already have the schema (run alembic upgrade head).
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+ROUTER_DIR = Path(__file__).resolve().parent.parent
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+TIMEOUT_SECONDS = 60
+
+
+def cold_start(env: dict[str, str]) -> tuple[float, dict]:
+    """Start the service and time the first successful /resolve."""
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+        cwd=ROUTER_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(base_url=BASE_URL, timeout=1.0) as client:
+            while time.perf_counter() - started < TIMEOUT_SECONDS:
+                try:
+                    response = client.get(
+                        "/resolve",
+                        params={"host": "bench.slotifyme.com", "path": "/cold-start"},
+                        headers={"X-Internal-Service": "bench"},
+                    )
+                    if response.status_code == 200:
+                        elapsed = time.perf_counter() - started
+                        report = client.get(
+                            "/admin/stats/startup", headers={"X-Internal-Role": "admin"}
+                        ).json()
+                        return elapsed, report
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError("Service did not serve /resolve in time")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def import_breakdown(env: dict[str, str], top: int = 15) -> list[tuple[int, str]]:
+    """Get the packages that take longest to import with app.main as (microseconds, package)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROUTER_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    totals: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        # Self times summed per top-level package never double count nesting
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(self_us)
+    return sorted(((us, name) for name, us in totals.items()), reverse=True)[:top]
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    base_env = dict(os.environ)
+
+    for create_schema in ("true", "false"):
+        env = {**base_env, "STARTUP_CREATE_SCHEMA": create_schema}
+        timings = []
+        for _ in range(runs):
+            elapsed, report = cold_start(env)
+            timings.append(elapsed)
+        timings.sort()
+        print(
+            f"STARTUP_CREATE_SCHEMA={create_schema:<5}  first /resolve: "
+            f"median {timings[len(timings) // 2] * 1000:7.1f} ms  best {timings[0] * 1000:7.1f} ms"
+        )
+        print(f"  last run boot {report['boot_seconds']} s, phases: {report['phases']}")
+
+    print("\nImport time by package:")
+    for us, name in import_breakdown(base_env):
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Micro-benchmark for logging on the resolve hot path.
+
+Logs the "URL resolved" event the way resolve_url does on every cache miss
+and reports CPU per call on the calling thread (the event loop in the
+service) and for the whole process, under three setups:
+
+- inline: rendered and written on the caller's thread, every event kept
+- async: rendered and written on the background thread, every event kept
+- async + sampled: background writer, LOG_SAMPLE_RATES default (1% kept)
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python scripts/bench_logging.py [iterations]
+
+Output goes to /dev/null so terminal speed does not skew the numbers.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import logging as app_logging  # noqa: E402
+from app.config import settings  # noqa: E402
+
+SETUPS = [
+    ("inline", False, {}),
+    ("async", True, {}),
+    ("async + sampled", True, dict(settings.log_sample_rates)),
+]
+
+
+def measure(iterations: int) -> tuple[float, float]:
+    """Return (caller thread, process) CPU microseconds per log call."""
+    logger = app_logging.get_logger("app.routers.resolve")
+    for i in range(1000):
+        logger.info("URL resolved", host="bench.slotifyme.com", path=f"/warmup-{i}")
+
+    thread_start = time.thread_time()
+    process_start = time.process_time()
+    for i in range(iterations):
+        logger.info(
+            "URL resolved",
+            host="bench.slotifyme.com",
+            path=f"/barbershop-{i}",
+            resource_type="location",
+            resource_id=f"loc_{i}",
+        )
+    thread_cpu = time.thread_time() - thread_start
+    # Let the background writer drain so its CPU is counted
+    app_logging.stop_logging()
+    process_cpu = time.process_time() - process_start
+    return thread_cpu / iterations * 1e6, process_cpu / iterations * 1e6
+
+
+def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    stdout = sys.stdout
+    results = []
+
+    for name, log_async, sample_rates in SETUPS:
+        settings.log_async = log_async
+        settings.log_sample_rates = sample_rates
+        settings.log_queue_size = iterations + 1000
+        sys.stdout = open(os.devnull, "w")
+        try:
+            app_logging.setup_logging()
+            thread_us, process_us = measure(iterations)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        results.append((name, thread_us, process_us))
+        print(f"{name:<16} caller {thread_us:6.2f} us/event   process {process_us:6.2f} us/event")
+
+    baseline = results[0][1]
+    for name, thread_us, _ in results[1:]:
+        print(f"Caller CPU saved per request with {name}: {baseline - thread_us:.2f} us "
+              f"({(1 - thread_us / baseline) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Micro-benchmark for the resolve query on cache misses.
+
+Compares per-miss CPU time of the original ORM path (fresh select() of the
+SlugMap entity plus a second query for deleted mappings) against the cached
+lambda statement returning plain rows used by SlugService.resolve_slug.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python scripts/bench_resolve_query.py [iterations]
+
+The database only needs the slug_map table; lookups use random paths so
+every call is a miss, which is the path that reaches Postgres.
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import and_, select  # noqa: E402
+
+from app.db import AsyncSessionLocal, close_db  # noqa: E402
+from app.models.slug_map import SlugMap, SlugStatus  # noqa: E402
+from app.services.slug_service import SlugService  # noqa: E402
+
+HOST = "bench.slotifyme.com"
+
+
+async def orm_miss(db, path: str) -> None:
+    """Original resolve path: ORM entity query plus deleted check."""
+    for status in (SlugStatus.ACTIVE, SlugStatus.DELETED):
+        query = select(SlugMap).where(
+            and_(
+                SlugMap.host == HOST,
+                SlugMap.path == path,
+                SlugMap.status == status,
+            )
+        )
+        result = await db.execute(query)
+        if result.scalar_one_or_none():
+            return
+
+
+async def lambda_miss(db, path: str) -> None:
+    """Current resolve path: cached lambda statement returning rows."""
+    await SlugService(db).resolve_slug(HOST, path)
+
+
+async def measure(name: str, fn, iterations: int) -> float:
+    """Return CPU microseconds per call after a warm-up round."""
+    async with AsyncSessionLocal() as db:
+        for _ in range(100):
+            await fn(db, f"/warmup-{uuid.uuid4().hex}")
+
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        for _ in range(iterations):
+            await fn(db, f"/miss-{uuid.uuid4().hex}")
+        cpu = (time.process_time() - cpu_start) / iterations * 1e6
+        wall = (time.perf_counter() - wall_start) / iterations * 1e6
+
+    print(f"{name:<28} cpu {cpu:8.1f} us/miss   wall {wall:8.1f} us/miss")
+    return cpu
+
+
+async def main() -> None:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    before = await measure("ORM select + deleted check", orm_miss, iterations)
+    after = await measure("lambda statement rows", lambda_miss, iterations)
+    print(f"CPU saved per miss: {before - after:.1f} us ({(1 - after / before) * 100:.0f}%)")
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,31 @@
+"""Slug history partition maintenance.
+
+Creates the upcoming monthly slug_history partitions (moving any rows that
+landed in the default partition) and drops partitions older than
+HISTORY_RETENTION_MONTHS. Run it from cron, e.g. daily.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python scripts/maintain_history.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.db import close_db  # noqa: E402
+from app.models import slug_map  # noqa: E402,F401  (registers the mappers)
+from app.services.history_service import maintain_history  # noqa: E402
+
+
+async def main() -> None:
+    result = await maintain_history()
+    print(f"Partitions created: {', '.join(result['created']) or 'none'}")
+    print(f"Partitions dropped: {', '.join(result['dropped']) or 'none'}")
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
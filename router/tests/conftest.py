@@ -7,7 +7,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.db import Base, get_db
+from app.db import Base, ReadSession, get_db, get_read_db, get_read_session_factory
 from app.main import app
 
 
@@ -62,7 +62,17 @@ async def async_client(test_session):
     async def override_get_db():
         yield test_session
     
+    async def open_test_session():
+        return test_session
+    
+    async def override_get_read_db():
+        yield ReadSession(open_test_session)
+    
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_read_session_factory] = lambda: sessionmaker(
+        test_session.bind, class_=AsyncSession, expire_on_commit=False
+    )
     
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
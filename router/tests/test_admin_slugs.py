@@ -1,5 +1,7 @@
 """Tests for admin slugs router."""
 
+import json
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -202,6 +204,44 @@ async def test_list_slugs(async_client: AsyncClient, db: AsyncSession):
     assert len(data["items"]) == 2
     assert data["page"] == 1
     assert data["page_size"] == 20
+    
+    # Substring search pages with a cursor
+    response = await async_client.get(
+        "/admin/slugs?q=downtown&page_size=1",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["path"] for item in data["items"]] == ["/barbershop-a/downtown"]
+    assert data["total"] is None
+    
+    # Prefix search
+    response = await async_client.get(
+        "/admin/slugs?q=/barbershop-a&page_size=1",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["next_cursor"]
+    
+    response = await async_client.get(
+        f"/admin/slugs?q=/barbershop-a&page_size=1&cursor={data['next_cursor']}",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    data = response.json()
+    assert len(data["items"]) == 1
+    assert data["next_cursor"] is None
+    
+    # Searches shorter than the trigram length are rejected
+    response = await async_client.get(
+        "/admin/slugs?q=do",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    assert response.status_code == 422
 
 
 @pytest.mark.asyncio
@@ -245,3 +285,94 @@ async def test_check_availability(async_client: AsyncClient, db: AsyncSession):
     data = response.json()
     assert data["available"] == True
     assert data["conflicting_id"] is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_tenant_host_change_and_delete(async_client: AsyncClient, db: AsyncSession):
+    """Test tenant-wide host change and soft delete."""
+    for path in ("/bulk-a", "/bulk-b"):
+        await async_client.post(
+            "/admin/slugs",
+            json={
+                "host": "slotifyme.com",
+                "path": path,
+                "resource_type": "location",
+                "resource_id": f"loc{path.replace('/', '_')}",
+                "tenant_id": "ten_bulk",
+                "canonical_url": f"https://slotifyme.com{path}",
+                "status": "active"
+            },
+            headers={"X-Internal-Role": "admin"}
+        )
+    
+    response = await async_client.put(
+        "/admin/slugs/tenants/ten_bulk",
+        json={"host": "bulk.example.com"},
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["affected"] == 2
+    
+    list_response = await async_client.get(
+        "/admin/slugs?tenant_id=ten_bulk",
+        headers={"X-Internal-Role": "admin"}
+    )
+    items = list_response.json()["items"]
+    assert {item["host"] for item in items} == {"bulk.example.com"}
+    assert all(item["canonical_url"].startswith("https://bulk.example.com/") for item in items)
+    assert all(item["version"] == 2 for item in items)
+    
+    response = await async_client.delete(
+        "/admin/slugs/tenants/ten_bulk",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["affected"] == 2
+    
+    list_response = await async_client.get(
+        "/admin/slugs?tenant_id=ten_bulk&status=active",
+        headers={"X-Internal-Role": "admin"}
+    )
+    assert list_response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_export_slugs_resumes_after_id(async_client: AsyncClient, db: AsyncSession):
+    """Test NDJSON export with tenant filter and resume cursor."""
+    for path in ("/export-a", "/export-b"):
+        await async_client.post(
+            "/admin/slugs",
+            json={
+                "host": "slotifyme.com",
+                "path": path,
+                "resource_type": "location",
+                "resource_id": f"loc{path.replace('/', '_')}",
+                "tenant_id": "ten_export",
+                "canonical_url": f"https://slotifyme.com{path}",
+                "status": "active"
+            },
+            headers={"X-Internal-Role": "admin"}
+        )
+    
+    response = await async_client.get(
+        "/admin/slugs/export?tenant_id=ten_export",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 2
+    assert rows[0]["id"] < rows[1]["id"]
+    
+    response = await async_client.get(
+        f"/admin/slugs/export?tenant_id=ten_export&format=csv&after={rows[0]['id']}",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    lines = response.text.splitlines()
+    assert lines[0].startswith("id,host,path")
+    assert len(lines) == 2
+    assert lines[1].startswith(rows[1]["id"])
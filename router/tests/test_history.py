@@ -0,0 +1,84 @@
+"""Tests for slug history."""
+
+from datetime import date, datetime, timezone
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.slug_map import SlugStatus
+from app.pagination import decode_cursor, encode_cursor
+from app.services.history_service import add_months, diff_values
+
+
+def test_diff_values_keeps_only_changed_fields():
+    """Test that history diffs hold changed fields as JSON values."""
+    old, new = diff_values(
+        {"path": "/a", "status": SlugStatus.ACTIVE, "version": 1},
+        {"path": "/b", "status": SlugStatus.ACTIVE, "version": 2},
+    )
+
+    assert old == {"path": "/a", "version": 1}
+    assert new == {"path": "/b", "version": 2}
+
+
+def test_add_months_crosses_years():
+    """Test month arithmetic used for partition bounds."""
+    assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_cursor_round_trip():
+    """Test that cursors decode to the encoded sort key."""
+    changed_at = datetime(2026, 10, 1, 12, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor(changed_at, "hist_123")
+
+    assert decode_cursor(cursor) == [changed_at.isoformat(), "hist_123"]
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_slug_history_pagination(async_client: AsyncClient, db: AsyncSession):
+    """Test keyset pagination over a slug's history."""
+    create_response = await async_client.post(
+        "/admin/slugs",
+        json={
+            "host": "slotifyme.com",
+            "path": "/history-a",
+            "resource_type": "tenant",
+            "resource_id": "ten_hist",
+            "tenant_id": "ten_hist",
+            "canonical_url": "https://slotifyme.com/history-a",
+            "status": "active"
+        },
+        headers={"X-Internal-Role": "admin"}
+    )
+    slug_id = create_response.json()["id"]
+    
+    await async_client.put(
+        f"/admin/slugs/{slug_id}",
+        json={"path": "/history-b"},
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    response = await async_client.get(
+        f"/admin/slugs/{slug_id}/history?limit=1",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    assert response.status_code == 200
+    page = response.json()
+    assert page["items"][0]["old_values"] == {"path": "/history-a", "version": 1}
+    assert page["items"][0]["new_values"] == {"path": "/history-b", "version": 2}
+    assert page["next_cursor"]
+    
+    response = await async_client.get(
+        f"/admin/slugs/{slug_id}/history?limit=1&cursor={page['next_cursor']}",
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    page = response.json()
+    assert page["items"][0]["old_values"] is None
+    assert page["items"][0]["new_values"]["path"] == "/history-a"
+    assert page["next_cursor"] is None
@@ -0,0 +1,70 @@
+"""Tests for hot key tracking."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.cache import LocalCache, get_cache_key, local_resolve_cache, resolve_invalidations
+from app.config import settings
+from app.services.hot_keys import CountMinSketch, HotKeyTracker
+
+
+def test_count_min_sketch_never_underestimates():
+    """Test that sketch estimates are upper bounds of true counts."""
+    sketch = CountMinSketch(width=64, depth=4)
+    for i in range(200):
+        sketch.add(f"slotifyme.com|/shop-{i % 20}")
+
+    for i in range(20):
+        assert sketch.estimate(f"slotifyme.com|/shop-{i}") >= 10
+
+
+@pytest.mark.asyncio
+async def test_hot_key_tracker_keeps_heavy_hitters(monkeypatch):
+    """Test that the hottest keys survive top-K eviction."""
+    monkeypatch.setattr(settings, "hot_keys_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "hot_keys_top_k", 3)
+    tracker = HotKeyTracker()
+
+    for _ in range(50):
+        tracker.record("slotifyme.com", "/hot-a")
+        tracker.record("slotifyme.com", "/hot-b")
+    for i in range(20):
+        tracker.record("other.com", f"/cold-{i}")
+
+    report = await tracker.report(2)
+    assert {entry["path"] for entry in report["keys"]} == {"/hot-a", "/hot-b"}
+    assert report["hosts"][0] == {"host": "slotifyme.com", "count": 100}
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Test that the local cache is bounded and LRU ordered."""
+    cache = LocalCache(max_size=2, ttl=30)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidation_message_evicts_local_entries():
+    """Test that invalidations published by another replica evict local entries."""
+    kept = get_cache_key("slotifyme.com", "/kept")
+    renamed = get_cache_key("slotifyme.com", "/renamed")
+    local_resolve_cache.set(kept, {"match": True})
+    local_resolve_cache.set(renamed, {"match": True})
+
+    resolve_invalidations.evict(f'["{renamed}"]')
+
+    assert local_resolve_cache.get(kept) == {"match": True}
+    assert local_resolve_cache.get(renamed) is None
+
+
+@pytest.mark.asyncio
+async def test_hot_keys_stats_requires_admin(async_client: AsyncClient):
+    """Test that hot key stats require admin role."""
+    response = await async_client.get("/admin/stats/hot-keys")
+
+    assert response.status_code == 403
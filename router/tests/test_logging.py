@@ -0,0 +1,39 @@
+"""Tests for log sampling and the background log writer."""
+
+import logging
+import queue
+
+import pytest
+import structlog
+
+from app.config import settings
+from app.logging import DroppingQueueHandler, EventSampler
+
+
+def test_event_sampler_keeps_configured_fraction(monkeypatch):
+    """Test that only sampled events are dropped and kept ones carry the rate."""
+    monkeypatch.setattr(settings, "log_sample_rates", {"URL resolved": 0.0, "Cache hit": 1.0})
+    sampler = EventSampler()
+
+    with pytest.raises(structlog.DropEvent):
+        sampler(None, "info", {"event": "URL resolved"})
+    assert sampler(None, "info", {"event": "Cache hit"}) == {"event": "Cache hit"}
+    assert sampler(None, "info", {"event": "Slow query"}) == {"event": "Slow query"}
+    assert sampler.sampled_out == 1
+
+    monkeypatch.setattr(settings, "log_sample_rates", {"URL resolved": 0.999999})
+    assert sampler(None, "info", {"event": "URL resolved"})["sample_rate"] == 0.999999
+
+
+def test_queue_handler_drops_when_full():
+    """Test that a full queue drops records instead of blocking."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, {"event": "x"}, None, None)
+
+    for _ in range(5):
+        handler.handle(record)
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    # Records are queued unformatted so rendering stays on the writer thread
+    assert handler.queue.get_nowait().msg == {"event": "x"}
@@ -0,0 +1,77 @@
+"""Tests for host/path normalization."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.normalization import KeyCollapseTracker, normalize_host, normalize_key, normalize_path
+
+
+def test_normalize_host():
+    """Test host case, port, trailing dot, www. and IDNA handling."""
+    assert normalize_host("WWW.Slotifyme.com:8443") == "slotifyme.com"
+    assert normalize_host("slotifyme.com.") == "slotifyme.com"
+    assert normalize_host("Bücher.de") == "xn--bcher-kva.de"
+
+
+def test_normalize_host_keeps_www_when_disabled(monkeypatch):
+    """Test that www. stripping can be turned off."""
+    monkeypatch.setattr(settings, "normalize_strip_www", False)
+
+    assert normalize_host("www.slotifyme.com") == "www.slotifyme.com"
+
+
+def test_normalize_path():
+    """Test path percent-decoding, case folding and trailing slash."""
+    assert normalize_path("/Shop/") == "/shop"
+    assert normalize_path("/caf%C3%A9") == "/café"
+    assert normalize_path("/%53hop") == "/shop"
+    assert normalize_path("/") == "/"
+
+
+def test_normalize_path_keeps_structural_escapes():
+    """Test that escapes for '/', '%' and spaces stay encoded."""
+    assert normalize_path("/a%2fb") == "/a%2Fb"
+    assert normalize_path("/a%20b") == "/a%20b"
+    assert normalize_path("/100%25") == "/100%25"
+
+
+def test_key_collapse_tracker_counts_variants():
+    """Test that distinct raw spellings are counted per canonical key."""
+    tracker = KeyCollapseTracker()
+    for raw in [("Slotifyme.com", "/Shop/"), ("www.slotifyme.com", "/shop"), ("Slotifyme.com", "/Shop/")]:
+        tracker.record(raw, normalize_key(*raw))
+    tracker.record(("slotifyme.com", "/shop"), ("slotifyme.com", "/shop"))
+
+    stats = tracker.stats()
+    assert stats["lookups"] == 4
+    assert stats["normalized"] == 3
+    assert stats["top_collapsed"][0]["key"] == "slotifyme.com|/shop"
+    assert stats["top_collapsed"][0]["raw_variants"] == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_normalizes_key(async_client: AsyncClient, db: AsyncSession):
+    """Test that raw spellings of a key resolve to the same slug."""
+    await async_client.post(
+        "/admin/slugs",
+        json={
+            "host": "slotifyme.com",
+            "path": "/normalized-shop",
+            "resource_type": "tenant",
+            "resource_id": "ten_norm",
+            "tenant_id": "ten_norm",
+            "canonical_url": "https://slotifyme.com/normalized-shop",
+            "status": "active"
+        },
+        headers={"X-Internal-Role": "admin"}
+    )
+    
+    response = await async_client.get(
+        "/resolve?host=WWW.Slotifyme.com:443&path=/Normalized-Shop/",
+        headers={"X-Internal-Service": "edge"}
+    )
+    
+    assert response.status_code == 200
+    assert response.json()["resource"]["id"] == "ten_norm"
@@ -0,0 +1,78 @@
+"""Tests for statement fingerprint stats."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.query_stats import OTHER_FINGERPRINT, QueryStats, _row_count, fingerprint
+
+
+def test_fingerprint_strips_literals_and_lists():
+    """Test that statements differing only in values share a fingerprint."""
+    assert fingerprint(
+        "SELECT * FROM slug_map WHERE id IN ($1, $2, $3) AND host = 'a.com' LIMIT 20"
+    ) == fingerprint(
+        "SELECT * FROM slug_map WHERE id IN ($1)  AND host = 'b.com' LIMIT 50"
+    ) == "SELECT * FROM slug_map WHERE id IN (...) AND host = ? LIMIT ?"
+
+    assert fingerprint(
+        "INSERT INTO slug_history (id, actor) VALUES ($1, $2), ($3, $4)"
+    ) == "INSERT INTO slug_history (id, actor) VALUES (...)"
+    assert fingerprint("SELECT path::text FROM slug_map_1") == "SELECT path::text FROM slug_map_1"
+
+
+def test_query_stats_aggregates_and_bounds_fingerprints(monkeypatch):
+    """Test per-fingerprint aggregation, overflow and slow counting."""
+    monkeypatch.setattr(settings, "query_stats_max_fingerprints", 2)
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 100.0)
+    stats = QueryStats()
+
+    stats.record("SELECT * FROM a WHERE id = $1", 5.0, 1)
+    stats.record("SELECT * FROM a WHERE id = $2", 150.0, 0)
+    stats.record("SELECT * FROM b", 1.0, 10)
+    stats.record("SELECT * FROM c", 1.0, 3)
+
+    top = stats.top(order_by="total_ms")
+    assert top[0] == {
+        "fingerprint": "SELECT * FROM a WHERE id = ?",
+        "count": 2,
+        "total_ms": 155.0,
+        "mean_ms": 77.5,
+        "max_ms": 150.0,
+        "rows": 1,
+        "rows_per_call": 0.5,
+    }
+    assert stats.top(1, order_by="rows")[0]["fingerprint"] == "SELECT * FROM b"
+    assert {entry["fingerprint"] for entry in top} == {
+        "SELECT * FROM a WHERE id = ?", "SELECT * FROM b", OTHER_FINGERPRINT
+    }
+    assert stats.slow == 1
+
+
+def test_query_stats_skip_unknown_row_counts():
+    """Test that statements without a driver row count do not skew rows per call."""
+    stats = QueryStats()
+
+    stats.record("UPDATE a SET x = $1", 1.0, 4)
+    stats.record("UPDATE a SET x = $1", 1.0, None)
+    stats.record("SELECT * FROM a", 1.0, None)
+
+    top = {entry["fingerprint"]: entry for entry in stats.top()}
+    assert top["UPDATE a SET x = ?"]["rows_per_call"] == 4.0
+    assert top["SELECT * FROM a"]["rows"] == 0
+    assert top["SELECT * FROM a"]["rows_per_call"] is None
+
+    class Cursor:
+        rowcount = -1
+
+    assert _row_count(Cursor()) is None
+    Cursor.rowcount = 2
+    assert _row_count(Cursor()) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_stats_requires_admin(async_client: AsyncClient):
+    """Test that statement stats require admin role."""
+    response = await async_client.get("/admin/stats/queries")
+
+    assert response.status_code == 403
@@ -0,0 +1,62 @@
+"""Tests for rate limiting and load shedding."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.db import LoadShedder
+from app.services.rate_limiter import RateLimiter
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_enforces_burst_and_refills(monkeypatch):
+    """Test that a bucket allows its burst, then refills over time."""
+    monkeypatch.setattr(settings, "rate_limit_service_rate", 10.0)
+    monkeypatch.setattr(settings, "rate_limit_service_burst", 3.0)
+    limiter = RateLimiter()
+    limits = limiter._limits("ssr", "slotifyme.com", miss=False)
+
+    assert [limiter._take_local(limits, 100.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter._take_local(limits, 100.0) == pytest.approx(0.1)
+    assert limiter._take_local(limits, 100.2) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_miss_budget_is_separate(monkeypatch):
+    """Test that exhausting the miss budget leaves cached traffic allowed."""
+    monkeypatch.setattr(settings, "rate_limit_miss_service_burst", 2.0)
+    limiter = RateLimiter()
+
+    assert await limiter.acquire("ssr", "slotifyme.com", miss=True) == 0.0
+    assert await limiter.acquire("ssr", "slotifyme.com", miss=True) == 0.0
+    assert await limiter.acquire("ssr", "slotifyme.com", miss=True) > 0
+    assert await limiter.acquire("edge", "other.com", miss=True) == 0.0
+    assert await limiter.acquire("ssr", "slotifyme.com") == 0.0
+
+    stats = limiter.stats()
+    assert stats["limited_misses"] == 1
+    assert stats["top_limited_services"] == [{"service": "ssr", "count": 1}]
+
+
+def test_load_shedder_sheds_on_pool_wait_and_recovers(monkeypatch):
+    """Test that high pool waits trigger shedding that decays away."""
+    monkeypatch.setattr(settings, "load_shed_pool_wait_ms", 50.0)
+    shedder = LoadShedder()
+    assert not shedder.should_shed()
+
+    for _ in range(20):
+        shedder.record_wait(0.5)
+    assert shedder.should_shed()
+
+    # Pretend no samples arrived for a minute
+    shedder._updated -= 60
+    assert not shedder.should_shed()
+    assert shedder.stats()["shed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_stats_requires_admin(async_client: AsyncClient):
+    """Test that rate limit stats require admin role."""
+    response = await async_client.get("/admin/stats/rate-limits")
+
+    assert response.status_code == 403
@@ -143,3 +143,44 @@ async def test_resolve_cache_hit(async_client: AsyncClient, db: AsyncSession):
     assert response2.status_code == 200
     # Both responses should be identical
     assert response1.json() == response2.json()
+
+
+@pytest.mark.asyncio
+async def test_resolve_renamed_slug_redirects(async_client: AsyncClient, db: AsyncSession):
+    """Test that old paths of a renamed slug redirect in a single hop."""
+    slug_data = {
+        "host": "slotifyme.com",
+        "path": "/barbershop-b",
+        "resource_type": "tenant",
+        "resource_id": "ten_789",
+        "tenant_id": "ten_789",
+        "canonical_url": "https://slotifyme.com/barbershop-b",
+        "status": "active"
+    }
+    
+    create_response = await async_client.post(
+        "/admin/slugs",
+        json=slug_data,
+        headers={"X-Internal-Role": "admin"}
+    )
+    slug_id = create_response.json()["id"]
+    
+    # Rename twice
+    for path in ("/barbershop-b-2", "/barbershop-b-3"):
+        await async_client.put(
+            f"/admin/slugs/{slug_id}",
+            json={"path": path, "canonical_url": f"https://slotifyme.com{path}"},
+            headers={"X-Internal-Role": "admin"}
+        )
+    
+    # Both old paths point straight at the latest URL
+    for path in ("/barbershop-b", "/barbershop-b-2"):
+        response = await async_client.get(
+            f"/resolve?host=slotifyme.com&path={path}",
+            headers={"X-Internal-Service": "edge"}
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["match"] == True
+        assert data["redirect"] == "https://slotifyme.com/barbershop-b-3"
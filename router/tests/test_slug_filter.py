@@ -0,0 +1,99 @@
+"""Tests for the slug key filter."""
+
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.models.slug_map import SlugStatus
+from app.services.slug_filter import BloomFilter, SlugKeyFilter, get_filter_key
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """Test that every added key is reported as present."""
+    bloom = BloomFilter.for_capacity(1000, 0.01)
+    keys = [get_filter_key("slotifyme.com", f"/shop-{i}") for i in range(1000)]
+
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    assert bloom.count == 1000
+
+
+def test_bloom_filter_false_positive_rate():
+    """Test that the false-positive rate stays near the target."""
+    bloom = BloomFilter.for_capacity(1000, 0.01)
+    for i in range(1000):
+        bloom.add(get_filter_key("slotifyme.com", f"/shop-{i}"))
+
+    false_positives = sum(
+        get_filter_key("other.com", f"/missing-{i}") in bloom for i in range(10000)
+    )
+
+    assert false_positives / 10000 < 0.03
+    assert bloom.estimated_false_positive_rate() < 0.03
+
+
+def test_bloom_filter_uses_redis_bit_order():
+    """Test that bit offsets match Redis SETBIT/GETBIT layout."""
+    bloom = BloomFilter(num_bits=16, num_hashes=1)
+    key = "slotifyme.com|/barbershop-a"
+    bloom.add(key)
+
+    (pos,) = bloom.positions(key)
+    assert bloom.bits[pos // 8] == 0x80 >> (pos % 8)
+
+
+@pytest.mark.asyncio
+async def test_slug_key_filter_not_ready_passes_through():
+    """Test that an unbuilt filter never answers definitely absent."""
+    slug_filter = SlugKeyFilter()
+
+    assert await slug_filter.might_contain("slotifyme.com", "/anything") is True
+    assert slug_filter.stats()["ready"] is False
+
+
+@pytest.mark.asyncio
+async def test_slug_key_filter_tracks_writes(monkeypatch):
+    """Test that writes are tracked and drafts are ignored."""
+    slug_filter = SlugKeyFilter()
+    slug_filter._filter = BloomFilter.for_capacity(100, 0.01)
+
+    async def shared_contains(key):
+        return key in slug_filter._filter
+
+    monkeypatch.setattr(slug_filter, "_shared_contains", shared_contains)
+
+    await slug_filter.add("slotifyme.com", "/barbershop-a", SlugStatus.ACTIVE)
+    await slug_filter.add("slotifyme.com", "/barbershop-b", SlugStatus.DRAFT)
+
+    assert await slug_filter.might_contain("slotifyme.com", "/barbershop-a") is True
+    assert await slug_filter.might_contain("slotifyme.com", "/barbershop-b") is False
+
+    stats = slug_filter.stats()
+    assert stats["keys"] == 1
+    assert stats["definite_misses"] == 1
+    assert stats["memory_bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_slug_key_filter_unshared_negatives_pass_through(monkeypatch):
+    """Test that local negatives are not trusted without the shared bitmap."""
+    slug_filter = SlugKeyFilter()
+    slug_filter._filter = BloomFilter.for_capacity(100, 0.01)
+
+    monkeypatch.setattr(settings, "slug_filter_redis_shared", False)
+    assert await slug_filter.might_contain("slotifyme.com", "/barbershop-b") is True
+
+    # Shared, but no Redis to confirm against
+    monkeypatch.setattr(settings, "slug_filter_redis_shared", True)
+    assert await slug_filter.might_contain("slotifyme.com", "/barbershop-b") is True
+    assert slug_filter.stats()["definite_misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slug_filter_stats_requires_admin(async_client: AsyncClient):
+    """Test that slug filter stats require admin role."""
+    response = await async_client.get("/admin/stats/slug-filter")
+
+    assert response.status_code == 403
@@ -0,0 +1,36 @@
+"""Tests for startup timing and lazy imports."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from app.startup import StartupTimer
+
+
+def test_startup_timer_reports_phases():
+    """Test that each phase is timed and summed."""
+    timer = StartupTimer()
+    with timer.phase("cache"):
+        pass
+    with timer.phase("warm_pools"):
+        pass
+    timer.complete()
+
+    report = timer.report()
+    assert list(report["phases"]) == ["cache", "warm_pools"]
+    assert report["startup_seconds"] >= 0
+    assert report["completed_at"] is not None
+
+
+def test_app_import_does_not_load_boto3():
+    """Test that boto3 stays off the startup import path."""
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, app.main; print('boto3' in sys.modules)"],
+        cwd=Path(__file__).resolve().parent.parent,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+    )
+
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,73 @@
+"""Tests for request tracing."""
+
+import json
+
+import httpx
+import pytest
+from httpx import AsyncClient
+
+from app.config import settings
+from app.tracing import Tracer, inject_traceparent, parse_traceparent, span
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+
+def test_parse_traceparent():
+    """Test that only well-formed traceparent headers are accepted."""
+    assert parse_traceparent(TRACEPARENT) == (TRACE_ID, "00f067aa0ba902b7", True)
+    assert parse_traceparent(f"00-{TRACE_ID}-00f067aa0ba902b7-00")[2] is False
+    assert parse_traceparent("00-" + "0" * 32 + "-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+
+def test_tracer_records_nested_spans():
+    """Test that child spans join the inbound trace and propagate outbound."""
+    tracer = Tracer()
+
+    with span("outside") as outside:
+        assert outside is None
+
+    with tracer.trace("GET /resolve", TRACEPARENT) as root:
+        with span("cache.get", key="k") as child:
+            headers = inject_traceparent()
+
+    assert headers["traceparent"] == f"00-{TRACE_ID}-{child.span_id}-01"
+    assert root.parent_id == "00f067aa0ba902b7"
+    assert child.parent_id == root.span_id
+
+    traces = tracer.slowest(5)
+    assert traces[0]["trace_id"] == TRACE_ID
+    assert [s["name"] for s in traces[0]["spans"]] == ["GET /resolve", "cache.get"]
+
+
+@pytest.mark.asyncio
+async def test_tracer_exports_otlp_json(monkeypatch):
+    """Test OTLP export against a collector stand-in."""
+    monkeypatch.setattr(settings, "trace_otlp_endpoint", "http://collector:4318/v1/traces")
+    received = []
+
+    def collector(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(200, json={})
+
+    tracer = Tracer(transport=httpx.MockTransport(collector))
+    with tracer.trace("GET /resolve"):
+        with span("db.execute", statement="SELECT 1"):
+            pass
+    await tracer.export()
+
+    assert received[0].url.path == "/v1/traces"
+    spans = json.loads(received[0].content)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["GET /resolve", "db.execute"]
+    assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+    assert tracer.stats()["exported"] == 1
+
+
+@pytest.mark.asyncio
+async def test_traces_requires_admin(async_client: AsyncClient):
+    """Test that trace dumps require admin role."""
+    response = await async_client.get("/admin/stats/traces")
+
+    assert response.status_code == 403
@@ -2,7 +2,9 @@
 
 import json
 import hashlib
-from typing import Any, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
 
 import redis.asyncio as redis
 from app.config import settings
@@ -31,16 +33,69 @@ async def close_redis():
         redis_client = None
 
 
+class LocalCache:
+    """Small in-process LRU cache with optional per-entry expiry."""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value if present and not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Set a value, kept until evicted when ``ttl`` is None.
+        
+        Evicts the least recently used entry when full.
+        """
+        if self.max_size <= 0:
+            return
+        
+        expires_at = float("inf") if ttl is None else time.monotonic() + ttl
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Delete all values."""
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def serialize_datetime(obj):
+    """Convert datetime objects to ISO format strings for JSON serialization."""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return obj
+
+
+def render_json(data: dict) -> str:
+    """Serialize data the one way entitlement responses and their ETags use."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=serialize_datetime)
+
+
 def calculate_etag(data: dict) -> str:
     """Calculate ETag from data."""
-    # Convert datetime objects to ISO format strings for JSON serialization
-    def serialize_datetime(obj):
-        if hasattr(obj, 'isoformat'):
-            return obj.isoformat()
-        return obj
-    
-    content = json.dumps(data, sort_keys=True, separators=(",", ":"), default=serialize_datetime)
-    return hashlib.sha256(content.encode()).hexdigest()
+    return etag_for(render_json(data))
+
+
+def etag_for(body: str) -> str:
+    """Calculate ETag from an already rendered response body."""
+    return hashlib.sha256(body.encode()).hexdigest()
 
 
 def get_cache_key(tenant_id: str) -> str:
@@ -48,25 +103,77 @@ def get_cache_key(tenant_id: str) -> str:
     return f"rules:tenant:{tenant_id}:blob"
 
 
-async def get_cached_entitlements(tenant_id: str) -> Optional[dict]:
+class CachedEntitlements(NamedTuple):
+    """A cached entitlements response.
+    
+    Stored as one string, ``etag``, ``deps`` (JSON) and ``body`` separated
+    by newlines; JSON output never contains a raw newline. The body is the
+    exact response, so a hit never parses or re-serializes it.
+    """
+    etag: str
+    deps: str
+    body: str
+    
+    def pack(self) -> str:
+        return f"{self.etag}\n{self.deps}\n{self.body}"
+    
+    @classmethod
+    def unpack(cls, value: Optional[str]) -> Optional["CachedEntitlements"]:
+        if not value:
+            return None
+        parts = value.split("\n", 2)
+        if len(parts) != 3:
+            # Written in an older format; treat as a miss
+            return None
+        return cls(*parts)
+
+
+async def get_cached_entitlements(tenant_id: str) -> Optional[CachedEntitlements]:
     """Get cached entitlements for tenant."""
     try:
         redis_client = await get_redis()
         key = get_cache_key(tenant_id)
-        data = await redis_client.get(key)
-        return json.loads(data) if data else None
+        return CachedEntitlements.unpack(await redis_client.get(key))
     except Exception:
         # Return None if Redis is not available (e.g., in tests)
         return None
 
 
-async def set_cached_entitlements(tenant_id: str, data: dict, ttl: int = None) -> None:
+async def set_cached_entitlements(tenant_id: str, entry: CachedEntitlements, ttl: int = None) -> None:
     """Set cached entitlements for tenant."""
     try:
         redis_client = await get_redis()
         key = get_cache_key(tenant_id)
         ttl = ttl or settings.cache_ttl_seconds
-        await redis_client.setex(key, ttl, json.dumps(data))
+        await redis_client.setex(key, ttl, entry.pack())
+    except Exception:
+        # Silently fail if Redis is not available (e.g., in tests)
+        pass
+
+
+async def get_cached_entitlements_many(tenant_ids: List[str]) -> Dict[str, CachedEntitlements]:
+    """Get cached entitlements for many tenants with one MGET; misses are left out."""
+    try:
+        redis_client = await get_redis()
+        values = await redis_client.mget([get_cache_key(tenant_id) for tenant_id in tenant_ids])
+    except Exception:
+        # Everything is a miss if Redis is not available (e.g., in tests)
+        return {}
+    entries = {tenant_id: CachedEntitlements.unpack(value) for tenant_id, value in zip(tenant_ids, values)}
+    return {tenant_id: entry for tenant_id, entry in entries.items() if entry}
+
+
+async def set_cached_entitlements_many(items: Dict[str, CachedEntitlements], ttl: int = None) -> None:
+    """Set cached entitlements for many tenants in one pipeline."""
+    if not items:
+        return
+    try:
+        redis_client = await get_redis()
+        ttl = ttl or settings.cache_ttl_seconds
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for tenant_id, entry in items.items():
+                pipe.setex(get_cache_key(tenant_id), ttl, entry.pack())
+            await pipe.execute()
     except Exception:
         # Silently fail if Redis is not available (e.g., in tests)
         pass
@@ -81,3 +188,37 @@ async def delete_cached_entitlements(tenant_id: str) -> None:
     except Exception:
         # Silently fail if Redis is not available (e.g., in tests)
         pass
+
+
+def get_price_key(ref: str) -> str:
+    """Get cache key for a resolved pricing reference."""
+    return f"rules:price:{ref}"
+
+
+async def get_cached_prices(refs: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Get resolved prices for many pricing references with one MGET; misses are left out."""
+    try:
+        redis_client = await get_redis()
+        values = await redis_client.mget([get_price_key(ref) for ref in refs])
+    except Exception:
+        # Everything is a miss if Redis is not available (e.g., in tests)
+        return {}
+    return {ref: json.loads(value) for ref, value in zip(refs, values) if value}
+
+
+async def set_cached_prices(prices: Dict[str, Dict[str, Any]], ttl: Optional[int] = None) -> None:
+    """Set resolved prices in one pipeline; they never expire when ``ttl`` is None."""
+    if not prices:
+        return
+    try:
+        redis_client = await get_redis()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for ref, price in prices.items():
+                if ttl is None:
+                    pipe.set(get_price_key(ref), json.dumps(price))
+                else:
+                    pipe.setex(get_price_key(ref), ttl, json.dumps(price))
+            await pipe.execute()
+    except Exception:
+        # Silently fail if Redis is not available (e.g., in tests)
+        pass
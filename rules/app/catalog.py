@@ -0,0 +1,390 @@
+"""In-process snapshot of the plan and addon catalog."""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import get_redis
+from app.config import settings
+from app.db import SessionLocal
+from app.models.addon import Addon
+from app.models.plan import Plan
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = "rules:catalog:version"
+CATALOG_CHANNEL = "rules:catalog:changed"
+CATALOG_FEATURES_KEY = "rules:catalog:features"
+
+# Every feature an entitlement reports, off unless a plan, addon or override enables it
+DEFAULT_FEATURES = MappingProxyType({
+    "basic_reporting": False,
+    "family_booking": False,
+    "loyalty_points": False,
+    "reviews": False,
+    "advanced_analytics": False,
+    "stylist_matching": False,
+    "ai_booking": False,
+    "variable_pricing": False,
+    "packages": False,
+    "upsell": False,
+    "waitlist": False,
+    "gift_cards": False,
+    "online_store": False,
+    "tiered_loyalty": False,
+    "memberships": False,
+    "smart_no_shows": False,
+    "dynamic_pricing": False,
+    "ai_promotions": False,
+    "staff_utilization": False,
+    "offline_mode": False,
+    "data_export": False,
+    "voice_assistant": False,
+})
+
+# Legacy limit names and the names entitlements report them under
+LIMIT_RENAMES = MappingProxyType({
+    "locations_included": "locations",
+    "stylists_included": "stylists",
+})
+
+
+def _generation(*parts: Any) -> str:
+    """Fingerprint a catalog entry's definition; it changes whenever the definition does."""
+    content = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+class FeatureRegistry:
+    """Assigns every known feature a bit, so a set of features is one integer.
+
+    The default features take the low bits in their fixed order; features
+    that only appear in plan or addon definitions follow in the order they
+    were first seen. Assignment is append-only: a feature keeps its bit
+    once it has one, so masks encoded by an older registry still decode.
+    ``id`` fingerprints the assignment, so consumers holding an encoded
+    feature mask can tell which registry decodes it.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        self.names = tuple(names)
+        self.bits = MappingProxyType({name: 1 << index for index, name in enumerate(self.names)})
+        self.id = _generation(self.names)[:8]
+        self._decode = lru_cache(maxsize=1024)(self._decode_uncached)
+
+    @classmethod
+    def build(cls, plans: Iterable[Plan], addons: Iterable[Addon], known: Iterable[str] = ()) -> "FeatureRegistry":
+        """Build the registry for a catalog's plans and addons.
+
+        ``known`` is the order of a previous registry; those features keep
+        their bits, even once no plan or addon uses them, and new ones are
+        appended sorted by name.
+        """
+        names = list(dict.fromkeys([*DEFAULT_FEATURES, *known]))
+        extra = {name for plan in plans for name in plan.features_json}
+        extra.update(name for addon in addons for name, value in addon.effect_json.items() if isinstance(value, bool))
+        return cls([*names, *sorted(extra.difference(names))])
+
+    def masks(self, features: Mapping[str, Any]) -> Tuple[int, int]:
+        """Get the masks of features switched on and switched off; unknown names are ignored."""
+        on = off = 0
+        for name, value in features.items():
+            bit = self.bits.get(name)
+            if bit is None:
+                continue
+            if value:
+                on |= bit
+            else:
+                off |= bit
+        return on, off
+
+    def _decode_uncached(self, mask: int) -> Mapping[str, bool]:
+        return MappingProxyType({name: bool(mask & bit) for name, bit in self.bits.items()})
+
+    def decode(self, mask: int) -> dict[str, bool]:
+        """Expand a feature mask into a name -> enabled dict."""
+        return dict(self._decode(mask))
+
+    @staticmethod
+    def encode(mask: int) -> str:
+        """Encode a feature mask compactly, as hex; bit i is ``names[i]``."""
+        return format(mask, "x")
+
+
+DEFAULT_REGISTRY = FeatureRegistry(list(DEFAULT_FEATURES))
+
+
+@dataclass(frozen=True)
+class CatalogPlan:
+    """A plan with its limits in entitlement form and its features compiled to a mask."""
+
+    code: str
+    name: str
+    limits: Mapping[str, Any]
+    features: Mapping[str, Any]
+    feature_mask: int
+    overage_policy: Mapping[str, Any]
+    pricing_ref: Optional[str]
+    generation: str
+
+    @classmethod
+    def from_model(cls, plan: Plan, registry: FeatureRegistry = DEFAULT_REGISTRY) -> "CatalogPlan":
+        limits = {LIMIT_RENAMES.get(key, key): value for key, value in plan.limits_json.items()}
+        features = {**DEFAULT_FEATURES, **plan.features_json}
+        return cls(
+            code=plan.code,
+            name=plan.name,
+            limits=MappingProxyType(limits),
+            features=MappingProxyType(features),
+            feature_mask=registry.masks(features)[0],
+            overage_policy=MappingProxyType(dict(plan.overage_policy_json)),
+            pricing_ref=plan.pricing_ref,
+            generation=_generation(limits, features, plan.overage_policy_json, plan.pricing_ref),
+        )
+
+
+@dataclass(frozen=True)
+class CatalogAddon:
+    """An addon with the features it switches on or off."""
+
+    code: str
+    name: str
+    features: Mapping[str, bool]
+    features_on: int
+    features_off: int
+    pricing_ref: Optional[str]
+    generation: str
+
+    @classmethod
+    def from_model(cls, addon: Addon, registry: FeatureRegistry = DEFAULT_REGISTRY) -> "CatalogAddon":
+        # Only boolean effects apply to features
+        features = {key: value for key, value in addon.effect_json.items() if isinstance(value, bool)}
+        features_on, features_off = registry.masks(features)
+        return cls(
+            code=addon.code,
+            name=addon.name,
+            features=MappingProxyType(features),
+            features_on=features_on,
+            features_off=features_off,
+            pricing_ref=addon.pricing_ref,
+            generation=_generation(features, addon.pricing_ref),
+        )
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """An immutable view of every plan and addon at one catalog version."""
+
+    version: int
+    plans: Mapping[str, CatalogPlan]
+    addons: Mapping[str, CatalogAddon]
+    loaded_at: float
+    registry: FeatureRegistry = field(default=DEFAULT_REGISTRY)
+
+    @classmethod
+    def from_models(
+        cls,
+        version: int,
+        plans: Iterable[Plan],
+        addons: Iterable[Addon],
+        registry: Optional[FeatureRegistry] = None,
+    ) -> "CatalogSnapshot":
+        """Build a snapshot from plan and addon rows."""
+        registry = registry or FeatureRegistry.build(plans, addons)
+        return cls(
+            version=version,
+            plans=MappingProxyType({plan.code: CatalogPlan.from_model(plan, registry) for plan in plans}),
+            addons=MappingProxyType({addon.code: CatalogAddon.from_model(addon, registry) for addon in addons}),
+            loaded_at=time.time(),
+            registry=registry,
+        )
+
+    def dependencies(self, plan_code: str, addon_codes: Iterable[str]) -> dict[str, Any]:
+        """Record the generations of the catalog entries an entitlement was built from."""
+        return {
+            "version": self.version,
+            "registry": self.registry.id,
+            "plan": [plan_code, self.plans[plan_code].generation],
+            "addons": {code: self.addons[code].generation for code in addon_codes},
+        }
+
+    def is_current(self, dependencies: dict[str, Any]) -> bool:
+        """Check that an entitlement's catalog entries have not changed since it was built.
+
+        An entitlement built against a newer catalog than this replica has
+        loaded is trusted; this replica is the one that is behind. One built
+        with another feature registry is stale, since its features and mask
+        lack the features added since.
+        """
+        if dependencies.get("version", 0) > self.version:
+            return True
+        if dependencies.get("registry") != self.registry.id:
+            return False
+        plan_code, generation = dependencies["plan"]
+        plan = self.plans.get(plan_code)
+        if plan is None or plan.generation != generation:
+            return False
+        for code, generation in dependencies["addons"].items():
+            addon = self.addons.get(code)
+            if addon is None or addon.generation != generation:
+                return False
+        return True
+
+
+class Catalog:
+    """Process-wide plan and addon catalog.
+
+    Entitlement computation reads plans and addons from the current
+    snapshot instead of the database. Admin writes call ``invalidate``,
+    which reloads this process's snapshot and bumps the shared version in
+    Redis. Other replicas hear about the bump on a pub/sub channel, and
+    also compare versions every ``catalog_refresh_interval`` seconds in
+    case a message was missed. Without Redis, each process only sees its
+    own writes.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    @property
+    def version(self) -> Optional[int]:
+        return self._snapshot.version if self._snapshot else None
+
+    async def get(self, db: AsyncSession) -> CatalogSnapshot:
+        """Get the current snapshot, loading it on first use."""
+        if self._snapshot is None:
+            async with self._lock:
+                if self._snapshot is None:
+                    await self.load(db, await self._remote_version() or 0)
+        return self._snapshot
+
+    async def load(self, db: AsyncSession, version: int) -> CatalogSnapshot:
+        """Load every plan and addon into a new snapshot."""
+        plans = (await db.execute(select(Plan))).scalars().all()
+        addons = (await db.execute(select(Addon))).scalars().all()
+        registry = await self._registry(plans, addons)
+        self._snapshot = CatalogSnapshot.from_models(version, plans, addons, registry)
+        self.reloads += 1
+        logger.info(
+            "Catalog loaded: version=%s, plans=%d, addons=%d",
+            version, len(plans), len(addons),
+        )
+        return self._snapshot
+
+    async def invalidate(self, db: AsyncSession) -> None:
+        """Reload after a plan or addon write and tell the other replicas."""
+        version = await self._bump_remote_version()
+        if version is None:
+            version = (self.version or 0) + 1
+        async with self._lock:
+            await self.load(db, version)
+        try:
+            redis_client = await get_redis()
+            await redis_client.publish(CATALOG_CHANNEL, version)
+        except Exception as e:
+            logger.warning("Catalog change publish failed: %s", e)
+
+    def clear(self) -> None:
+        """Drop the snapshot; the next ``get`` reloads it."""
+        self._snapshot = None
+
+    async def _registry(self, plans: Sequence[Plan], addons: Sequence[Addon]) -> FeatureRegistry:
+        """Build the feature registry, keeping every bit already assigned.
+
+        The feature order is shared in Redis so replicas agree on it; new
+        features are appended there and the list is read back, so replicas
+        racing to add features settle on the first order written. Without
+        Redis, the order of this process's previous registry is kept.
+        """
+        known = self._snapshot.registry.names if self._snapshot else ()
+        try:
+            redis_client = await get_redis()
+            shared = list(dict.fromkeys(await redis_client.lrange(CATALOG_FEATURES_KEY, 0, -1)))
+            registry = FeatureRegistry.build(plans, addons, [*shared, *known])
+            new = [name for name in registry.names if name not in shared]
+            if not new:
+                return registry
+            await redis_client.rpush(CATALOG_FEATURES_KEY, *new)
+            shared = await redis_client.lrange(CATALOG_FEATURES_KEY, 0, -1)
+            return FeatureRegistry.build(plans, addons, [*shared, *known])
+        except Exception as e:
+            logger.warning("Shared feature order unavailable: %s", e)
+            return FeatureRegistry.build(plans, addons, known)
+
+    async def _remote_version(self) -> Optional[int]:
+        """Get the shared catalog version, or None if Redis is unavailable."""
+        try:
+            redis_client = await get_redis()
+            return int(await redis_client.get(CATALOG_VERSION_KEY) or 0)
+        except Exception:
+            return None
+
+    async def _bump_remote_version(self) -> Optional[int]:
+        """Increment the shared catalog version, or None if Redis is unavailable."""
+        try:
+            redis_client = await get_redis()
+            return int(await redis_client.incr(CATALOG_VERSION_KEY))
+        except Exception as e:
+            logger.warning("Catalog version bump failed: %s", e)
+            return None
+
+    async def refresh_if_stale(self) -> None:
+        """Reload when another replica has bumped the shared version."""
+        version = await self._remote_version()
+        if version is None or version == self.version:
+            return
+        async with self._lock:
+            if version != self.version:
+                async with SessionLocal() as db:
+                    await self.load(db, version)
+
+    async def _watch(self) -> None:
+        """Reload on change notifications, checking the version on every timeout."""
+        while True:
+            try:
+                redis_client = await get_redis()
+                async with redis_client.pubsub() as pubsub:
+                    await pubsub.subscribe(CATALOG_CHANNEL)
+                    while True:
+                        await pubsub.get_message(
+                            ignore_subscribe_messages=True,
+                            timeout=settings.catalog_refresh_interval,
+                        )
+                        await self.refresh_if_stale()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Catalog watch failed: %s", e)
+                await asyncio.sleep(settings.catalog_refresh_interval)
+
+    async def start(self) -> None:
+        """Load the snapshot and start watching for changes."""
+        async with SessionLocal() as db:
+            await self.get(db)
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Stop watching for changes."""
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+# Global catalog instance
+catalog = Catalog()
@@ -1,41 +1,135 @@
 """Pricing service client for optional price resolution."""
 
+import asyncio
+import re
 import httpx
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+from app.cache import LocalCache, get_cached_prices, set_cached_prices
 from app.config import settings
 
+# Refs pinned to a pricebook version, e.g. pricebook/plans/gold@v2; their price never changes
+VERSIONED_REF = re.compile(r"@v\d+$")
+
+Fetcher = Callable[[List[str]], Awaitable[Dict[str, Optional[Dict[str, Any]]]]]
+
+
+def is_versioned(ref: str) -> bool:
+    """Check whether a pricing reference is pinned to a version."""
+    return bool(VERSIONED_REF.search(ref))
+
+
+def _to_dollars(price_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convert cents to dollars if the pricing service returns cents."""
+    if price_data and "amount_cents" in price_data:
+        price_data["amount_dollars"] = price_data["amount_cents"] / 100.0
+        del price_data["amount_cents"]
+    return price_data
+
 
 class PricingClient:
-    """Client for the Pricing service."""
+    """Client for the Pricing service.
+    
+    Resolved prices are cached in process and in Redis. Versioned refs
+    are kept until evicted; unversioned ones for
+    ``price_cache_unversioned_ttl`` seconds. Only refs found in neither
+    cache go to the pricing service, and a ref already being fetched is
+    awaited rather than fetched again. Failed lookups are not cached.
+    """
     
     def __init__(self):
         self.base_url = settings.pricing_base_url
         self.client = httpx.AsyncClient(timeout=10.0) if self.base_url else None
+        self.local_cache = LocalCache(settings.price_cache_size)
+        self._in_flight: Dict[str, asyncio.Future] = {}
     
     async def resolve_ref(self, ref: str) -> Optional[Dict[str, Any]]:
         """Resolve a single pricing reference."""
         if not self.base_url or not self.client:
             return None
         
-        try:
-            response = await self.client.get(f"{self.base_url}/v1/resolve", params={"ref": ref})
-            response.raise_for_status()
-            data = response.json()
-            
-            # Convert cents to dollars if the pricing service returns cents
-            if "amount_cents" in data:
-                data["amount_dollars"] = data["amount_cents"] / 100.0
-                del data["amount_cents"]
-            
-            return data
-        except (httpx.RequestError, httpx.HTTPStatusError):
-            return None
+        prices = await self._resolve([ref], self._fetch_ref)
+        return prices[ref]
     
     async def resolve_refs_batch(self, refs: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
         """Resolve multiple pricing references in batch."""
         if not self.base_url or not self.client:
             return {ref: None for ref in refs}
         
+        return await self._resolve(refs, self._fetch_refs)
+    
+    async def _resolve(self, refs: List[str], fetch: Fetcher) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Resolve refs from the caches, joining in-flight lookups and fetching the rest."""
+        prices: Dict[str, Optional[Dict[str, Any]]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing = []
+        for ref in dict.fromkeys(ref for ref in refs if ref):
+            price = self.local_cache.get(ref)
+            if price is not None:
+                prices[ref] = price
+            elif ref in self._in_flight:
+                waiting[ref] = self._in_flight[ref]
+            else:
+                missing.append(ref)
+        
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {ref: loop.create_future() for ref in missing}
+            self._in_flight.update(futures)
+            fetched: Dict[str, Optional[Dict[str, Any]]] = {}
+            try:
+                fetched = await self._load(missing, fetch)
+            finally:
+                for ref, future in futures.items():
+                    del self._in_flight[ref]
+                    future.set_result(fetched.get(ref))
+            prices.update(fetched)
+        
+        if waiting:
+            results = await asyncio.gather(*[asyncio.shield(future) for future in waiting.values()])
+            prices.update(zip(waiting, results))
+        
+        # Callers get their own copies of cached prices
+        return {ref: dict(prices[ref]) if prices.get(ref) else None for ref in refs}
+    
+    async def _load(self, refs: List[str], fetch: Fetcher) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Load refs from Redis, then from the pricing service, filling both caches."""
+        prices: Dict[str, Optional[Dict[str, Any]]] = dict(await get_cached_prices(refs))
+        for ref, price in prices.items():
+            self._cache_locally(ref, price)
+        
+        unseen = [ref for ref in refs if ref not in prices]
+        if not unseen:
+            return prices
+        
+        fetched = await fetch(unseen)
+        resolved = {ref: price for ref, price in fetched.items() if price}
+        for ref, price in resolved.items():
+            self._cache_locally(ref, price)
+        await set_cached_prices({ref: price for ref, price in resolved.items() if is_versioned(ref)})
+        await set_cached_prices(
+            {ref: price for ref, price in resolved.items() if not is_versioned(ref)},
+            ttl=settings.price_cache_unversioned_ttl,
+        )
+        
+        prices.update(fetched)
+        return prices
+    
+    def _cache_locally(self, ref: str, price: Dict[str, Any]) -> None:
+        ttl = None if is_versioned(ref) else settings.price_cache_unversioned_ttl
+        self.local_cache.set(ref, price, ttl)
+    
+    async def _fetch_ref(self, refs: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch one pricing reference from the pricing service."""
+        ref = refs[0]
+        try:
+            response = await self.client.get(f"{self.base_url}/v1/resolve", params={"ref": ref})
+            response.raise_for_status()
+            return {ref: _to_dollars(response.json())}
+        except (httpx.RequestError, httpx.HTTPStatusError):
+            return {ref: None}
+    
+    async def _fetch_refs(self, refs: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch pricing references from the pricing service in one batch call."""
         try:
             response = await self.client.post(f"{self.base_url}/v1/resolve-batch", json={"refs": refs})
             response.raise_for_status()
@@ -43,10 +137,8 @@ class PricingClient:
             prices = data.get("prices", {ref: None for ref in refs})
             
             # Convert cents to dollars for all resolved prices
-            for ref, price_data in prices.items():
-                if price_data and "amount_cents" in price_data:
-                    price_data["amount_dollars"] = price_data["amount_cents"] / 100.0
-                    del price_data["amount_cents"]
+            for price_data in prices.values():
+                _to_dollars(price_data)
             
             return prices
         except (httpx.RequestError, httpx.HTTPStatusError):
@@ -29,9 +29,23 @@ class Settings(BaseSettings):
     # Cache settings
     cache_ttl_seconds: int = Field(default=900, env="CACHE_TTL_SECONDS")
     
+    # Most tenants one POST /entitlements/batch request may ask for
+    entitlements_batch_max_tenants: int = Field(default=500, env="ENTITLEMENTS_BATCH_MAX_TENANTS")
+    
+    # Plan/addon catalog: seconds between version checks against Redis
+    catalog_refresh_interval: float = Field(default=30, env="CATALOG_REFRESH_INTERVAL")
+    
+    # Recompute cached entitlements for affected tenants after a plan/addon update
+    catalog_rewarm_enabled: bool = Field(default=False, env="CATALOG_REWARM_ENABLED")
+    catalog_rewarm_batch_size: int = Field(default=500, env="CATALOG_REWARM_BATCH_SIZE")
+    
     # Pricing service
     pricing_base_url: Optional[str] = Field(default=None, env="PRICING_BASE_URL")
     
+    # Resolved prices: in-process entries, and seconds to keep unversioned refs (versioned refs never change)
+    price_cache_size: int = Field(default=10000, env="PRICE_CACHE_SIZE")
+    price_cache_unversioned_ttl: int = Field(default=60, env="PRICE_CACHE_UNVERSIONED_TTL")
+    
     # Auth settings
     admin_role_header: str = Field(default="X-Internal-Role", env="ADMIN_ROLE_HEADER")
     internal_service_header: str = Field(
@@ -1,21 +1,26 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine, MetaData
+from sqlalchemy import MetaData
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
 
-# Create engine
-engine = create_engine(
+# Create async engine
+engine = create_async_engine(
     settings.database_url,
     echo=settings.env == "development",
     pool_pre_ping=True,
     pool_recycle=300,
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory; objects stay usable after commit without a reload
+SessionLocal = async_sessionmaker(
+    engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -24,10 +29,7 @@ Base = declarative_base()
 metadata = MetaData()
 
 
-def get_db():
+async def get_db():
     """Get database session."""
-    db = SessionLocal()
-    try:
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
 from app.db import engine, Base
 from app.cache import close_redis
+from app.catalog import catalog
 from app.routers import (
     health_router,
     admin_plans_router,
@@ -37,14 +38,20 @@ async def lifespan(app: FastAPI):
     
     # Create database tables (skip in test mode)
     if settings.env != "test":
-        Base.metadata.create_all(bind=engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created/verified")
+        
+        # Load the plan/addon catalog and follow changes from other replicas
+        await catalog.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Rules Service...")
+    await catalog.stop()
     await close_redis()
+    await engine.dispose()
     logger.info("Rules Service shutdown complete")
 
 
@@ -1,13 +1,16 @@
 """Admin addons router for CRUD operations."""
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.db import get_db
+from app.catalog import catalog
+from app.config import settings
 from app.deps import require_admin
 from app.services.addon_service import AddonService
+from app.services.entitlement_service import rewarm_entitlements
 from app.schemas.addon import AddonCreate, AddonUpdate, AddonResponse, AddonList
 
 router = APIRouter(prefix="/admin/addons", tags=["admin"])
@@ -16,13 +19,14 @@ router = APIRouter(prefix="/admin/addons", tags=["admin"])
 @router.post("/", response_model=AddonResponse, status_code=status.HTTP_201_CREATED)
 async def create_addon(
     addon_data: AddonCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_admin),
 ):
     """Create a new addon."""
     service = AddonService(db)
     try:
-        addon = service.create_addon(addon_data)
+        addon = await service.create_addon(addon_data)
+        await catalog.invalidate(db)
         return addon
     except IntegrityError:
         raise HTTPException(
@@ -35,24 +39,24 @@ async def create_addon(
 async def list_addons(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_admin),
 ):
     """List all addons."""
     service = AddonService(db)
-    addons = service.get_addons(skip=skip, limit=limit)
+    addons = await service.get_addons(skip=skip, limit=limit)
     return AddonList(addons=addons, total=len(addons))
 
 
 @router.get("/{code}", response_model=AddonResponse)
 async def get_addon(
     code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_admin),
 ):
     """Get an addon by code."""
     service = AddonService(db)
-    addon = service.get_addon(code)
+    addon = await service.get_addon(code)
     if not addon:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -65,30 +69,34 @@ async def get_addon(
 async def update_addon(
     code: str,
     addon_data: AddonUpdate,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_admin),
 ):
     """Update an addon."""
     service = AddonService(db)
-    addon = service.update_addon(code, addon_data)
+    addon = await service.update_addon(code, addon_data)
     if not addon:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Addon not found",
         )
+    await catalog.invalidate(db)
+    if settings.catalog_rewarm_enabled:
+        background_tasks.add_task(rewarm_entitlements, addon_code=code)
     return addon
 
 
 @router.delete("/{code}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_addon(
     code: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_admin),
 ):
     """Delete an addon."""
     service = AddonService(db)
     try:
-        success = service.delete_addon(code)
+        success = await service.delete_addon(code)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -99,3 +107,5 @@ async def delete_addon(
             status_code=status.HTTP_409_CONFLICT,
             detail="Cannot delete addon that is in use by tenants",
         )
+    
+    await catalog.invalidate(db)
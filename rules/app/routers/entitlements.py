@@ -1,67 +1,131 @@
 """Entitlements router for computing and caching entitlements."""
 
 import json
-from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
+from app.catalog import catalog
+from app.config import settings
 from app.deps import require_internal_service
 from app.services.entitlement_service import EntitlementService
 from app.services.cache_service import CacheService
-from app.schemas.entitlements import EntitlementsResponse
+from app.schemas.entitlements import (
+    EntitlementsResponse,
+    EntitlementsBatchRequest,
+    EntitlementsBatchResponse,
+    FeatureRegistryResponse,
+)
 
 router = APIRouter(prefix="/entitlements", tags=["entitlements"])
 
 
-def serialize_datetime(obj):
-    """Serialize datetime objects to ISO format strings."""
-    if hasattr(obj, 'isoformat'):
-        return obj.isoformat()
-    return obj
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
+
+
+@router.get("/feature-registry", response_model=FeatureRegistryResponse)
+async def get_feature_registry(
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(require_internal_service),
+):
+    """Get the feature names behind each bit of an entitlement feature mask."""
+    snapshot = await catalog.get(db)
+    return FeatureRegistryResponse(id=snapshot.registry.id, features=list(snapshot.registry.names))
 
 
 @router.get("/{tenant_id}", response_model=EntitlementsResponse)
 async def get_entitlements(
     tenant_id: str,
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_internal_service),
 ):
-    """Get computed entitlements for a tenant."""
+    """Get computed entitlements for a tenant.
+    
+    Cache hits return the stored response body and ETag as they are. A
+    request whose If-None-Match matches gets a 304 with no body.
+    """
     cache_service = CacheService()
+    snapshot = await catalog.get(db)
     
     # Try to get from cache first
-    cached_data = await cache_service.get_entitlements(tenant_id)
-    if cached_data:
-        # Calculate ETag for cached data
-        etag = cache_service.calculate_etag(cached_data)
-        return Response(
-            content=json.dumps(cached_data, default=serialize_datetime),
-            media_type="application/json",
-            headers={"ETag": etag}
-        )
-    
-    # Compute entitlements
-    try:
-        entitlement_service = EntitlementService(db)
-        entitlements = entitlement_service.compute_entitlements(tenant_id)
-        
-        # Convert to dict for caching
-        entitlements_dict = entitlements.model_dump()
-        
-        # Cache the result
-        await cache_service.set_entitlements(tenant_id, entitlements_dict)
-        
-        # Calculate ETag
-        etag = cache_service.calculate_etag(entitlements_dict)
-        
-        return Response(
-            content=json.dumps(entitlements_dict, default=serialize_datetime),
-            media_type="application/json",
-            headers={"ETag": etag}
-        )
+    entry = await cache_service.get_entitlements(tenant_id, snapshot)
+    if not entry:
+        # Compute entitlements
+        try:
+            entitlement_service = EntitlementService(db)
+            entitlements = await entitlement_service.compute_entitlements(tenant_id)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=str(e),
+            )
         
-    except ValueError as e:
+        # Render and cache the response
+        entry = await cache_service.set_entitlements(tenant_id, entitlements.model_dump(), snapshot)
+    
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": entry.etag})
+    
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers={"ETag": entry.etag}
+    )
+
+
+@router.post("/batch", response_model=EntitlementsBatchResponse)
+async def get_entitlements_batch(
+    batch: EntitlementsBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    _: str = Depends(require_internal_service),
+):
+    """Get computed entitlements for many tenants.
+    
+    Cached entitlements are read with one MGET; the misses are computed
+    together with one query and written back in one pipeline. Tenants
+    that cannot be computed are reported under ``errors``.
+    """
+    tenant_ids = list(dict.fromkeys(batch.tenant_ids))
+    if len(tenant_ids) > settings.entitlements_batch_max_tenants:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e),
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.entitlements_batch_max_tenants} tenant IDs per request",
         )
+    
+    cache_service = CacheService()
+    snapshot = await catalog.get(db)
+    
+    entries = await cache_service.get_entitlements_many(tenant_ids, snapshot)
+    misses = [tenant_id for tenant_id in tenant_ids if tenant_id not in entries]
+    
+    computed, errors = await EntitlementService(db).compute_entitlements_many(misses)
+    entries.update(await cache_service.set_entitlements_many(
+        {tenant_id: item.model_dump() for tenant_id, item in computed.items()},
+        snapshot,
+    ))
+    
+    # Splice the stored bodies into the response rather than re-serializing them
+    results = ",".join(
+        f'{json.dumps(tenant_id)}:{{"etag":"{entries[tenant_id].etag}","entitlements":{entries[tenant_id].body}}}'
+        for tenant_id in tenant_ids
+        if tenant_id in entries
+    )
+    return Response(
+        content=f'{{"results":{{{results}}},"errors":{json.dumps(errors)}}}',
+        media_type="application/json",
+    )
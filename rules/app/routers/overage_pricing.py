@@ -1,11 +1,16 @@
 """Overage pricing router for managing overage pricing references."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
 from app.deps import require_internal_service
-from app.services.entitlement_service import EntitlementService
+from app.services.entitlement_service import (
+    DEFAULT_PER_LOCATION_REF,
+    DEFAULT_PER_STYLIST_REF,
+    EntitlementService,
+)
 from app.schemas.overage_pricing import OveragePriceRefsUpdate, OveragePriceRefsResponse
 from app.models.overage_price_refs import OveragePriceRefs
 from app.cache import delete_cached_entitlements
@@ -18,14 +23,14 @@ router = APIRouter(prefix="/tenants", tags=["tenant"])
 async def update_overage_pricing_refs(
     tenant_id: str,
     refs_data: OveragePriceRefsUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_internal_service),
 ):
     """Update tenant overage pricing references."""
     entitlement_service = EntitlementService(db)
     
     # Ensure tenant has a plan
-    tenant_plan = entitlement_service.get_tenant_plan(tenant_id)
+    tenant_plan = await entitlement_service.get_tenant_plan(tenant_id)
     if not tenant_plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -33,15 +38,16 @@ async def update_overage_pricing_refs(
         )
     
     # Get or create overage refs
-    overage_refs = db.query(OveragePriceRefs).filter(
-        OveragePriceRefs.tenant_id == tenant_id
-    ).first()
+    result = await db.execute(
+        select(OveragePriceRefs).where(OveragePriceRefs.tenant_id == tenant_id)
+    )
+    overage_refs = result.scalars().first()
     
     if not overage_refs:
         overage_refs = OveragePriceRefs(
             tenant_id=tenant_id,
-            per_stylist_ref="pricebook/overage/stylist@v1",
-            per_location_ref="pricebook/overage/location@v1"
+            per_stylist_ref=DEFAULT_PER_STYLIST_REF,
+            per_location_ref=DEFAULT_PER_LOCATION_REF,
         )
         db.add(overage_refs)
     
@@ -55,9 +61,9 @@ async def update_overage_pricing_refs(
     # Bump version
     tenant_plan.version += 1
     
-    db.commit()
-    db.refresh(overage_refs)
-    db.refresh(tenant_plan)
+    await db.commit()
+    await db.refresh(overage_refs)
+    await db.refresh(tenant_plan)
     
     # Bust cache
     await delete_cached_entitlements(tenant_id)
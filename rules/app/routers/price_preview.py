@@ -1,7 +1,7 @@
 """Price preview router for optional pricing integration."""
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.db import get_db
@@ -18,7 +18,7 @@ async def get_price_preview(
     tenant_id: str,
     stylists: Optional[int] = Query(None, description="Number of stylists for overage calculation"),
     locations: Optional[int] = Query(None, description="Number of locations for overage calculation"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_internal_service),
 ):
     """Get price preview for a tenant."""
@@ -26,7 +26,7 @@ async def get_price_preview(
     
     # Get entitlements
     try:
-        entitlements = entitlement_service.compute_entitlements(tenant_id)
+        entitlements = await entitlement_service.compute_entitlements(tenant_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,7 +1,8 @@
 """Tenant addons router for addon assignments."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
 from app.deps import require_internal_service
@@ -19,14 +20,14 @@ router = APIRouter(prefix="/tenants", tags=["tenant"])
 async def update_tenant_addons(
     tenant_id: str,
     addon_data: TenantAddonUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_internal_service),
 ):
     """Update tenant addon assignments."""
     entitlement_service = EntitlementService(db)
     
     # Ensure tenant has a plan
-    tenant_plan = entitlement_service.get_tenant_plan(tenant_id)
+    tenant_plan = await entitlement_service.get_tenant_plan(tenant_id)
     if not tenant_plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -41,7 +42,7 @@ async def update_tenant_addons(
         addon_service = AddonService(db)
         for addon_code in addon_data.add:
             # Verify addon exists
-            addon = addon_service.get_addon(addon_code)
+            addon = await addon_service.get_addon(addon_code)
             if not addon:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -49,10 +50,13 @@ async def update_tenant_addons(
                 )
             
             # Check if already exists
-            existing = db.query(TenantAddon).filter(
-                TenantAddon.tenant_id == tenant_id,
-                TenantAddon.addon_code == addon_code
-            ).first()
+            result = await db.execute(
+                select(TenantAddon).where(
+                    TenantAddon.tenant_id == tenant_id,
+                    TenantAddon.addon_code == addon_code,
+                )
+            )
+            existing = result.scalars().first()
             
             if not existing:
                 tenant_addon = TenantAddon(
@@ -69,13 +73,16 @@ async def update_tenant_addons(
     # Handle remove operations
     if addon_data.remove:
         for addon_code in addon_data.remove:
-            existing = db.query(TenantAddon).filter(
-                TenantAddon.tenant_id == tenant_id,
-                TenantAddon.addon_code == addon_code
-            ).first()
+            result = await db.execute(
+                select(TenantAddon).where(
+                    TenantAddon.tenant_id == tenant_id,
+                    TenantAddon.addon_code == addon_code,
+                )
+            )
+            existing = result.scalars().first()
             
             if existing:
-                db.delete(existing)
+                await db.delete(existing)
                 changes[f"removed_{addon_code}"] = True
                 version_bumped = True
     
@@ -84,17 +91,20 @@ async def update_tenant_addons(
         for item in addon_data.upsert:
             # Verify addon exists
             addon_service = AddonService(db)
-            addon = addon_service.get_addon(item.code)
+            addon = await addon_service.get_addon(item.code)
             if not addon:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail=f"Addon {item.code} not found",
                 )
             
-            existing = db.query(TenantAddon).filter(
-                TenantAddon.tenant_id == tenant_id,
-                TenantAddon.addon_code == item.code
-            ).first()
+            result = await db.execute(
+                select(TenantAddon).where(
+                    TenantAddon.tenant_id == tenant_id,
+                    TenantAddon.addon_code == item.code,
+                )
+            )
+            existing = result.scalars().first()
             
             if existing:
                 # Update existing
@@ -120,8 +130,8 @@ async def update_tenant_addons(
     if version_bumped:
         tenant_plan.version += 1
     
-    db.commit()
-    db.refresh(tenant_plan)
+    await db.commit()
+    await db.refresh(tenant_plan)
     
     # Bust cache
     await delete_cached_entitlements(tenant_id)
@@ -131,7 +141,7 @@ async def update_tenant_addons(
         await emit_addon_changed(tenant_id, changes)
     
     # Return current assignments
-    tenant_addons = entitlement_service.get_tenant_addons(tenant_id)
+    tenant_addons = await entitlement_service.get_tenant_addons(tenant_id)
     addons_data = []
     for addon in tenant_addons:
         addons_data.append({
@@ -140,7 +150,7 @@ async def update_tenant_addons(
             "meta": addon.meta_json,
         })
     
-    overrides = entitlement_service.get_tenant_overrides(tenant_id)
+    overrides = await entitlement_service.get_tenant_overrides(tenant_id)
     overrides_data = {override.key: override.value_json for override in overrides}
     
     return TenantAssignmentsResponse(
@@ -1,7 +1,8 @@
 """Tenant overrides router for limit overrides."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
 from app.deps import require_internal_service
@@ -18,14 +19,14 @@ router = APIRouter(prefix="/tenants", tags=["tenant"])
 async def update_tenant_overrides(
     tenant_id: str,
     override_data: TenantLimitOverrideUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_internal_service),
 ):
     """Update tenant limit overrides."""
     entitlement_service = EntitlementService(db)
     
     # Ensure tenant has a plan
-    tenant_plan = entitlement_service.get_tenant_plan(tenant_id)
+    tenant_plan = await entitlement_service.get_tenant_plan(tenant_id)
     if not tenant_plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,10 +49,13 @@ async def update_tenant_overrides(
             value = item["value"]
             
             # Find existing override
-            existing = db.query(TenantLimitOverride).filter(
-                TenantLimitOverride.tenant_id == tenant_id,
-                TenantLimitOverride.key == key
-            ).first()
+            result = await db.execute(
+                select(TenantLimitOverride).where(
+                    TenantLimitOverride.tenant_id == tenant_id,
+                    TenantLimitOverride.key == key,
+                )
+            )
+            existing = result.scalars().first()
             
             if existing:
                 # Update existing
@@ -72,13 +76,16 @@ async def update_tenant_overrides(
     # Handle remove operations
     if override_data.remove:
         for key in override_data.remove:
-            existing = db.query(TenantLimitOverride).filter(
-                TenantLimitOverride.tenant_id == tenant_id,
-                TenantLimitOverride.key == key
-            ).first()
+            result = await db.execute(
+                select(TenantLimitOverride).where(
+                    TenantLimitOverride.tenant_id == tenant_id,
+                    TenantLimitOverride.key == key,
+                )
+            )
+            existing = result.scalars().first()
             
             if existing:
-                db.delete(existing)
+                await db.delete(existing)
                 changes[f"removed_{key}"] = True
                 version_bumped = True
     
@@ -86,8 +93,8 @@ async def update_tenant_overrides(
     if version_bumped:
         tenant_plan.version += 1
     
-    db.commit()
-    db.refresh(tenant_plan)
+    await db.commit()
+    await db.refresh(tenant_plan)
     
     # Bust cache
     await delete_cached_entitlements(tenant_id)
@@ -97,7 +104,7 @@ async def update_tenant_overrides(
         await emit_addon_changed(tenant_id, changes)
     
     # Return current assignments
-    tenant_addons = entitlement_service.get_tenant_addons(tenant_id)
+    tenant_addons = await entitlement_service.get_tenant_addons(tenant_id)
     addons_data = []
     for addon in tenant_addons:
         addons_data.append({
@@ -106,7 +113,7 @@ async def update_tenant_overrides(
             "meta": addon.meta_json,
         })
     
-    overrides = entitlement_service.get_tenant_overrides(tenant_id)
+    overrides = await entitlement_service.get_tenant_overrides(tenant_id)
     overrides_data = {override.key: override.value_json for override in overrides}
     
     return TenantAssignmentsResponse(
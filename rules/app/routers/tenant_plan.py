@@ -1,7 +1,7 @@
 """Tenant plan router for plan assignments."""
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db import get_db
 from app.deps import require_internal_service
@@ -19,13 +19,13 @@ router = APIRouter(prefix="/tenants", tags=["tenant"])
 async def update_tenant_plan(
     tenant_id: str,
     plan_data: TenantPlanUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_internal_service),
 ):
     """Update tenant plan assignment."""
     # Verify plan exists
     plan_service = PlanService(db)
-    plan = plan_service.get_plan(plan_data.plan_code)
+    plan = await plan_service.get_plan(plan_data.plan_code)
     if not plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,7 +34,7 @@ async def update_tenant_plan(
     
     # Get current plan for event emission
     entitlement_service = EntitlementService(db)
-    current_plan = entitlement_service.get_tenant_plan(tenant_id)
+    current_plan = await entitlement_service.get_tenant_plan(tenant_id)
     old_plan_code = current_plan.plan_code if current_plan else None
     
     # Update or create tenant plan
@@ -54,8 +54,8 @@ async def update_tenant_plan(
         )
         db.add(current_plan)
     
-    db.commit()
-    db.refresh(current_plan)
+    await db.commit()
+    await db.refresh(current_plan)
     
     # Bust cache
     await delete_cached_entitlements(tenant_id)
@@ -82,14 +82,14 @@ async def update_tenant_plan(
 @router.get("/{tenant_id}/assignments", response_model=TenantAssignmentsResponse)
 async def get_tenant_assignments(
     tenant_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     _: str = Depends(require_internal_service),
 ):
     """Get current tenant assignments."""
     entitlement_service = EntitlementService(db)
     
     # Get tenant plan
-    tenant_plan = entitlement_service.get_tenant_plan(tenant_id)
+    tenant_plan = await entitlement_service.get_tenant_plan(tenant_id)
     if not tenant_plan:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,7 +97,7 @@ async def get_tenant_assignments(
         )
     
     # Get tenant addons
-    tenant_addons = entitlement_service.get_tenant_addons(tenant_id)
+    tenant_addons = await entitlement_service.get_tenant_addons(tenant_id)
     addons_data = []
     for addon in tenant_addons:
         addons_data.append({
@@ -107,7 +107,7 @@ async def get_tenant_assignments(
         })
     
     # Get overrides
-    overrides = entitlement_service.get_tenant_overrides(tenant_id)
+    overrides = await entitlement_service.get_tenant_overrides(tenant_id)
     overrides_data = {override.key: override.value_json for override in overrides}
     
     return TenantAssignmentsResponse(
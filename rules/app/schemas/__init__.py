@@ -3,7 +3,13 @@
 from .plan import PlanCreate, PlanUpdate, PlanResponse, PlanList
 from .addon import AddonCreate, AddonUpdate, AddonResponse, AddonList
 from .tenant import TenantPlanUpdate, TenantAddonUpdate, TenantAssignmentsResponse
-from .entitlements import EntitlementsResponse
+from .entitlements import (
+    EntitlementsResponse,
+    EntitlementsBatchRequest,
+    EntitlementsBatchItem,
+    EntitlementsBatchResponse,
+    FeatureRegistryResponse,
+)
 
 __all__ = [
     "PlanCreate",
@@ -18,4 +24,8 @@ __all__ = [
     "TenantAddonUpdate",
     "TenantAssignmentsResponse",
     "EntitlementsResponse",
+    "EntitlementsBatchRequest",
+    "EntitlementsBatchItem",
+    "EntitlementsBatchResponse",
+    "FeatureRegistryResponse",
 ]
@@ -1,7 +1,7 @@
 """Entitlements schema for API responses."""
 
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -11,6 +11,12 @@ class EntitlementsResponse(BaseModel):
     plan: str = Field(..., description="Plan code")
     limits: Dict[str, Any] = Field(..., description="Computed limits")
     features: Dict[str, Any] = Field(..., description="Computed features")
+    feature_mask: Optional[str] = Field(
+        None, description="Enabled features as a hex bitmask; bit i is feature i of the registry"
+    )
+    feature_registry: Optional[str] = Field(
+        None, description="ID of the feature registry that decodes feature_mask"
+    )
     overage_policy: Dict[str, Any] = Field(..., description="Overage policy")
     pricing_refs: Dict[str, Any] = Field(..., description="Pricing references")
     version: int = Field(..., description="Version number")
@@ -55,3 +61,26 @@ class EntitlementsResponse(BaseModel):
                 "ttl_hint_sec": 900
             }
         }
+
+
+class EntitlementsBatchRequest(BaseModel):
+    """Schema for a batch entitlements request."""
+    tenant_ids: List[str] = Field(..., min_length=1, description="Tenant IDs to get entitlements for")
+
+
+class EntitlementsBatchItem(BaseModel):
+    """Entitlements for one tenant in a batch response."""
+    etag: str = Field(..., description="ETag of the tenant's entitlements")
+    entitlements: EntitlementsResponse = Field(..., description="Computed entitlements")
+
+
+class EntitlementsBatchResponse(BaseModel):
+    """Schema for a batch entitlements response."""
+    results: Dict[str, EntitlementsBatchItem] = Field(..., description="Entitlements by tenant ID")
+    errors: Dict[str, str] = Field(default_factory=dict, description="Errors by tenant ID")
+
+
+class FeatureRegistryResponse(BaseModel):
+    """Schema for the feature registry that decodes entitlement feature masks."""
+    id: str = Field(..., description="Feature registry ID")
+    features: List[str] = Field(..., description="Feature names; feature i is bit i of a feature mask")
@@ -1,7 +1,8 @@
 """Addon service for managing addon features."""
 
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.models.addon import Addon
@@ -12,53 +13,61 @@ from app.schemas.addon import AddonCreate, AddonUpdate
 class AddonService:
     """Service for managing addons."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_addon(self, addon_data: AddonCreate) -> Addon:
+    async def create_addon(self, addon_data: AddonCreate) -> Addon:
         """Create a new addon."""
         addon = Addon(**addon_data.model_dump())
         self.db.add(addon)
-        self.db.commit()
-        self.db.refresh(addon)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+        await self.db.refresh(addon)
         return addon
     
-    def get_addon(self, code: str) -> Optional[Addon]:
+    async def get_addon(self, code: str) -> Optional[Addon]:
         """Get addon by code."""
-        return self.db.query(Addon).filter(Addon.code == code).first()
+        result = await self.db.execute(select(Addon).where(Addon.code == code))
+        return result.scalars().first()
     
-    def get_addons(self, skip: int = 0, limit: int = 100) -> List[Addon]:
+    async def get_addons(self, skip: int = 0, limit: int = 100) -> List[Addon]:
         """Get list of addons."""
-        return self.db.query(Addon).offset(skip).limit(limit).all()
+        result = await self.db.execute(select(Addon).offset(skip).limit(limit))
+        return list(result.scalars().all())
     
-    def update_addon(self, code: str, addon_data: AddonUpdate) -> Optional[Addon]:
+    async def update_addon(self, code: str, addon_data: AddonUpdate) -> Optional[Addon]:
         """Update an addon."""
-        addon = self.get_addon(code)
+        addon = await self.get_addon(code)
         if not addon:
             return None
         
         for field, value in addon_data.model_dump().items():
             setattr(addon, field, value)
         
-        self.db.commit()
-        self.db.refresh(addon)
+        await self.db.commit()
+        await self.db.refresh(addon)
         return addon
     
-    def delete_addon(self, code: str) -> bool:
+    async def delete_addon(self, code: str) -> bool:
         """Delete an addon."""
-        addon = self.get_addon(code)
+        addon = await self.get_addon(code)
         if not addon:
             return False
         
         # Check if addon is in use
-        tenant_addon = self.db.query(TenantAddon).filter(TenantAddon.addon_code == code).first()
-        if tenant_addon:
+        if await self.is_addon_in_use(code):
             raise IntegrityError("Addon is in use by tenants", None, None)
         
-        self.db.delete(addon)
-        self.db.commit()
+        await self.db.delete(addon)
+        await self.db.commit()
         return True
     
-    def is_addon_in_use(self, code: str) -> bool:
+    async def is_addon_in_use(self, code: str) -> bool:
         """Check if addon is in use by any tenant."""
-        return self.db.query(TenantAddon).filter(TenantAddon.addon_code == code).first() is not None
+        result = await self.db.execute(
+            select(TenantAddon.id).where(TenantAddon.addon_code == code).limit(1)
+        )
+        return result.first() is not None
@@ -2,15 +2,21 @@
 
 import json
 import hashlib
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 from app.cache import (
     get_cached_entitlements,
     set_cached_entitlements,
+    get_cached_entitlements_many,
+    set_cached_entitlements_many,
     delete_cached_entitlements,
     calculate_etag,
+    etag_for,
+    render_json,
+    CachedEntitlements,
 )
+from app.catalog import CatalogSnapshot
 from app.config import settings
 
 
@@ -18,14 +24,67 @@ class CacheService:
     """Service for managing cache operations."""
     
     @staticmethod
-    async def get_entitlements(tenant_id: str) -> Optional[Dict[str, Any]]:
-        """Get cached entitlements for tenant."""
-        return await get_cached_entitlements(tenant_id)
+    def _is_current(entry: CachedEntitlements, snapshot: CatalogSnapshot) -> bool:
+        """Check a cached entry was built from the current plan and addon definitions."""
+        return snapshot.is_current(json.loads(entry.deps))
     
     @staticmethod
-    async def set_entitlements(tenant_id: str, data: Dict[str, Any], ttl: int = None) -> None:
-        """Set cached entitlements for tenant."""
-        await set_cached_entitlements(tenant_id, data, ttl)
+    def build_entry(data: Dict[str, Any], snapshot: CatalogSnapshot) -> CachedEntitlements:
+        """Render entitlements into the response body and ETag that get cached."""
+        body = render_json(data)
+        deps = snapshot.dependencies(data["plan"], data["pricing_refs"]["addons"])
+        return CachedEntitlements(etag=etag_for(body), deps=render_json(deps), body=body)
+    
+    @staticmethod
+    async def get_entitlements(tenant_id: str, snapshot: CatalogSnapshot) -> Optional[CachedEntitlements]:
+        """Get cached entitlements for tenant.
+        
+        Entries built from a plan or addon definition that has since
+        changed are treated as misses, so a catalog write invalidates
+        every dependent tenant without touching their keys.
+        """
+        entry = await get_cached_entitlements(tenant_id)
+        if not entry or not CacheService._is_current(entry, snapshot):
+            return None
+        return entry
+    
+    @staticmethod
+    async def set_entitlements(
+        tenant_id: str,
+        data: Dict[str, Any],
+        snapshot: CatalogSnapshot,
+        ttl: int = None,
+    ) -> CachedEntitlements:
+        """Render and cache entitlements for tenant, recording the catalog entries they depend on."""
+        entry = CacheService.build_entry(data, snapshot)
+        await set_cached_entitlements(tenant_id, entry, ttl)
+        return entry
+    
+    @staticmethod
+    async def get_entitlements_many(
+        tenant_ids: List[str], snapshot: CatalogSnapshot
+    ) -> Dict[str, CachedEntitlements]:
+        """Get cached entitlements for many tenants in one round trip; misses and stale entries are left out."""
+        cached = await get_cached_entitlements_many(tenant_ids)
+        return {
+            tenant_id: entry
+            for tenant_id, entry in cached.items()
+            if CacheService._is_current(entry, snapshot)
+        }
+    
+    @staticmethod
+    async def set_entitlements_many(
+        items: Dict[str, Dict[str, Any]],
+        snapshot: CatalogSnapshot,
+        ttl: int = None,
+    ) -> Dict[str, CachedEntitlements]:
+        """Render and cache entitlements for many tenants in one round trip."""
+        entries = {
+            tenant_id: CacheService.build_entry(data, snapshot)
+            for tenant_id, data in items.items()
+        }
+        await set_cached_entitlements_many(entries, ttl)
+        return entries
     
     @staticmethod
     async def delete_entitlements(tenant_id: str) -> None:
@@ -0,0 +1,204 @@
+"""Bulk recomputation of every tenant's cached entitlements."""
+
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.cache import CachedEntitlements, get_redis, set_cached_entitlements_many
+from app.catalog import CatalogSnapshot, FeatureRegistry, catalog
+from app.db import SessionLocal
+from app.models.addon import Addon
+from app.models.plan import Plan
+from app.models.tenant_plan import TenantPlan
+from app.services.cache_service import CacheService
+from app.services.entitlement_service import EntitlementService
+
+logger = logging.getLogger(__name__)
+
+# "<catalog version>:<tenant ID>" of the last chunk written; a rerun at the
+# same catalog version resumes after that tenant
+CHECKPOINT_KEY = "rules:entitlements:recompute:checkpoint"
+
+ChunkResult = Tuple[Dict[str, CachedEntitlements], Dict[str, str]]
+
+# Catalog snapshot of a worker process, built once by _init_worker
+_worker_snapshot: Optional[CatalogSnapshot] = None
+
+
+@dataclass
+class RecomputeProgress:
+    """Running totals of a recomputation."""
+
+    total: int
+    done: int = 0
+    cached: int = 0
+    failed: int = 0
+    checkpoint: str = ""
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Tenants per second so far."""
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+
+def _init_worker(version: int, plans: Sequence[Plan], addons: Sequence[Addon], features: Sequence[str]) -> None:
+    """Build the catalog snapshot a worker process computes against, with the catalog's feature bits."""
+    global _worker_snapshot
+    _worker_snapshot = CatalogSnapshot.from_models(version, plans, addons, FeatureRegistry(features))
+
+
+def compute_chunk(rows: List[tuple], snapshot: Optional[CatalogSnapshot] = None) -> ChunkResult:
+    """Compute and render the entitlements of one chunk of entitlement input rows.
+
+    Returns the cache entries and the errors, both by tenant ID.
+    """
+    snapshot = snapshot or _worker_snapshot
+    entries = {}
+    errors = {}
+    for row in rows:
+        tenant_id = row[0].tenant_id
+        try:
+            entitlements = EntitlementService.entitlements_from_row(row, snapshot)
+        except ValueError as e:
+            errors[tenant_id] = str(e)
+            continue
+        entries[tenant_id] = CacheService.build_entry(entitlements.model_dump(), snapshot)
+    return entries, errors
+
+
+async def get_checkpoint() -> Tuple[Optional[int], str]:
+    """Get the catalog version and tenant ID an interrupted recomputation stopped after.
+
+    Returns ``(None, "")`` when there is no checkpoint.
+    """
+    try:
+        redis_client = await get_redis()
+        value = await redis_client.get(CHECKPOINT_KEY) or ""
+    except Exception:
+        return None, ""
+    version, _, tenant_id = value.partition(":")
+    if not version.isdigit() or not tenant_id:
+        return None, ""
+    return int(version), tenant_id
+
+
+async def _set_checkpoint(version: int, tenant_id: Optional[str]) -> None:
+    try:
+        redis_client = await get_redis()
+        if tenant_id is None:
+            await redis_client.delete(CHECKPOINT_KEY)
+        else:
+            await redis_client.set(CHECKPOINT_KEY, f"{version}:{tenant_id}")
+    except Exception as e:
+        logger.warning("Recompute checkpoint update failed: %s", e)
+
+
+async def recompute_entitlements(
+    workers: int,
+    chunk_size: int = 1000,
+    resume: bool = True,
+    session_factory: async_sessionmaker = SessionLocal,
+    progress: Optional[Callable[[RecomputeProgress], Any]] = None,
+) -> RecomputeProgress:
+    """Recompute and cache entitlements for every tenant with a plan.
+
+    Tenant IDs are paged in ``chunk_size`` chunks, in ID order, and each
+    chunk's inputs are loaded with one query. Chunks are computed and
+    rendered in a pool of ``workers`` processes (in this process when
+    ``workers`` is 0) while the next chunks load, and each result is
+    written with one pipeline of SETEX. After every written chunk the last
+    tenant ID is saved as a checkpoint with the catalog version, so with
+    ``resume`` an interrupted run picks up where it stopped; a completed
+    run clears it. A checkpoint from another catalog version is ignored,
+    since the tenants before it were computed against the old catalog.
+    """
+    checkpoint_version, after = await get_checkpoint() if resume else (None, "")
+    async with session_factory() as db:
+        current = await catalog.get(db)
+        if after and checkpoint_version != current.version:
+            logger.warning(
+                "Recompute checkpoint ignored: tenant=%s, catalog version=%s, current version=%s",
+                after, checkpoint_version, current.version,
+            )
+            after = ""
+        plans = list((await db.execute(select(Plan))).scalars().all())
+        addons = list((await db.execute(select(Addon))).scalars().all())
+        total = await db.scalar(
+            select(func.count()).select_from(TenantPlan).where(TenantPlan.tenant_id > after)
+        )
+    snapshot = CatalogSnapshot.from_models(current.version, plans, addons, current.registry)
+    stats = RecomputeProgress(total=total, checkpoint=after)
+
+    pool = None
+    if workers:
+        # Spawned, not forked: this process has an event loop and driver threads running
+        pool = ProcessPoolExecutor(
+            workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(current.version, plans, addons, current.registry.names),
+        )
+    loop = asyncio.get_running_loop()
+    # Chunks being computed, oldest first, so checkpoints only move forward
+    pending: deque = deque()
+
+    async def write_oldest() -> None:
+        last_tenant_id, result = pending.popleft()
+        entries, errors = await result
+        await set_cached_entitlements_many(entries)
+        await _set_checkpoint(current.version, last_tenant_id)
+        stats.done += len(entries) + len(errors)
+        stats.cached += len(entries)
+        stats.failed += len(errors)
+        stats.checkpoint = last_tenant_id
+        for tenant_id, error in errors.items():
+            logger.warning("Entitlements not recomputed: tenant=%s, error=%s", tenant_id, error)
+        if progress:
+            progress(stats)
+
+    try:
+        while True:
+            async with session_factory() as db:
+                service = EntitlementService(db)
+                tenant_ids = await service.get_dependent_tenant_ids(after=after, limit=chunk_size)
+                if not tenant_ids:
+                    break
+                rows = [tuple(row) for row in await service.load_entitlement_inputs(tenant_ids)]
+
+            if pool:
+                result = loop.run_in_executor(pool, compute_chunk, rows)
+            else:
+                result = loop.create_future()
+                result.set_result(compute_chunk(rows, snapshot))
+            after = tenant_ids[-1]
+            pending.append((after, result))
+
+            # Keep every worker busy with a chunk queued behind it
+            if len(pending) >= max(workers, 1) * 2:
+                await write_oldest()
+
+        while pending:
+            await write_oldest()
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    await _set_checkpoint(current.version, None)
+    logger.info(
+        "Entitlements recomputed: tenants=%d, failed=%d, seconds=%.1f, per_second=%.0f",
+        stats.done, stats.failed, stats.elapsed, stats.rate,
+    )
+    return stats
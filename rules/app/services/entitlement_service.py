@@ -1,178 +1,233 @@
 """Entitlement service for computing tenant entitlements."""
 
+import asyncio
+import logging
 from datetime import datetime
-from typing import Dict, Any, List, Optional
-from sqlalchemy.orm import Session
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import JSON, Row, Select, func, literal_column, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql.elements import ColumnElement
 
-from app.models.plan import Plan
-from app.models.addon import Addon
 from app.models.tenant_plan import TenantPlan
 from app.models.tenant_addon import TenantAddon
 from app.models.limit_override import TenantLimitOverride
+from app.models.overage_price_refs import OveragePriceRefs
 from app.schemas.entitlements import EntitlementsResponse
+from app.catalog import LIMIT_RENAMES, CatalogPlan, CatalogSnapshot, catalog
 from app.config import settings
+from app.db import SessionLocal
+from app.services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+# Overage pricing refs for tenants that have never set their own
+DEFAULT_PER_STYLIST_REF = "pricebook/overage/stylist@v1"
+DEFAULT_PER_LOCATION_REF = "pricebook/overage/location@v1"
+
+
+def _json_list(dialect: str, **fields: ColumnElement) -> ColumnElement:
+    """Aggregate rows into a JSON array of objects with the given fields.
+    
+    Lets a child table ride along with its parent row as one column. Empty
+    aggregates come back as None on PostgreSQL and ``[]`` on SQLite.
+    """
+    args = []
+    for name, column in fields.items():
+        args.append(literal_column(f"'{name}'"))
+        if dialect != "postgresql" and isinstance(column.type, JSON):
+            # SQLite stores JSON as text; json() embeds it as a value, not a string
+            column = func.json(column)
+        args.append(column)
+    
+    if dialect == "postgresql":
+        aggregate = func.json_agg(func.json_build_object(*args))
+    else:
+        aggregate = func.json_group_array(func.json_object(*args))
+    return type_coerce(aggregate, JSON)
 
 
 class EntitlementService:
     """Service for computing tenant entitlements."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def compute_entitlements(self, tenant_id: str) -> EntitlementsResponse:
-        """Compute entitlements for a tenant."""
-        # Get tenant plan
-        tenant_plan = self.db.query(TenantPlan).filter(TenantPlan.tenant_id == tenant_id).first()
-        if not tenant_plan:
+    async def compute_entitlements(self, tenant_id: str) -> EntitlementsResponse:
+        """Compute entitlements for a tenant.
+        
+        Plans and addons come from the in-process catalog. The tenant's own
+        rows are loaded in a single round trip: the tenant plan row joined
+        to its overage refs, with the tenant's addons and overrides
+        aggregated into JSON columns. Nothing is written; a tenant without
+        overage refs gets the defaults in memory.
+        """
+        snapshot = await catalog.get(self.db)
+        
+        result = await self.db.execute(
+            self._entitlement_inputs_query().where(TenantPlan.tenant_id == tenant_id)
+        )
+        row = result.first()
+        if not row:
             raise ValueError(f"Tenant {tenant_id} has no plan assigned")
         
-        # Get plan details
-        plan = self.db.query(Plan).filter(Plan.code == tenant_plan.plan_code).first()
+        return self.entitlements_from_row(row, snapshot)
+    
+    async def compute_entitlements_many(
+        self, tenant_ids: List[str]
+    ) -> Tuple[Dict[str, EntitlementsResponse], Dict[str, str]]:
+        """Compute entitlements for many tenants with one query.
+        
+        Returns the entitlements and the errors, both by tenant ID.
+        """
+        if not tenant_ids:
+            return {}, {}
+        
+        snapshot = await catalog.get(self.db)
+        
+        entitlements = {}
+        errors = {}
+        for row in await self.load_entitlement_inputs(tenant_ids):
+            tenant_id = row[0].tenant_id
+            try:
+                entitlements[tenant_id] = self.entitlements_from_row(row, snapshot)
+            except ValueError as e:
+                errors[tenant_id] = str(e)
+        
+        for tenant_id in tenant_ids:
+            if tenant_id not in entitlements and tenant_id not in errors:
+                errors[tenant_id] = f"Tenant {tenant_id} has no plan assigned"
+        
+        return entitlements, errors
+    
+    async def load_entitlement_inputs(self, tenant_ids: List[str]) -> List[Row]:
+        """Load the entitlement inputs of many tenants with one query; tenants without a plan are left out."""
+        result = await self.db.execute(
+            self._entitlement_inputs_query().where(TenantPlan.tenant_id.in_(tenant_ids))
+        )
+        return list(result.all())
+    
+    @staticmethod
+    def entitlements_from_row(row: Row, snapshot: CatalogSnapshot) -> EntitlementsResponse:
+        """Compute entitlements from one row of the entitlement inputs query.
+        
+        Needs no database access, so rows can be computed anywhere,
+        including in another process.
+        """
+        tenant_plan, overage_refs, tenant_addons, overrides = row
+        plan = snapshot.plans.get(tenant_plan.plan_code)
         if not plan:
             raise ValueError(f"Plan {tenant_plan.plan_code} not found")
         
-        # Get tenant addons
-        tenant_addons = self.db.query(TenantAddon).filter(TenantAddon.tenant_id == tenant_id).all()
-        addon_codes = [ta.addon_code for ta in tenant_addons]
+        override_map = {override["key"]: override["value"] for override in overrides or []}
+        
+        return EntitlementService._compute_entitlements(
+            plan, tenant_addons or [], snapshot, override_map, tenant_plan, overage_refs
+        )
+    
+    def _entitlement_inputs_query(self) -> Select:
+        """Build the statement that loads tenant entitlement inputs, one row per tenant.
         
-        # Get addon details
-        addons = self.db.query(Addon).filter(Addon.code.in_(addon_codes)).all()
-        addon_map = {addon.code: addon for addon in addons}
+        Callers add the filter on ``TenantPlan.tenant_id``; the addon and
+        override subqueries are correlated to each row's tenant.
+        """
+        dialect = self.db.bind.dialect.name
         
-        # Get overrides
-        overrides = self.db.query(TenantLimitOverride).filter(
-            TenantLimitOverride.tenant_id == tenant_id
-        ).all()
-        override_map = {override.key: override.value_json for override in overrides}
+        tenant_addons = (
+            select(
+                _json_list(
+                    dialect,
+                    code=TenantAddon.addon_code,
+                    pricing_ref=TenantAddon.pricing_ref,
+                )
+            )
+            .where(TenantAddon.tenant_id == TenantPlan.tenant_id)
+            .scalar_subquery()
+        )
         
-        # Compute entitlements
-        entitlements = self._compute_entitlements(
-            plan, tenant_addons, addon_map, override_map, tenant_plan
+        overrides = (
+            select(
+                _json_list(
+                    dialect,
+                    key=TenantLimitOverride.key,
+                    value=TenantLimitOverride.value_json,
+                )
+            )
+            .where(TenantLimitOverride.tenant_id == TenantPlan.tenant_id)
+            .scalar_subquery()
         )
         
-        return entitlements
+        return (
+            select(TenantPlan, OveragePriceRefs, tenant_addons, overrides)
+            .outerjoin(OveragePriceRefs, OveragePriceRefs.tenant_id == TenantPlan.tenant_id)
+        )
     
+    @staticmethod
     def _compute_entitlements(
-        self,
-        plan: Plan,
-        tenant_addons: List[TenantAddon],
-        addon_map: Dict[str, Addon],
+        plan: CatalogPlan,
+        tenant_addons: List[Dict[str, Any]],
+        snapshot: CatalogSnapshot,
         override_map: Dict[str, Any],
         tenant_plan: TenantPlan,
+        overage_refs: Optional[OveragePriceRefs],
     ) -> EntitlementsResponse:
-        """Compute entitlements from plan, addons, and overrides."""
-        
-        # Start with plan limits and features
-        limits = plan.limits_json.copy()
-        features = plan.features_json.copy()
-        overage_policy = plan.overage_policy_json.copy()
-        
-        # Rename limits to match new schema
-        if "locations_included" in limits:
-            limits["locations"] = limits.pop("locations_included")
-        if "stylists_included" in limits:
-            limits["stylists"] = limits.pop("stylists_included")
-        
-        # Initialize all possible features to False
-        all_features = {
-            "basic_reporting": False,
-            "family_booking": False,
-            "loyalty_points": False,
-            "reviews": False,
-            "advanced_analytics": False,
-            "stylist_matching": False,
-            "ai_booking": False,
-            "variable_pricing": False,
-            "packages": False,
-            "upsell": False,
-            "waitlist": False,
-            "gift_cards": False,
-            "online_store": False,
-            "tiered_loyalty": False,
-            "memberships": False,
-            "smart_no_shows": False,
-            "dynamic_pricing": False,
-            "ai_promotions": False,
-            "staff_utilization": False,
-            "offline_mode": False,
-            "data_export": False,
-            "voice_assistant": False,
-        }
+        """Compute entitlements from plan, addons, and overrides.
         
-        # Update with plan features
-        all_features.update(features)
-        features = all_features
+        Features are worked out as a bitmask: the plan's compiled mask,
+        then each addon's on/off masks in turn, then the overrides'.
+        """
+        registry = snapshot.registry
         
-        # Apply addon effects using effect_json
-        for tenant_addon in tenant_addons:
-            addon = addon_map.get(tenant_addon.addon_code)
-            if not addon:
-                continue
-            
-            # Apply the addon's effect_json to features
-            for feature, value in addon.effect_json.items():
-                if isinstance(value, bool):
-                    features[feature] = value
+        # Start with plan limits; the catalog has already renamed legacy limits
+        limits = dict(plan.limits)
+        overage_policy = dict(plan.overage_policy)
+        feature_mask = plan.feature_mask
+        
+        # Only addons still in the catalog apply
+        addons = [
+            (tenant_addon, snapshot.addons[tenant_addon["code"]])
+            for tenant_addon in tenant_addons
+            if tenant_addon["code"] in snapshot.addons
+        ]
+        
+        # Apply addon effects
+        for _, addon in addons:
+            feature_mask = (feature_mask | addon.features_on) & ~addon.features_off
         
-        # Apply overrides (overrides take precedence)
+        # Apply overrides (overrides take precedence); limits by either
+        # name win over features, which must be known to the registry
+        feature_overrides = {}
         for key, value in override_map.items():
-            # Handle limit overrides (check both old and new names)
-            if key == "locations_included":
-                limits["locations"] = value
-            elif key == "stylists_included":
-                limits["stylists"] = value
-            elif key in limits:
-                limits[key] = value
-            elif key in features:
-                features[key] = value
-            else:
-                # Generic override
-                if key in limits:
-                    limits[key] = value
-                elif key in features:
-                    features[key] = value
-        
-        # Build pricing references
-        from app.models.overage_price_refs import OveragePriceRefs
-        
-        # Get overage pricing refs (create defaults if absent)
-        overage_refs = self.db.query(OveragePriceRefs).filter(
-            OveragePriceRefs.tenant_id == tenant_plan.tenant_id
-        ).first()
-        
-        if not overage_refs:
-            overage_refs = OveragePriceRefs(
-                tenant_id=tenant_plan.tenant_id,
-                per_stylist_ref="pricebook/overage/stylist@v1",
-                per_location_ref="pricebook/overage/location@v1"
-            )
-            self.db.add(overage_refs)
-            self.db.commit()
-            self.db.refresh(overage_refs)
+            limit = LIMIT_RENAMES.get(key, key)
+            if key in LIMIT_RENAMES or limit in limits:
+                limits[limit] = value
+            elif key in registry.bits:
+                feature_overrides[key] = value
+        overrides_on, overrides_off = registry.masks(feature_overrides)
+        feature_mask = (feature_mask | overrides_on) & ~overrides_off
         
         # Build pricing_refs structure
         pricing_refs = {
             "plan": tenant_plan.pricing_ref or plan.pricing_ref or "",
             "addons": {},
             "overage": {
-                "per_stylist": overage_refs.per_stylist_ref or "pricebook/overage/stylist@v1",
-                "per_location": overage_refs.per_location_ref or "pricebook/overage/location@v1"
+                "per_stylist": (overage_refs and overage_refs.per_stylist_ref) or DEFAULT_PER_STYLIST_REF,
+                "per_location": (overage_refs and overage_refs.per_location_ref) or DEFAULT_PER_LOCATION_REF,
             }
         }
         
         # Add addon pricing refs
-        for tenant_addon in tenant_addons:
-            addon = addon_map.get(tenant_addon.addon_code)
-            if addon:
-                pricing_refs["addons"][addon.code] = (
-                    tenant_addon.pricing_ref or addon.pricing_ref or ""
-                )
+        for tenant_addon, addon in addons:
+            pricing_refs["addons"][addon.code] = (
+                tenant_addon["pricing_ref"] or addon.pricing_ref or ""
+            )
         
         return EntitlementsResponse(
             tenant_id=tenant_plan.tenant_id,
             plan=plan.code,
             limits=limits,
-            features=features,
+            features=registry.decode(feature_mask),
+            feature_mask=registry.encode(feature_mask),
+            feature_registry=registry.id,
             overage_policy=overage_policy,
             pricing_refs=pricing_refs,
             version=tenant_plan.version,
@@ -180,16 +235,82 @@ class EntitlementService:
             ttl_hint_sec=settings.cache_ttl_seconds,
         )
     
-    def get_tenant_plan(self, tenant_id: str) -> Optional[TenantPlan]:
+    async def get_tenant_plan(self, tenant_id: str) -> Optional[TenantPlan]:
         """Get tenant plan."""
-        return self.db.query(TenantPlan).filter(TenantPlan.tenant_id == tenant_id).first()
+        result = await self.db.execute(select(TenantPlan).where(TenantPlan.tenant_id == tenant_id))
+        return result.scalars().first()
     
-    def get_tenant_addons(self, tenant_id: str) -> List[TenantAddon]:
+    async def get_tenant_addons(self, tenant_id: str) -> List[TenantAddon]:
         """Get tenant addons."""
-        return self.db.query(TenantAddon).filter(TenantAddon.tenant_id == tenant_id).all()
+        result = await self.db.execute(select(TenantAddon).where(TenantAddon.tenant_id == tenant_id))
+        return list(result.scalars().all())
     
-    def get_tenant_overrides(self, tenant_id: str) -> List[TenantLimitOverride]:
+    async def get_tenant_overrides(self, tenant_id: str) -> List[TenantLimitOverride]:
         """Get tenant overrides."""
-        return self.db.query(TenantLimitOverride).filter(
-            TenantLimitOverride.tenant_id == tenant_id
-        ).all()
+        result = await self.db.execute(
+            select(TenantLimitOverride).where(TenantLimitOverride.tenant_id == tenant_id)
+        )
+        return list(result.scalars().all())
+    
+    async def get_dependent_tenant_ids(
+        self,
+        plan_code: Optional[str] = None,
+        addon_code: Optional[str] = None,
+        after: str = "",
+        limit: int = 500,
+    ) -> List[str]:
+        """Get a page of tenants on a plan or holding an addon, in tenant ID order.
+        
+        With neither given, pages through every tenant with a plan.
+        """
+        if plan_code is None and addon_code is None:
+            query = select(TenantPlan.tenant_id)
+            column = TenantPlan.tenant_id
+        elif plan_code is not None:
+            query = select(TenantPlan.tenant_id).where(TenantPlan.plan_code == plan_code)
+            column = TenantPlan.tenant_id
+        else:
+            query = select(TenantAddon.tenant_id).where(TenantAddon.addon_code == addon_code).distinct()
+            column = TenantAddon.tenant_id
+        result = await self.db.execute(query.where(column > after).order_by(column).limit(limit))
+        return list(result.scalars().all())
+
+
+async def rewarm_entitlements(
+    plan_code: Optional[str] = None,
+    addon_code: Optional[str] = None,
+    session_factory: async_sessionmaker = SessionLocal,
+) -> int:
+    """Recompute and cache entitlements for every tenant affected by a catalog change.
+    
+    Runs in batches of ``catalog_rewarm_batch_size`` tenants, each computed
+    with one query and cached in one pipeline, yielding to the event loop
+    between batches. Returns the number of tenants re-warmed.
+    """
+    warmed = 0
+    after = ""
+    while True:
+        async with session_factory() as db:
+            service = EntitlementService(db)
+            tenant_ids = await service.get_dependent_tenant_ids(
+                plan_code, addon_code, after, settings.catalog_rewarm_batch_size
+            )
+            if not tenant_ids:
+                break
+            
+            snapshot = await catalog.get(db)
+            entitlements, _ = await service.compute_entitlements_many(tenant_ids)
+            await CacheService.set_entitlements_many(
+                {tenant_id: result.model_dump() for tenant_id, result in entitlements.items()},
+                snapshot,
+            )
+            warmed += len(entitlements)
+        
+        after = tenant_ids[-1]
+        await asyncio.sleep(0)
+    
+    logger.info(
+        "Entitlements re-warmed: plan=%s, addon=%s, tenants=%d",
+        plan_code, addon_code, warmed,
+    )
+    return warmed
@@ -1,7 +1,8 @@
 """Plan service for managing subscription plans."""
 
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 
 from app.models.plan import Plan
@@ -12,53 +13,61 @@ from app.schemas.plan import PlanCreate, PlanUpdate
 class PlanService:
     """Service for managing plans."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
     
-    def create_plan(self, plan_data: PlanCreate) -> Plan:
+    async def create_plan(self, plan_data: PlanCreate) -> Plan:
         """Create a new plan."""
         plan = Plan(**plan_data.model_dump())
         self.db.add(plan)
-        self.db.commit()
-        self.db.refresh(plan)
+        try:
+            await self.db.commit()
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+        await self.db.refresh(plan)
         return plan
     
-    def get_plan(self, code: str) -> Optional[Plan]:
+    async def get_plan(self, code: str) -> Optional[Plan]:
         """Get plan by code."""
-        return self.db.query(Plan).filter(Plan.code == code).first()
+        result = await self.db.execute(select(Plan).where(Plan.code == code))
+        return result.scalars().first()
     
-    def get_plans(self, skip: int = 0, limit: int = 100) -> List[Plan]:
+    async def get_plans(self, skip: int = 0, limit: int = 100) -> List[Plan]:
         """Get list of plans."""
-        return self.db.query(Plan).offset(skip).limit(limit).all()
+        result = await self.db.execute(select(Plan).offset(skip).limit(limit))
+        return list(result.scalars().all())
     
-    def update_plan(self, code: str, plan_data: PlanUpdate) -> Optional[Plan]:
+    async def update_plan(self, code: str, plan_data: PlanUpdate) -> Optional[Plan]:
         """Update a plan."""
-        plan = self.get_plan(code)
+        plan = await self.get_plan(code)
         if not plan:
             return None
         
         for field, value in plan_data.model_dump().items():
             setattr(plan, field, value)
         
-        self.db.commit()
-        self.db.refresh(plan)
+        await self.db.commit()
+        await self.db.refresh(plan)
         return plan
     
-    def delete_plan(self, code: str) -> bool:
+    async def delete_plan(self, code: str) -> bool:
         """Delete a plan."""
-        plan = self.get_plan(code)
+        plan = await self.get_plan(code)
         if not plan:
             return False
         
         # Check if plan is in use
-        tenant_plan = self.db.query(TenantPlan).filter(TenantPlan.plan_code == code).first()
-        if tenant_plan:
+        if await self.is_plan_in_use(code):
             raise IntegrityError("Plan is in use by tenants", None, None)
         
-        self.db.delete(plan)
-        self.db.commit()
+        await self.db.delete(plan)
+        await self.db.commit()
         return True
     
-    def is_plan_in_use(self, code: str) -> bool:
+    async def is_plan_in_use(self, code: str) -> bool:
         """Check if plan is in use by any tenant."""
-        return self.db.query(TenantPlan).filter(TenantPlan.plan_code == code).first() is not None
+        result = await self.db.execute(
+            select(TenantPlan.tenant_id).where(TenantPlan.plan_code == code).limit(1)
+        )
+        return result.first() is not None
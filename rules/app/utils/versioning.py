@@ -1,16 +1,18 @@
 """Versioning utilities for tenant plan changes."""
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.tenant_plan import TenantPlan
 
 
-def bump_tenant_version(db: Session, tenant_id: str) -> int:
+async def bump_tenant_version(db: AsyncSession, tenant_id: str) -> int:
     """Bump tenant plan version and return new version."""
-    tenant_plan = db.query(TenantPlan).filter(TenantPlan.tenant_id == tenant_id).first()
+    result = await db.execute(select(TenantPlan).where(TenantPlan.tenant_id == tenant_id))
+    tenant_plan = result.scalars().first()
     
     if tenant_plan:
         tenant_plan.version += 1
-        db.commit()
+        await db.commit()
         return tenant_plan.version
     else:
         # Create new tenant plan with version 1
@@ -20,5 +22,5 @@ def bump_tenant_version(db: Session, tenant_id: str) -> int:
             version=1,
         )
         db.add(tenant_plan)
-        db.commit()
+        await db.commit()
         return 1
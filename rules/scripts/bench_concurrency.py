@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Benchmark entitlement reads under concurrent, mixed cache-hit/miss load.
+
+Starts the service under a single uvicorn worker (or targets one already
+running with --url), assigns plans to a set of benchmark tenants and then
+drives GET /entitlements/{tenant_id} from many concurrent clients. A
+fraction of requests (--miss-ratio) first drops the tenant's Redis key, so
+they compute from the database; the rest are served from cache.
+
+Reports throughput and latency percentiles for hits and misses separately.
+While database calls block the event loop, cache hits queue behind misses
+and their tail latency tracks the database; once the calls are async, hits
+stay fast regardless of the miss load.
+
+To compare before and after a change, start the other revision yourself
+(uvicorn app.main:app --port 8766) and run this script with
+--url http://127.0.0.1:8766.
+
+Usage:
+    DATABASE_URL=postgresql+psycopg://... REDIS_URL=redis://... \\
+        python scripts/bench_concurrency.py [--concurrency 64] [--requests 5000] [--miss-ratio 0.2]
+
+The database must have the schema and seeded plans (scripts/seed_plans.py).
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import redis.asyncio as redis
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.cache import get_cache_key  # noqa: E402
+from app.config import settings  # noqa: E402
+
+RULES_DIR = Path(__file__).resolve().parent.parent
+PORT = 8765
+TENANT_PREFIX = "bench-tenant-"
+HEADERS = {settings.internal_service_header: "bench"}
+
+
+def start_server() -> subprocess.Popen:
+    """Start the service in a single worker, so one event loop serves everything."""
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+        cwd=RULES_DIR,
+        env=dict(os.environ),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    """Poll /health until the service answers."""
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Service did not become ready in time")
+
+
+async def seed_tenants(client: httpx.AsyncClient, tenants: list[str]) -> None:
+    """Assign a plan to every benchmark tenant."""
+    for tenant_id in tenants:
+        response = await client.put(
+            f"/tenants/{tenant_id}/plan",
+            json={"plan_code": "gold", "meta": {}},
+            headers=HEADERS,
+        )
+        response.raise_for_status()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Get a percentile of already sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    cache: redis.Redis,
+    tenants: list[str],
+    total: int,
+    concurrency: int,
+    miss_ratio: float,
+) -> tuple[float, dict[str, list[float]]]:
+    """Issue requests from concurrent workers and collect latencies by kind."""
+    latencies: dict[str, list[float]] = {"hit": [], "miss": []}
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            tenant_id = random.choice(tenants)
+            kind = "miss" if random.random() < miss_ratio else "hit"
+            if kind == "miss":
+                await cache.delete(get_cache_key(tenant_id))
+            started = time.perf_counter()
+            response = await client.get(f"/entitlements/{tenant_id}", headers=HEADERS)
+            elapsed = time.perf_counter() - started
+            response.raise_for_status()
+            latencies[kind].append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return time.perf_counter() - started, latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Target a running service instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--miss-ratio", type=float, default=0.2)
+    parser.add_argument("--tenants", type=int, default=200)
+    args = parser.parse_args()
+
+    server = None if args.url else start_server()
+    base_url = args.url or f"http://127.0.0.1:{PORT}"
+    tenants = [f"{TENANT_PREFIX}{i}" for i in range(args.tenants)]
+    cache = redis.from_url(settings.redis_url)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+            await wait_ready(client)
+            await seed_tenants(client, tenants)
+
+            # Warm every tenant so unforced requests are cache hits
+            await run_load(client, cache, tenants, len(tenants) * 2, args.concurrency, 0.0)
+
+            elapsed, latencies = await run_load(
+                client, cache, tenants, args.requests, args.concurrency, args.miss_ratio
+            )
+    finally:
+        await cache.aclose()
+        if server:
+            server.terminate()
+            server.wait()
+
+    print(
+        f"{args.requests} requests, concurrency {args.concurrency}, "
+        f"miss ratio {args.miss_ratio}: {args.requests / elapsed:8.1f} req/s"
+    )
+    for kind, values in latencies.items():
+        values.sort()
+        print(
+            f"  {kind:<4} n={len(values):<6} p50 {percentile(values, 0.50) * 1000:7.2f} ms  "
+            f"p99 {percentile(values, 0.99) * 1000:7.2f} ms  max {percentile(values, 1.0) * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Benchmark entitlement computation (the cache-miss path) on a large dataset.
+
+Seeds --tenants benchmark tenants (default 100k), each with a plan, up to
+three addons, a couple of limit overrides and, for half of them, overage
+pricing refs. It then times EntitlementService.compute_entitlements for
+randomly chosen tenants straight against the database, bypassing Redis. It
+reports latency percentiles and the number of statements issued per
+computation.
+
+Usage:
+    DATABASE_URL=postgresql+psycopg://... python scripts/bench_entitlements.py [--tenants 100000] [--samples 2000]
+
+The database must have the schema and seeded plans (scripts/seed_plans.py).
+Seeding is skipped when the benchmark tenants already exist; --cleanup
+removes them afterwards.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from sqlalchemy import delete, event, func, insert, select
+
+# Add the project root to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.db import SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Addon,
+    OveragePriceRefs,
+    Plan,
+    TenantAddon,
+    TenantLimitOverride,
+    TenantPlan,
+)
+from app.services.entitlement_service import EntitlementService  # noqa: E402
+
+TENANT_PREFIX = "bench-ent-"
+BATCH_SIZE = 5000
+
+
+def tenant_id(i: int) -> str:
+    return f"{TENANT_PREFIX}{i:07d}"
+
+
+async def seed(tenants: int) -> None:
+    """Insert the benchmark tenants in batches."""
+    async with SessionLocal() as db:
+        existing = await db.scalar(
+            select(func.count()).select_from(TenantPlan).where(TenantPlan.tenant_id.like(f"{TENANT_PREFIX}%"))
+        )
+        if existing >= tenants:
+            print(f"Using {existing} existing benchmark tenants")
+            return
+
+        plan_codes = list((await db.scalars(select(Plan.code))).all())
+        addon_codes = list((await db.scalars(select(Addon.code))).all())
+        if not plan_codes:
+            raise SystemExit("No plans found; run scripts/seed_plans.py first")
+
+        rng = random.Random(42)
+        started = time.perf_counter()
+        for offset in range(existing, tenants, BATCH_SIZE):
+            plans, addons, overrides, refs = [], [], [], []
+            for i in range(offset, min(offset + BATCH_SIZE, tenants)):
+                tid = tenant_id(i)
+                plans.append({"tenant_id": tid, "plan_code": rng.choice(plan_codes), "meta_json": {}, "version": 1})
+                for code in rng.sample(addon_codes, k=min(len(addon_codes), rng.randint(0, 3))):
+                    addons.append({"tenant_id": tid, "addon_code": code, "qty": 1, "meta_json": {}})
+                overrides.append({"tenant_id": tid, "key": "stylists_included", "value_json": rng.randint(5, 50)})
+                overrides.append({"tenant_id": tid, "key": "waitlist", "value_json": rng.random() < 0.5})
+                if i % 2 == 0:
+                    refs.append({
+                        "tenant_id": tid,
+                        "per_stylist_ref": "pricebook/overage/stylist@v2",
+                        "per_location_ref": "pricebook/overage/location@v2",
+                    })
+
+            await db.execute(insert(TenantPlan), plans)
+            if addons:
+                await db.execute(insert(TenantAddon), addons)
+            await db.execute(insert(TenantLimitOverride), overrides)
+            await db.execute(insert(OveragePriceRefs), refs)
+            await db.commit()
+            print(f"  seeded {min(offset + BATCH_SIZE, tenants)}/{tenants} tenants", end="\r")
+
+        print(f"\nSeeded {tenants - existing} tenants in {time.perf_counter() - started:.1f} s")
+
+
+async def cleanup() -> None:
+    """Remove the benchmark tenants."""
+    async with SessionLocal() as db:
+        for model in (TenantAddon, TenantLimitOverride, OveragePriceRefs, TenantPlan):
+            await db.execute(delete(model).where(model.tenant_id.like(f"{TENANT_PREFIX}%")))
+        await db.commit()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Get a percentile of already sorted values."""
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def measure(tenants: int, samples: int) -> None:
+    """Time compute_entitlements for random tenants."""
+    statements = 0
+
+    def count_statement(*_) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    timings = []
+    rng = random.Random(7)
+    try:
+        for _ in range(samples):
+            async with SessionLocal() as db:
+                started = time.perf_counter()
+                await EntitlementService(db).compute_entitlements(tenant_id(rng.randrange(tenants)))
+                timings.append(time.perf_counter() - started)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    timings.sort()
+    print(
+        f"compute_entitlements over {tenants} tenants, {samples} samples: "
+        f"p50 {percentile(timings, 0.50) * 1000:.2f} ms  p90 {percentile(timings, 0.90) * 1000:.2f} ms  "
+        f"p99 {percentile(timings, 0.99) * 1000:.2f} ms  "
+        f"statements/call {statements / samples:.1f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=100_000)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--cleanup", action="store_true", help="Remove the benchmark tenants afterwards")
+    args = parser.parse_args()
+
+    try:
+        await seed(args.tenants)
+        await measure(args.tenants, args.samples)
+        if args.cleanup:
+            await cleanup()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,18 +8,20 @@ import os
 # Add the project root to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from sqlalchemy.orm import Session
-from app.db import get_db
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.catalog import catalog
+from app.db import SessionLocal, engine
 from app.models.plan import Plan
 from app.models.addon import Addon
 
 
-def seed_plans(db: Session):
+async def seed_plans(db: AsyncSession):
     """Seed the new plan structure."""
     
     # Delete existing plans and addons
-    db.query(Plan).delete()
-    db.query(Addon).delete()
+    await db.execute(delete(Plan))
+    await db.execute(delete(Addon))
     
     # Create Silver Plan
     silver_plan = Plan(
@@ -156,29 +158,31 @@ def seed_plans(db: Session):
         gift_cards_addon
     ])
     
-    db.commit()
+    await db.commit()
+    
+    # Have running replicas pick up the new catalog
+    await catalog.invalidate(db)
     
     print("✅ Plans and addons seeded successfully!")
     print(f"   - Created 3 plans: Silver, Gold, Platinum")
     print(f"   - Created 5 addons: ai_booking, variable_pricing, value_pack, family_booking, gift_cards")
 
 
-def main():
+async def main():
     """Main function to run the seed script."""
     print("🌱 Seeding plans and addons...")
     
-    # Get database session
-    db = next(get_db())
-    
     try:
-        seed_plans(db)
-    except Exception as e:
-        print(f"❌ Error seeding plans: {e}")
-        db.rollback()
-        sys.exit(1)
+        async with SessionLocal() as db:
+            try:
+                await seed_plans(db)
+            except Exception as e:
+                print(f"❌ Error seeding plans: {e}")
+                await db.rollback()
+                sys.exit(1)
     finally:
-        db.close()
+        await engine.dispose()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
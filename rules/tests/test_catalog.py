@@ -0,0 +1,223 @@
+"""Tests for the in-process plan and addon catalog."""
+
+import asyncio
+import dataclasses
+
+from fastapi.testclient import TestClient
+
+from app.catalog import CatalogAddon, CatalogPlan, CatalogSnapshot, FeatureRegistry, catalog
+from app.config import settings
+from app.models.addon import Addon
+from app.models.plan import Plan
+from app.services.cache_service import CacheService
+from app.services.entitlement_service import rewarm_entitlements
+from tests.conftest import AsyncTestingSessionLocal
+
+
+def test_catalog_plan_precomputes_entitlement_form():
+    """Test catalog plans carry renamed limits and every feature."""
+    plan = Plan(
+        code="silver",
+        name="Silver",
+        limits_json={"locations_included": 1, "stylists_included": 5},
+        features_json={"basic_reporting": True},
+        overage_policy_json={"allow_extra_stylists": True},
+        pricing_ref="pricebook/plans/silver@v1",
+    )
+
+    entry = CatalogPlan.from_model(plan)
+    assert entry.limits == {"locations": 1, "stylists": 5}
+    assert entry.features["basic_reporting"] is True
+    assert entry.features["ai_booking"] is False
+    assert entry.overage_policy == {"allow_extra_stylists": True}
+
+
+def test_catalog_addon_keeps_boolean_effects():
+    """Test catalog addons only keep effects that switch features."""
+    addon = Addon(
+        code="value_pack",
+        name="Value Pack",
+        effect_json={"packages": True, "upsell": True, "max_packages": 5},
+        pricing_ref="pricebook/addons/value_pack@v2",
+    )
+
+    entry = CatalogAddon.from_model(addon)
+    assert entry.features == {"packages": True, "upsell": True}
+
+
+def test_feature_registry_compiles_features_to_masks():
+    """Test plans and addons compile to feature masks that decode back to features."""
+    plan = Plan(
+        code="silver", name="Silver", limits_json={}, features_json={"reviews": True, "kiosk": True},
+        overage_policy_json={},
+    )
+    addon = Addon(code="no_reviews", name="No Reviews", effect_json={"reviews": False, "waitlist": True})
+    registry = FeatureRegistry.build([plan], [addon])
+    assert registry.names[0] == "basic_reporting"
+    assert registry.names[-1] == "kiosk"
+
+    entry = CatalogPlan.from_model(plan, registry)
+    assert registry.decode(entry.feature_mask) == {name: name in ("reviews", "kiosk") for name in registry.names}
+
+    effect = CatalogAddon.from_model(addon, registry)
+    mask = (entry.feature_mask | effect.features_on) & ~effect.features_off
+    assert mask & registry.bits["waitlist"]
+    assert not mask & registry.bits["reviews"]
+    assert int(registry.encode(mask), 16) == mask
+
+
+def test_feature_registry_bits_are_append_only():
+    """Test features keep their bits when new features sort before them."""
+    plan = Plan(
+        code="silver", name="Silver", limits_json={}, features_json={"zzz_extra": True}, overage_policy_json={},
+    )
+    registry = FeatureRegistry.build([plan], [])
+
+    plan.features_json = {"zzz_extra": True, "aaa_new": True}
+    grown = FeatureRegistry.build([plan], [], registry.names)
+    assert grown.names[:len(registry.names)] == registry.names
+    assert grown.names[-1] == "aaa_new"
+    assert grown.bits["zzz_extra"] == registry.bits["zzz_extra"]
+    assert grown.id != registry.id
+
+    # Features no plan uses any more keep their bits too
+    plan.features_json = {}
+    assert FeatureRegistry.build([plan], [], grown.names).names == grown.names
+
+
+def test_catalog_writes_bump_version(client: TestClient, admin_headers: dict):
+    """Test admin plan and addon writes reload the catalog at a new version."""
+    response = client.post(
+        "/admin/plans/",
+        json={"code": "silver", "name": "Silver", "limits_json": {}, "features_json": {}},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    version = catalog.version
+    assert "silver" in catalog._snapshot.plans
+
+    response = client.post(
+        "/admin/addons/",
+        json={"code": "ai_booking", "name": "AI Booking", "effect_json": {"ai_booking": True}},
+        headers=admin_headers,
+    )
+    assert response.status_code == 201
+    assert catalog.version == version + 1
+    assert catalog._snapshot.addons["ai_booking"].features == {"ai_booking": True}
+
+    response = client.delete("/admin/addons/ai_booking", headers=admin_headers)
+    assert response.status_code == 204
+    assert catalog.version == version + 2
+    assert "ai_booking" not in catalog._snapshot.addons
+
+
+def test_entitlements_read_plan_from_catalog(client: TestClient, admin_headers: dict, internal_headers: dict):
+    """Test entitlements combine catalog plans and addons with tenant rows."""
+    client.post(
+        "/admin/plans/",
+        json={
+            "code": "silver",
+            "name": "Silver",
+            "limits_json": {"stylists_included": 5},
+            "features_json": {"basic_reporting": True},
+            "pricing_ref": "pricebook/plans/silver@v1",
+        },
+        headers=admin_headers,
+    )
+    client.post(
+        "/admin/addons/",
+        json={
+            "code": "gift_cards",
+            "name": "Gift Cards",
+            "effect_json": {"gift_cards": True},
+            "pricing_ref": "pricebook/addons/gift_cards@v1",
+        },
+        headers=admin_headers,
+    )
+    client.put("/tenants/tenant-1/plan", json={"plan_code": "silver"}, headers=internal_headers)
+    client.put("/tenants/tenant-1/addons", json={"add": ["gift_cards"]}, headers=internal_headers)
+
+    response = client.get("/entitlements/tenant-1", headers=internal_headers)
+    assert response.status_code == 200
+
+    data = response.json()
+    assert data["limits"]["stylists"] == 5
+    assert data["features"]["basic_reporting"] is True
+    assert data["features"]["gift_cards"] is True
+    assert data["pricing_refs"]["addons"] == {"gift_cards": "pricebook/addons/gift_cards@v1"}
+    assert data["pricing_refs"]["overage"]["per_stylist"] == "pricebook/overage/stylist@v1"
+
+    response = client.get("/entitlements/feature-registry", headers=internal_headers)
+    assert response.status_code == 200
+    registry = response.json()
+    assert registry["id"] == data["feature_registry"]
+    mask = int(data["feature_mask"], 16)
+    assert {name for i, name in enumerate(registry["features"]) if mask >> i & 1} == {
+        name for name, enabled in data["features"].items() if enabled
+    }
+
+
+def _snapshot(plan_features: dict, addon_features: dict, version: int = 1) -> CatalogSnapshot:
+    plan = CatalogPlan.from_model(Plan(
+        code="silver", name="Silver", limits_json={}, features_json=plan_features, overage_policy_json={},
+    ))
+    addon = CatalogAddon.from_model(Addon(code="gift_cards", name="Gift Cards", effect_json=addon_features))
+    return CatalogSnapshot(
+        version=version,
+        plans={"silver": plan},
+        addons={"gift_cards": addon},
+        loaded_at=0.0,
+    )
+
+
+def test_catalog_change_invalidates_dependent_entitlements():
+    """Test cached entitlements go stale only when a plan or addon they use changes."""
+    snapshot = _snapshot({"reviews": True}, {"gift_cards": True})
+    deps = snapshot.dependencies("silver", ["gift_cards"])
+    assert snapshot.is_current(deps)
+
+    # Unrelated reload at a newer version
+    assert _snapshot({"reviews": True}, {"gift_cards": True}, version=2).is_current(deps)
+
+    # Plan or addon definition changed
+    assert not _snapshot({"reviews": False}, {"gift_cards": True}, version=2).is_current(deps)
+    assert not _snapshot({"reviews": True}, {"gift_cards": False}, version=2).is_current(deps)
+
+    # Feature registry changed
+    grown = dataclasses.replace(snapshot, version=2, registry=FeatureRegistry([*snapshot.registry.names, "kiosk"]))
+    assert not grown.is_current(deps)
+    assert not snapshot.is_current({key: value for key, value in deps.items() if key != "registry"})
+
+    # Built by a replica with a newer catalog than this one
+    newer = _snapshot({"reviews": False}, {"gift_cards": True}, version=3).dependencies("silver", [])
+    assert snapshot.is_current(newer)
+
+
+def test_rewarm_entitlements_recomputes_plan_tenants(
+    client: TestClient, admin_headers: dict, internal_headers: dict, monkeypatch
+):
+    """Test re-warming recomputes and caches every tenant on a plan, in batches."""
+    client.post(
+        "/admin/plans/",
+        json={"code": "silver", "name": "Silver", "limits_json": {}, "features_json": {}},
+        headers=admin_headers,
+    )
+    for i in range(5):
+        client.put(f"/tenants/tenant-{i}/plan", json={"plan_code": "silver"}, headers=internal_headers)
+
+    cached = {}
+    batches = []
+
+    async def set_entitlements_many(items, snapshot, ttl=None):
+        batches.append(sorted(items))
+        for tenant_id, data in items.items():
+            cached[tenant_id] = snapshot.dependencies(data["plan"], data["pricing_refs"]["addons"])
+
+    monkeypatch.setattr(CacheService, "set_entitlements_many", set_entitlements_many)
+    monkeypatch.setattr(settings, "catalog_rewarm_batch_size", 2)
+
+    warmed = asyncio.run(rewarm_entitlements(plan_code="silver", session_factory=AsyncTestingSessionLocal))
+    assert warmed == 5
+    assert sorted(cached) == [f"tenant-{i}" for i in range(5)]
+    assert batches == [["tenant-0", "tenant-1"], ["tenant-2", "tenant-3"], ["tenant-4"]]
+    assert all(deps["plan"][0] == "silver" for deps in cached.values())
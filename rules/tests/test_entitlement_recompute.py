@@ -0,0 +1,90 @@
+"""Tests for bulk entitlement recomputation."""
+
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.catalog import catalog
+from app.services import entitlement_recompute
+from tests.conftest import AsyncTestingSessionLocal
+
+
+@pytest.fixture
+def tenants(client: TestClient, admin_headers: dict, internal_headers: dict) -> list:
+    """Put six tenants on a plan."""
+    client.post(
+        "/admin/plans/",
+        json={"code": "silver", "name": "Silver", "limits_json": {}, "features_json": {"reviews": True}},
+        headers=admin_headers,
+    )
+    tenant_ids = [f"tenant-{i}" for i in range(6)]
+    for tenant_id in tenant_ids:
+        client.put(f"/tenants/{tenant_id}/plan", json={"plan_code": "silver"}, headers=internal_headers)
+    return tenant_ids
+
+
+@pytest.fixture
+def redis_calls(monkeypatch) -> dict:
+    """Capture what the job writes to Redis."""
+    calls = {"cached": {}, "checkpoints": [], "checkpoint": (None, "")}
+
+    async def set_cached_entitlements_many(items, ttl=None):
+        calls["cached"].update(items)
+
+    async def get_checkpoint():
+        return calls["checkpoint"]
+
+    async def set_checkpoint(version, tenant_id):
+        calls["checkpoints"].append(tenant_id)
+
+    monkeypatch.setattr(entitlement_recompute, "set_cached_entitlements_many", set_cached_entitlements_many)
+    monkeypatch.setattr(entitlement_recompute, "get_checkpoint", get_checkpoint)
+    monkeypatch.setattr(entitlement_recompute, "_set_checkpoint", set_checkpoint)
+    return calls
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_recompute_entitlements_caches_every_tenant(tenants: list, redis_calls: dict, workers: int):
+    """Test every tenant is computed in chunks, cached, and checkpointed in order."""
+    reports = []
+    progress = asyncio.run(entitlement_recompute.recompute_entitlements(
+        workers,
+        chunk_size=2,
+        session_factory=AsyncTestingSessionLocal,
+        progress=lambda stats: reports.append(stats.done),
+    ))
+
+    assert progress.total == 6
+    assert progress.cached == 6
+    assert progress.failed == 0
+    assert reports == [2, 4, 6]
+    assert redis_calls["checkpoints"] == ["tenant-1", "tenant-3", "tenant-5", None]
+
+    assert sorted(redis_calls["cached"]) == tenants
+    body = json.loads(redis_calls["cached"]["tenant-0"].body)
+    assert body["plan"] == "silver"
+    assert body["features"]["reviews"] is True
+
+
+def test_recompute_entitlements_resumes_after_checkpoint(tenants: list, redis_calls: dict):
+    """Test a rerun only recomputes tenants after the checkpoint."""
+    redis_calls["checkpoint"] = (catalog.version, "tenant-2")
+    progress = asyncio.run(entitlement_recompute.recompute_entitlements(
+        0, chunk_size=2, session_factory=AsyncTestingSessionLocal,
+    ))
+
+    assert progress.total == 3
+    assert sorted(redis_calls["cached"]) == ["tenant-3", "tenant-4", "tenant-5"]
+
+
+def test_recompute_entitlements_ignores_checkpoint_from_another_catalog(tenants: list, redis_calls: dict):
+    """Test a checkpoint written against another catalog version is not resumed."""
+    redis_calls["checkpoint"] = (catalog.version - 1, "tenant-2")
+    progress = asyncio.run(entitlement_recompute.recompute_entitlements(
+        0, chunk_size=2, session_factory=AsyncTestingSessionLocal,
+    ))
+
+    assert progress.total == 6
+    assert sorted(redis_calls["cached"]) == tenants
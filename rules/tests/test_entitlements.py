@@ -3,6 +3,10 @@
 import pytest
 from fastapi.testclient import TestClient
 
+from app.cache import CachedEntitlements
+from app.config import settings
+from app.services.cache_service import CacheService
+
 
 def test_compute_entitlements_silver_plan(client: TestClient, admin_headers: dict, internal_headers: dict):
     """Test computing entitlements for Silver plan."""
@@ -194,3 +198,90 @@ def test_internal_auth_required_entitlements(client: TestClient):
     """Test that internal service authentication is required for entitlements."""
     response = client.get("/entitlements/ten_123")
     assert response.status_code == 403
+
+
+def test_entitlements_batch(client: TestClient, admin_headers: dict, internal_headers: dict):
+    """Test batch entitlements match the single-tenant endpoint and report errors."""
+    plan_data = {
+        "code": "silver",
+        "name": "Silver Plan",
+        "limits_json": {"locations": 1, "stylists": 5},
+        "features_json": {"basic_reporting": True}
+    }
+    client.post("/admin/plans/", json=plan_data, headers=admin_headers)
+    addon_data = {"code": "gift_cards", "name": "Gift Cards", "effect_json": {"gift_cards": True}}
+    client.post("/admin/addons/", json=addon_data, headers=admin_headers)
+    
+    client.put("/tenants/ten_1/plan", json={"plan_code": "silver"}, headers=internal_headers)
+    client.put("/tenants/ten_2/plan", json={"plan_code": "silver"}, headers=internal_headers)
+    client.put("/tenants/ten_2/addons", json={"add": ["gift_cards"]}, headers=internal_headers)
+    client.put(
+        "/tenants/ten_2/overrides",
+        json={"upsert": [{"key": "stylists", "value": 8}]},
+        headers=internal_headers,
+    )
+    
+    response = client.post(
+        "/entitlements/batch",
+        json={"tenant_ids": ["ten_1", "ten_2", "ten_missing", "ten_1"]},
+        headers=internal_headers,
+    )
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert set(data["results"]) == {"ten_1", "ten_2"}
+    assert set(data["errors"]) == {"ten_missing"}
+    assert data["results"]["ten_1"]["entitlements"]["features"]["gift_cards"] is False
+    assert data["results"]["ten_2"]["entitlements"]["features"]["gift_cards"] is True
+    assert data["results"]["ten_2"]["entitlements"]["limits"]["stylists"] == 8
+    
+    single = client.get("/entitlements/ten_2", headers=internal_headers)
+    assert data["results"]["ten_2"]["entitlements"] == single.json()
+    assert data["results"]["ten_2"]["etag"] == single.headers["ETag"]
+
+
+def test_entitlements_batch_limit(client: TestClient, internal_headers: dict):
+    """Test batch entitlements reject too many tenant IDs."""
+    tenant_ids = [f"ten_{i}" for i in range(settings.entitlements_batch_max_tenants + 1)]
+    response = client.post("/entitlements/batch", json={"tenant_ids": tenant_ids}, headers=internal_headers)
+    assert response.status_code == 400
+
+
+def test_entitlements_not_modified(client: TestClient, admin_headers: dict, internal_headers: dict):
+    """Test a matching If-None-Match gets a 304 with no body."""
+    plan_data = {
+        "code": "silver",
+        "name": "Silver Plan",
+        "limits_json": {"locations": 1, "stylists": 5},
+        "features_json": {"basic_reporting": True}
+    }
+    client.post("/admin/plans/", json=plan_data, headers=admin_headers)
+    client.put("/tenants/ten_123/plan", json={"plan_code": "silver"}, headers=internal_headers)
+    
+    response = client.get("/entitlements/ten_123", headers=internal_headers)
+    etag = response.headers["ETag"]
+    assert etag == CacheService.calculate_etag(response.json())
+    
+    for if_none_match in (etag, f'"{etag}"', f'W/"{etag}"', f'"other", "{etag}"', "*"):
+        response = client.get(
+            "/entitlements/ten_123",
+            headers={**internal_headers, "If-None-Match": if_none_match},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+    
+    response = client.get(
+        "/entitlements/ten_123",
+        headers={**internal_headers, "If-None-Match": '"stale"'},
+    )
+    assert response.status_code == 200
+    assert response.json()["tenant_id"] == "ten_123"
+
+
+def test_cached_entitlements_round_trip():
+    """Test cached responses store body and ETag together and skip old formats."""
+    entry = CachedEntitlements(etag="abc", deps='{"version":1}', body='{"plan":"silver"}')
+    assert CachedEntitlements.unpack(entry.pack()) == entry
+    assert CachedEntitlements.unpack('{"deps": {}, "entitlements": {}}') is None
+    assert CachedEntitlements.unpack(None) is None
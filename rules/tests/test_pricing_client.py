@@ -0,0 +1,105 @@
+"""Tests for the pricing service client."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.cache import LocalCache
+from app.clients import pricing_client
+from app.clients.pricing_client import PricingClient, is_versioned
+
+
+@pytest.fixture
+def pricing(monkeypatch):
+    """Create a pricing client against a fake pricing service that records requests.
+
+    The Redis price cache starts empty and is kept in memory.
+    """
+    requests = []
+    shared = {}
+
+    async def get_cached_prices(refs):
+        return {ref: shared[ref] for ref in refs if ref in shared}
+
+    async def set_cached_prices(prices, ttl=None):
+        shared.update(prices)
+
+    monkeypatch.setattr(pricing_client, "get_cached_prices", get_cached_prices)
+    monkeypatch.setattr(pricing_client, "set_cached_prices", set_cached_prices)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        if request.url.path == "/v1/resolve":
+            refs = [request.url.params["ref"]]
+            requests.append(refs)
+            return httpx.Response(200, json={"amount_cents": 1000})
+        refs = json.loads(request.content)["refs"]
+        requests.append(refs)
+        return httpx.Response(200, json={"prices": {ref: {"amount_cents": 1000} for ref in refs}})
+
+    client = PricingClient()
+    client.base_url = "http://pricing"
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client, requests
+
+
+def test_is_versioned():
+    """Test refs pinned to a pricebook version are told apart from floating ones."""
+    assert is_versioned("pricebook/plans/gold@v2")
+    assert not is_versioned("pricebook/plans/gold")
+    assert not is_versioned("pricebook/plans/gold@latest")
+
+
+def test_resolve_refs_batch_only_fetches_unseen_refs(pricing):
+    """Test resolved refs are served from cache and only new refs are sent."""
+    client, requests = pricing
+
+    async def run():
+        first = await client.resolve_refs_batch(["pricebook/plans/gold@v2", "pricebook/overage/stylist@v1"])
+        second = await client.resolve_refs_batch(
+            ["pricebook/plans/gold@v2", "pricebook/overage/stylist@v1", "pricebook/addons/upsell@v1", ""]
+        )
+        third = await client.resolve_refs_batch(["pricebook/addons/upsell@v1", "pricebook/plans/gold@v2"])
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first["pricebook/plans/gold@v2"] == {"amount_dollars": 10.0}
+    assert second["pricebook/addons/upsell@v1"] == {"amount_dollars": 10.0}
+    assert second[""] is None
+    assert third["pricebook/plans/gold@v2"] == {"amount_dollars": 10.0}
+    assert requests == [
+        ["pricebook/plans/gold@v2", "pricebook/overage/stylist@v1"],
+        ["pricebook/addons/upsell@v1"],
+    ]
+
+
+def test_concurrent_lookups_are_coalesced(pricing):
+    """Test identical in-flight lookups share one request to the pricing service."""
+    client, requests = pricing
+
+    async def run():
+        return await asyncio.gather(
+            client.resolve_ref("pricebook/plans/gold@v2"),
+            client.resolve_ref("pricebook/plans/gold@v2"),
+            client.resolve_refs_batch(["pricebook/plans/gold@v2", "pricebook/plans/gold"]),
+        )
+
+    single, duplicate, batch = asyncio.run(run())
+    assert single == duplicate == {"amount_dollars": 10.0}
+    assert batch["pricebook/plans/gold@v2"] == {"amount_dollars": 10.0}
+    assert sorted(sum(requests, [])) == ["pricebook/plans/gold", "pricebook/plans/gold@v2"]
+
+
+def test_unversioned_refs_expire(monkeypatch):
+    """Test unversioned refs are only kept for their TTL."""
+    now = [100.0]
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now[0])
+    cache = LocalCache(max_size=10)
+    cache.set("pricebook/plans/gold@v2", {"amount_dollars": 10.0})
+    cache.set("pricebook/plans/gold", {"amount_dollars": 12.0}, ttl=60)
+
+    now[0] += 61
+    assert cache.get("pricebook/plans/gold@v2") == {"amount_dollars": 10.0}
+    assert cache.get("pricebook/plans/gold") is None